@@ -0,0 +1,90 @@
+"""Стоимость создания клиента сайта: до и после общих для процесса ресурсов.
+
+Раньше каждый ``XxxAPI()`` (а их создаётся по одному на попытку загрузки
+товара) заново разбирал .env, создавал ``Logger`` с новым файловым
+обработчиком, читал CA-бандл в новый SSL-контекст и заводил неиспользуемый
+семафор. Сейчас всё это берётся из ``get_settings``/``get_logger``/
+``get_ssl_context``. Бенчмарк повторяет старую последовательность шагов
+и сравнивает её с нынешним конструктором.
+
+    python -m benchmarks.api_client --clients 500
+
+Запускается во временном каталоге с фиктивным .env, сеть не нужна.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import ssl
+import tempfile
+import time
+from typing import Callable
+
+import certifi
+
+from src.core.settings import load_settings
+from src.api.supraten import SupratenAPI
+from src.session.factory import make_session
+from src.utils.logger import Logger
+
+
+ENV = '\n'.join((
+    'REPEAT_IN_SECONDS=3600',
+    'TABLE_NAME=benchmark',
+    'JSON_NAME=creds.json',
+    *(
+        f'{site.upper()}_INDEX_TO_PARSE=[1]' for site in (
+            'supraten', 'iek', 'habsev', 'luminaled', 'electromotor',
+            'volta', 'panlight', 'cablu', 'okm', 'polev',
+        )
+    ),
+)) + '\n'
+
+
+def legacy_client() -> None:
+    """Шаги прежнего ``SupratenAPI.__init__``."""
+    make_session('supraten', SupratenAPI.API)
+    ssl.create_default_context(cafile=certifi.where())
+    asyncio.Semaphore(100)
+    load_settings()
+    logger = Logger()
+    # Прежний код оставлял файлы открытыми; здесь закрываем, чтобы не упереться в лимит
+    for handler in logger.handlers:
+        handler.close()
+
+
+def shared_client() -> None:
+    SupratenAPI()
+
+
+def measure(factory: Callable[[], None], clients: int) -> float:
+    factory()  # первый вызов заполняет общие ресурсы
+    started = time.perf_counter()
+    for _ in range(clients):
+        factory()
+    return (time.perf_counter() - started) / clients
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            with open('.env', 'w', encoding='utf-8') as file:
+                file.write(ENV)
+            before = measure(legacy_client, args.clients)
+            after = measure(shared_client, args.clients)
+        finally:
+            os.chdir(cwd)
+
+    print(f'до:    {before * 1e6:9.1f} мкс на клиента')
+    print(f'после: {after * 1e6:9.1f} мкс на клиента ({before / after:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
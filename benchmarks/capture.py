@@ -0,0 +1,97 @@
+"""Сохранение страниц сайтов в фикстуры для ``benchmarks.parsers``.
+
+Страницы скачиваются теми же клиентами, что и в боевом прогоне, и
+обезличиваются: адреса почты, телефоны, значения скрытых полей форм,
+CSRF-токены и nonce заменяются заглушками. Разметка и объём страницы
+сохраняются - от них и зависит время разбора.
+
+    python -m benchmarks.capture supraten product https://supraten.md/... [URL ...]
+    python -m benchmarks.capture volta listing https://volta.md/... [URL ...]
+
+Файлы ложатся в ``benchmarks/fixtures/<сайт>/<вид>/`` в UTF-8. Нужна сеть
+и настроенный .env.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import re
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.core.settings import get_settings  # noqa: F401  (порядок импорта, см. api_client)
+from src.api.cablu import CabluAPI
+from src.api.electromotor import ElectromotorAPI
+from src.api.habsev import HabsevAPI
+from src.api.iek import IEKAPI
+from src.api.luminaled import LuminaledAPI
+from src.api.panlight import PanlightAPI
+from src.api.polev import PolevAPI
+from src.api.supraten import SupratenAPI
+from src.api.volta import VoltaAPI
+from src.session.response import RawContent
+
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+CLIENTS: Dict[str, Any] = {
+    'supraten': SupratenAPI,
+    'iek': IEKAPI,
+    'habsev': HabsevAPI,
+    'luminaled': LuminaledAPI,
+    'electromotor': ElectromotorAPI,
+    'volta': VoltaAPI,
+    'panlight': PanlightAPI,
+    'cablu': CabluAPI,
+    'polev': PolevAPI,
+}
+
+_EMAIL = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+')
+_PHONE = re.compile(r'\+?373[\s()\-]*\d[\d\s()\-]{6,12}\d')
+_HIDDEN_VALUE = re.compile(r'(<input[^>]*type=["\']hidden["\'][^>]*value=)(["\'])[^"\']*\2', re.IGNORECASE)
+_TOKEN_META = re.compile(r'(<meta[^>]*name=["\'][^"\']*(?:csrf|token)[^"\']*["\'][^>]*content=)(["\'])[^"\']*\2', re.IGNORECASE)
+_NONCE = re.compile(r'((?:nonce|data-nonce|_wpnonce)["\']?\s*[=:]\s*)(["\'])[^"\']*\2', re.IGNORECASE)
+
+
+def anonymize(html: str) -> str:
+    html = _EMAIL.sub('user@example.com', html)
+    html = _PHONE.sub('+373 00 000 000', html)
+    html = _HIDDEN_VALUE.sub(r'\1\2\2', html)
+    html = _TOKEN_META.sub(r'\1\2\2', html)
+    return _NONCE.sub(r'\1\2\2', html)
+
+
+async def fetch(site: str, kind: str, url: str) -> str:
+    async with CLIENTS[site]() as api:
+        if kind == 'product':
+            content = await api.get_html_product(url)
+        else:
+            content = await api._session('GET', url, headers=api._headers, raw=True)
+    if isinstance(content, RawContent):
+        return content.text()
+    return content
+
+
+async def capture(site: str, kind: str, urls: List[str]) -> None:
+    directory = FIXTURES / site / kind
+    directory.mkdir(parents=True, exist_ok=True)
+    for url in urls:
+        html = anonymize(await fetch(site, kind, url))
+        # Имя по хэшу адреса: повторный захват перезаписывает ту же фикстуру
+        path = directory / f'{hashlib.sha1(url.encode()).hexdigest()[:12]}.html'
+        path.write_text(html, encoding='utf-8')
+        print(f'{path}  {len(html) / 1024:.0f} КБ  <- {url}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('site', choices=sorted(CLIENTS))
+    parser.add_argument('kind', choices=('product', 'listing'))
+    parser.add_argument('urls', nargs='+')
+    args = parser.parse_args()
+    asyncio.run(capture(args.site, args.kind, args.urls))
+
+
+if __name__ == '__main__':
+    main()
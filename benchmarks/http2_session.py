@@ -0,0 +1,154 @@
+"""Сравнение AiohttpSession (HTTP/1.1) и HttpxSession (HTTP/2) на локальном сервере.
+
+Поднимает два сервера с одинаковой страницей и искусственной задержкой ответа:
+aiohttp (HTTP/1.1) и минимальный h2c-сервер на ``h2``. Каждая сессия делает
+``--requests`` GET-запросов при ``--concurrency`` одновременных, сервер
+считает открытые TCP-соединения.
+
+    python -m benchmarks.http2_session --requests 2000 --concurrency 200
+
+Нужны ``httpx[http2]`` и ``h2``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, List, Set
+
+from aiohttp import web
+
+from src.session.aiohttp import AiohttpSession
+from src.session.httpx import HttpxSession, create_http2_client
+from src.session.pool import SessionPool
+
+
+HOST = '127.0.0.1'
+PAGE = b'<html><body>' + b'<div class="product">x</div>' * 2000 + b'</body></html>'
+
+
+class _H2Protocol(asyncio.Protocol):
+    """h2c-сервер: отвечает ``PAGE`` на любой запрос через ``delay`` секунд."""
+
+    connections = 0
+
+    def __init__(self, delay: float) -> None:
+        import h2.config
+        import h2.connection
+
+        self.delay = delay
+        self.conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False)
+        )
+        self.transport: Any = None
+
+    def connection_made(self, transport: Any) -> None:
+        type(self).connections += 1
+        self.transport = transport
+        self.conn.initiate_connection()
+        self.conn.update_settings({0x3: 1000})  # MAX_CONCURRENT_STREAMS
+        transport.write(self.conn.data_to_send())
+
+    def data_received(self, data: bytes) -> None:
+        import h2.events
+
+        for event in self.conn.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                asyncio.get_running_loop().call_later(self.delay, self._respond, event.stream_id)
+        self.transport.write(self.conn.data_to_send())
+
+    def _respond(self, stream_id: int) -> None:
+        if self.transport.is_closing():
+            return
+        self.conn.send_headers(stream_id, [
+            (':status', '200'),
+            ('content-type', 'text/html; charset=utf-8'),
+            ('content-length', str(len(PAGE))),
+        ])
+        self._send_body(stream_id, PAGE)
+
+    def _send_body(self, stream_id: int, body: bytes) -> None:
+        # Тело режется по окну управления потоком и размеру кадра
+        while body:
+            window = min(
+                self.conn.local_flow_control_window(stream_id),
+                self.conn.max_outbound_frame_size,
+            )
+            if window <= 0:
+                asyncio.get_running_loop().call_later(0.001, self._send_body, stream_id, body)
+                break
+            chunk, body = body[:window], body[window:]
+            self.conn.send_data(stream_id, chunk, end_stream=not body)
+        self.transport.write(self.conn.data_to_send())
+
+
+async def _start_http1(port: int, delay: float, peers: Set[Any]) -> web.AppRunner:
+    async def handler(request: web.Request) -> web.Response:
+        # Каждое TCP-соединение видно по уникальному адресу клиента
+        peers.add(request.transport.get_extra_info('peername'))
+        await asyncio.sleep(delay)
+        return web.Response(body=PAGE, content_type='text/html', charset='utf-8')
+
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, port).start()
+    return runner
+
+
+async def _drive(session: Any, path: str, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await session('GET', f'{path}?i={i}', raw=True)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return time.perf_counter() - started
+
+
+async def main(requests: int, concurrency: int, delay: float, limit_per_host: int) -> None:
+    http1_port, http2_port = 8801, 8802
+    http1_peers: Set[Any] = set()
+    runner = await _start_http1(http1_port, delay, http1_peers)
+    loop = asyncio.get_running_loop()
+    h2_server = await loop.create_server(lambda: _H2Protocol(delay), HOST, http2_port)
+
+    results: List[str] = []
+
+    pool = SessionPool(limit_per_host=limit_per_host)
+    session = AiohttpSession(api=f'http://{HOST}:{http1_port}', pool=pool)
+    elapsed = await _drive(session, '/product', requests, concurrency)
+    await pool.close()
+    results.append(
+        f'aiohttp HTTP/1.1: {elapsed:.2f} c, {requests / elapsed:.0f} req/s, '
+        f'соединений {len(http1_peers)}'
+    )
+
+    client = create_http2_client(prior_knowledge=True)
+    session = HttpxSession(api=f'http://{HOST}:{http2_port}', client=client)
+    elapsed = await _drive(session, '/product', requests, concurrency)
+    await client.aclose()
+    results.append(
+        f'httpx HTTP/2:     {elapsed:.2f} c, {requests / elapsed:.0f} req/s, '
+        f'соединений {_H2Protocol.connections}'
+    )
+
+    h2_server.close()
+    await runner.cleanup()
+
+    print(f'{requests} запросов, {concurrency} одновременно, задержка сервера {delay * 1000:.0f} мс')
+    for line in results:
+        print(line)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--delay', type=float, default=0.05, help='задержка ответа сервера, сек.')
+    parser.add_argument('--limit-per-host', type=int, default=10, help='SESSION_LIMIT_PER_HOST для aiohttp')
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.delay, args.limit_per_host))
@@ -0,0 +1,138 @@
+"""Стоимость разбора страницы товара с JSON-LD и без него.
+
+Страница собрана по образцу карточки WooCommerce (Electromotor): большое
+меню и подвал, блок товара, таблица характеристик и
+``<script type="application/ld+json">`` с ``Product``. Сравниваются:
+
+* ``dom``      - схема сайта без ``json_ld`` и ``regions``: все поля через
+  XPath по дереву всей страницы (так было до JSON-LD и срезов);
+* ``json-ld``  - то же с JSON-LD: название, артикул и цена из него,
+  остальное и характеристики через дерево всей страницы;
+* ``срез``     - без JSON-LD, дерево только из блоков ``regions``;
+* ``сайт``     - схема сайта как есть: JSON-LD и дерево из блоков;
+* ``без дерева`` - те же поля без таблиц: JSON-LD закрывает всё, дерево
+  не строится (так работает схема без таблиц);
+* ``поиск``    - только байтовый поиск и разбор JSON-LD.
+
+    python -m benchmarks.json_ld --pages 100 --menu 1500
+
+Сеть не нужна.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable
+
+from src.core.settings import load_settings  # noqa: F401  (порядок импорта, см. api_client)
+from src.parser import jsonld
+from src.parser.schema import Field, Schema
+from src.parser.sites import SCHEMAS
+from src.session.response import RawContent
+
+
+PRODUCT = {
+    '@context': 'https://schema.org/',
+    '@graph': [
+        {'@type': 'BreadcrumbList', 'itemListElement': []},
+        {
+            '@type': 'Product',
+            'name': 'Электродвигатель АИР 80 1,5 кВт',
+            'sku': 'E-80',
+            'offers': [{'@type': 'Offer', 'price': '1725.00', 'priceCurrency': 'MDL'}],
+        },
+    ],
+}
+
+
+def make_page(menu: int) -> RawContent:
+    links = ''.join(
+        f'<li class="menu-item"><a href="/c/{i}/">Категория {i}</a></li>' for i in range(menu)
+    )
+    rows = ''.join(
+        '<tr><th class="woocommerce-product-attributes-item__label">Параметр {0}</th>'
+        '<td class="woocommerce-product-attributes-item__value"><p>{0} ед.</p></td></tr>'.format(i)
+        for i in range(20)
+    )
+    page = (
+        '<html><head><title>АИР 80</title>'
+        f'<script type="application/ld+json">{json.dumps(PRODUCT, ensure_ascii=False)}</script>'
+        '</head><body>'
+        f'<nav><ul class="menu">{links}</ul></nav>'
+        '<div class="row product-image-summary-wrap"><div class="summary-inner">'
+        '<nav><a class="breadcrumb-link">Главная</a><a class="breadcrumb-link">Двигатели</a></nav>'
+        '<h1 class="product_title">Электродвигатель АИР 80 1,5 кВт</h1>'
+        '<span class="sku_wrapper">Артикул: <span class="sku">E-80</span></span>'
+        '<p class="price"><span class="woocommerce-Price-amount amount">'
+        '<bdi>1.725,00&nbsp;<span>MDL</span></bdi></span></p>'
+        '</div></div>'
+        f'<table class="woocommerce-product-attributes shop_attributes">{rows}</table>'
+        f'<footer><ul>{links}</ul></footer>'
+        '</body></html>'
+    )
+    return RawContent(page.encode('utf-8'), 'utf-8')
+
+
+def variant(schema: Schema, json_ld: bool, tables: bool, regions: bool = False) -> Schema:
+    """Копия схемы: без ``json_ld`` у полей, без ``regions`` или без таблиц и полей, которых нет в JSON-LD."""
+    fields = {}
+    for name, field in schema.fields.items():
+        if not tables and field.json_ld is None:
+            continue
+        fields[name] = Field(
+            field.xpath, field.index, field.min_count, field.text, field.post,
+            json_ld=field.json_ld if json_ld else None, json_ld_post=field.json_ld_post,
+        )
+    return Schema(
+        schema.site, schema.guard, fields, schema.tables if tables else (),
+        regions=schema.regions if regions else (),
+    )
+
+
+def measure(func: Callable[[], object], pages: int, repeat: int = 5) -> float:
+    # Лучший из нескольких заходов, как в timeit: меньше шума от соседей по CPU
+    func()
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.process_time()
+        for _ in range(pages):
+            func()
+        best = min(best, (time.process_time() - started) / pages)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--menu', type=int, default=1500, help='пунктов в меню и подвале')
+    args = parser.parse_args()
+
+    page = make_page(args.menu)
+    schema = SCHEMAS['electromotor']
+    dom = variant(schema, json_ld=False, tables=True).compile()
+    with_ld = variant(schema, json_ld=True, tables=True).compile()
+    sliced = variant(schema, json_ld=False, tables=True, regions=True).compile()
+    site = schema.compile()
+    no_tree = variant(schema, json_ld=True, tables=False).compile()
+
+    expected = dom.extract(page)
+    for compiled in (with_ld, sliced, site):
+        assert compiled.extract(page) == expected
+
+    results = {
+        'dom': measure(lambda: dom.extract(page), args.pages),
+        'json-ld': measure(lambda: with_ld.extract(page), args.pages),
+        'срез': measure(lambda: sliced.extract(page), args.pages),
+        'сайт': measure(lambda: site.extract(page), args.pages),
+        'без дерева': measure(lambda: no_tree.extract(page), args.pages),
+        'поиск': measure(lambda: jsonld.find_product(page), args.pages),
+    }
+    print(f'страница {len(page.body) / 1024:.0f} КБ, лучший из 5 заходов по {args.pages}, CPU на страницу:')
+    base = results['dom']
+    for name, seconds in results.items():
+        print(f'{name:>11}: {seconds * 1e6:9.1f} мкс ({base / seconds:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Сбор ссылок на товары со страниц категорий: BeautifulSoup против XPath.
+
+Для каждого сайта собирается страница категории с меню, подвалом и
+``--products`` карточками в разметке этого сайта. Прежний код из
+``get_all_products`` (BeautifulSoup, ``find_all`` по карточкам) и
+``harvest_links`` должны вернуть одинаковые ссылки; печатается время
+на страницу.
+
+    python -m benchmarks.listing --pages 20 --products 90
+
+Сеть не нужна.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from src.core.settings import load_settings  # noqa: F401  (порядок импорта, см. api_client)
+from src.parser.listing import harvest_links
+
+
+CARDS: Dict[str, str] = {
+    'supraten': '<div class="sp-show-product-vertical col"><a href="/p/{i}/"><img></a><a href="/cart/{i}">В корзину</a></div>',
+    'iek': (
+        '<div class="product-list-content wd-scroll"><h3 class="wd-entities-title">'
+        '<a href="https://www.iek.md/p/{i}/">Товар {i}</a></h3></div>'
+    ),
+    'habsev': '<div class="product__item"><a href="/p/{i}">Товар {i}</a><a href="/cmp/{i}">Сравнить</a></div>',
+    'luminaled': '<div class="col"><a class="link-dark text-decoration-none" href="/p/{i}">Товар {i}</a></div>',
+    'electromotor': '<h3 class="wd-entities-title product-title"><a href="/p/{i}/">Товар {i}</a></h3>',
+    'volta': '<a class="product-card__description" href="/p/{i}"><span>Товар {i}</span></a>',
+    'panlight': '<div class="goods-item-content"><a href="/p/{i}">Товар {i}</a></div>',
+    'cablu': '<li><div class="name"><a href="/p/{i}">Товар {i}</a></div></li>',
+    'polev': '<td class="block_product"><div class="image"><a href="/i/{i}">img</a></div><div class="name"><a href="/p/{i}">Товар {i}</a></div></td>',
+}
+
+WRAPPERS: Dict[str, str] = {
+    'supraten': '<div class="sp-products">{}</div>',
+    'luminaled': '<div class="row flex-wrap toggleGrid mb-4 products">{}</div>',
+    'cablu': '<ul id="product-list-grid">{}</ul>',
+    'polev': '<table><tr>{}</tr></table>',
+}
+
+
+def make_page(site: str, products: int, menu: int) -> str:
+    links = ''.join(f'<li class="menu-item"><a href="/c/{i}/">Категория {i}</a></li>' for i in range(menu))
+    cards = ''.join(CARDS[site].format(i=i) for i in range(products))
+    return (
+        '<html><head><title>Категория</title></head><body>'
+        f'<nav><ul>{links}</ul></nav>'
+        + WRAPPERS.get(site, '<div class="products">{}</div>').format(cards)
+        + f'<footer><ul>{links}</ul></footer></body></html>'
+    )
+
+
+# Прежние реализации из src/api/*.py - для сравнения
+def _legacy(site: str, html: str) -> Optional[List[str]]:
+    soup = BeautifulSoup(html, 'lxml')
+    if site == 'supraten':
+        div = soup.find('div', attrs={'class': 'sp-products'})
+        if div is None:
+            return []
+        return [p.find('a').get('href') for p in div.find_all('div', attrs={'class': 'sp-show-product-vertical'})]
+    if site == 'iek':
+        links = []
+        for div in soup.select('div.product-list-content.wd-scroll'):
+            h3 = div.select_one('h3.wd-entities-title')
+            if h3:
+                a = h3.select_one('a')
+                if a and 'href' in a.attrs:
+                    links.append(a['href'])
+        return links
+    if site == 'habsev':
+        return [div.find('a').get('href') for div in soup.find_all('div', attrs={'class': 'product__item'})]
+    if site == 'luminaled':
+        div = soup.find('div', attrs={'class': 'row flex-wrap toggleGrid mb-4 products'})
+        return [a.get('href') for a in div.find_all('a', attrs={'class': 'link-dark text-decoration-none'})]
+    if site == 'electromotor':
+        return [h3.find('a').get('href') for h3 in soup.find_all('h3', attrs={'class': 'product-title'})]
+    if site == 'volta':
+        return [a.get('href') for a in soup.find_all('a', class_='product-card__description')]
+    if site == 'panlight':
+        return [div.find('a').get('href') for div in soup.find_all('div', class_='goods-item-content')]
+    if site == 'cablu':
+        ul = soup.find('ul', id='product-list-grid')
+        if not ul:
+            return None
+        return [div.find('a').get('href') for div in ul.find_all('div', class_='name')]
+    if site == 'polev':
+        return [
+            td.find('div', class_='name').find('a').get('href')
+            for td in soup.find_all('td', class_='block_product')
+        ]
+    raise KeyError(site)
+
+
+def measure(func: Callable[[], object], pages: int, repeat: int = 3) -> float:
+    # Лучший из нескольких заходов, как в timeit
+    func()
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.process_time()
+        for _ in range(pages):
+            func()
+        best = min(best, (time.process_time() - started) / pages)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--products', type=int, default=90)
+    parser.add_argument('--menu', type=int, default=500, help='пунктов в меню и подвале')
+    args = parser.parse_args()
+
+    print(f'{"сайт":<13} {"bs4, мс":>9} {"xpath, мс":>10}')
+    for site in CARDS:
+        html = make_page(site, args.products, args.menu)
+        expected = _legacy(site, html)
+        assert harvest_links(site, html) == expected, site
+        assert len(expected) == args.products, site
+        before = measure(lambda: _legacy(site, html), args.pages)
+        after = measure(lambda: harvest_links(site, html), args.pages)
+        print(f'{site:<13} {before * 1e3:9.2f} {after * 1e3:10.2f}  ({before / after:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""Скорость и память экстракторов по сохранённым страницам всех сайтов.
+
+Для каждой пары «сайт, вид страницы» из ``benchmarks/fixtures/<сайт>/<вид>/*.html``
+(вид - ``product`` или ``listing``) прогоняется соответствующий экстрактор:
+``src.parser.schema.extract`` для карточек, ``harvest_links`` для листингов.
+Считаются:
+
+* ``pages_per_sec`` - страниц в секунду CPU, лучший из ``--repeat`` заходов;
+* ``peak_kib`` - пик памяти Python-объектов за один проход (tracemalloc);
+* ``gc_gen0_per_page`` - сборок нулевого поколения на страницу: чем больше
+  создаётся объектов, тем чаще сборки, так что это мера числа выделений;
+* ``rss_peak_kib`` - пик RSS процесса после всех замеров. Память libxml2
+  tracemalloc не видит, она попадает только сюда.
+
+Результат печатается как JSON (или пишется в ``--output``). С ``--compare``
+он сравнивается с прошлым файлом, и падение ``pages_per_sec`` больше
+``--threshold`` считается регрессией (код выхода 1).
+
+    python -m benchmarks.parsers --output after.json --compare before.json
+
+Фикстуры собираются ``benchmarks.capture`` (синтетический набор -
+``benchmarks.synthetic``), базовый прогон на них - ``benchmarks/baseline.json``.
+Сеть не нужна.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import lxml
+
+from src.core.settings import load_settings  # noqa: F401  (порядок импорта, см. api_client)
+from src.parser.executor import _drive
+from src.parser.listing import LISTINGS, harvest_links
+from src.parser.schema import extract
+from src.session.response import RawContent
+
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+MIN_ROUND = 0.2
+
+EXTRACTORS: Dict[str, Callable[[str, RawContent], Any]] = {
+    # extract объявлен async, но ничего не ждёт - крутим его как ParseExecutor
+    'product': lambda site, page: _drive(extract, (site, page)),
+    'listing': harvest_links,
+}
+
+
+def load_pages(directory: Path) -> List[RawContent]:
+    return [
+        RawContent(path.read_bytes(), 'utf-8')
+        for path in sorted(directory.glob('*.html'))
+    ]
+
+
+def _pass(func: Callable[[str, RawContent], Any], site: str, pages: List[RawContent]) -> None:
+    for page in pages:
+        func(site, page)
+
+
+def measure(site: str, kind: str, pages: List[RawContent], repeat: int) -> Dict[str, Any]:
+    func = EXTRACTORS[kind]
+    _pass(func, site, pages)  # компиляция схем и прогрев
+
+    # Заход длится не меньше MIN_ROUND секунд, иначе на паре страниц мешает шум таймера
+    best = float('inf')
+    for _ in range(repeat):
+        passes = 0
+        started = time.process_time()
+        while True:
+            _pass(func, site, pages)
+            passes += 1
+            elapsed = time.process_time() - started
+            if elapsed >= MIN_ROUND:
+                break
+        best = min(best, elapsed / passes)
+
+    gc.collect()
+    collections = gc.get_stats()[0]['collections']
+    tracemalloc.start()
+    _pass(func, site, pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    collections = gc.get_stats()[0]['collections'] - collections
+
+    return {
+        'site': site,
+        'kind': kind,
+        'pages': len(pages),
+        'bytes': sum(len(page) for page in pages),
+        'pages_per_sec': round(len(pages) / best, 1) if best > 0 else None,
+        'peak_kib': round(peak / 1024, 1),
+        'gc_gen0_per_page': round(collections / len(pages), 2),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(fixtures: Path, repeat: int, sites: Optional[List[str]]) -> Dict[str, Any]:
+    results = []
+    for site in sites or sorted(LISTINGS):
+        for kind in EXTRACTORS:
+            pages = load_pages(fixtures / site / kind)
+            if not pages:
+                print(f'{site}/{kind}: нет фикстур, пропуск', file=sys.stderr)
+                continue
+            results.append(measure(site, kind, pages, repeat))
+    return {
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'lxml': lxml.__version__,
+        'rss_peak_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'results': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """Печатает изменения относительно ``baseline``; ``True``, если есть регрессия."""
+    before = {(item['site'], item['kind']): item for item in baseline['results']}
+    regressed = False
+    for item in current['results']:
+        old = before.get((item['site'], item['kind']))
+        if old is None or not old['pages_per_sec'] or not item['pages_per_sec']:
+            continue
+        change = item['pages_per_sec'] / old['pages_per_sec'] - 1
+        mark = ''
+        if change < -threshold:
+            mark = '  РЕГРЕССИЯ'
+            regressed = True
+        print(
+            f'{item["site"]:<13} {item["kind"]:<8} '
+            f'{old["pages_per_sec"]:9.1f} -> {item["pages_per_sec"]:9.1f} стр/с ({change:+.0%})'
+            f'  пик {old["peak_kib"]:.0f} -> {item["peak_kib"]:.0f} КБ{mark}',
+            file=sys.stderr,
+        )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', type=Path, default=FIXTURES)
+    parser.add_argument('--site', action='append', dest='sites', help='только эти сайты (можно повторять)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--compare', type=Path, help='JSON прошлого прогона')
+    parser.add_argument('--threshold', type=float, default=0.1, help='допустимое падение pages_per_sec')
+    args = parser.parse_args()
+
+    current = run(args.fixtures, args.repeat, args.sites)
+    report = json.dumps(current, ensure_ascii=False, indent=2)
+    if args.output is not None:
+        args.output.write_text(report + '\n', encoding='utf-8')
+    else:
+        print(report)
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+        if compare(current, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Размер дерева и время разбора страницы товара целиком и по срезу блоков.
+
+Страница собрана по образцу карточки Supraten: мега-меню, подвал и
+встроенные скрипты вокруг ``div.sp-page-content``. Схема сайта разбирается
+дважды - со срезом ``regions`` и без него, - и результаты сравниваются.
+
+    python -m benchmarks.region --pages 100 --menu 1500
+
+Сеть не нужна.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from src.core.settings import load_settings  # noqa: F401  (порядок импорта, см. api_client)
+from src.parser.document import make_tree
+from src.parser.schema import Schema
+from src.parser.sites import SCHEMAS
+from src.session.response import RawContent
+
+
+def make_page(menu: int) -> RawContent:
+    links = ''.join(
+        f'<li class="sp-menu__item"><a class="sp-menu__link" href="/c/{i}/">'
+        f'<span>Категория {i}</span></a></li>'
+        for i in range(menu)
+    )
+    script = '<script>window.dataLayer = [' + ','.join(f'{{"id": {i}}}' for i in range(menu)) + '];</script>'
+    rows = ''.join(f'<tr><td>Параметр {i}</td><td>{i} ед.</td></tr>' for i in range(20))
+    page = (
+        '<html><head><meta charset="utf-8"><title>Лампа</title>'
+        f'{script}</head><body>'
+        f'<header><nav><ul class="sp-menu">{links}</ul></nav></header>'
+        '<ul class="sp-breadcrumbs__list">'
+        '<li class="sp-breadcrumbs__item">Главная</li>'
+        '<li class="sp-breadcrumbs__item">Лампы</li>'
+        '<li class="sp-breadcrumbs__item">Лампа</li></ul>'
+        '<div class="sp-page-content">'
+        '<h1 class="sp-single-product__title">Светодиодная лампа 10Вт</h1>'
+        '<div class="sp-single-product__sku">Артикул: AB-1</div>'
+        '<p class="sp-single-product__price-current">12.50 лей</p>'
+        '<div id="characteristic"><table class="table table-bordered">'
+        f'<tbody>{rows}</tbody></table></div>'
+        '</div>'
+        f'<footer><ul>{links}</ul></footer>{script}'
+        '</body></html>'
+    )
+    return RawContent(page.encode('utf-8'), 'utf-8')
+
+
+def measure(func: Callable[[], object], pages: int, repeat: int = 5) -> float:
+    # Лучший из нескольких заходов, как в timeit
+    func()
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.process_time()
+        for _ in range(pages):
+            func()
+        best = min(best, (time.process_time() - started) / pages)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--menu', type=int, default=1500, help='пунктов в меню и подвале')
+    args = parser.parse_args()
+
+    page = make_page(args.menu)
+    schema = SCHEMAS['supraten']
+    sliced = schema.compile()
+    whole = Schema(schema.site, schema.guard, schema.fields, schema.tables).compile()
+
+    fragment = sliced.slicer.slice(page)
+    assert fragment is not None
+    assert sliced.extract(page) == whole.extract(page)
+
+    full_nodes = sum(1 for _ in make_tree(page).iter())
+    sliced_nodes = sum(1 for _ in make_tree(fragment).iter())
+    before = measure(lambda: whole.extract(page), args.pages)
+    after = measure(lambda: sliced.extract(page), args.pages)
+    cut = measure(lambda: sliced.slicer.slice(page), args.pages)
+
+    print(f'страница: {len(page.body) / 1024:7.0f} КБ, {full_nodes} элементов')
+    print(f'срез:     {len(fragment.body) / 1024:7.1f} КБ, {sliced_nodes} элементов')
+    print(f'вся страница: {before * 1e6:9.1f} мкс CPU')
+    print(f'по срезу:     {after * 1e6:9.1f} мкс CPU ({before / after:.0f}x), из них поиск блоков {cut * 1e6:.1f} мкс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Синтетический набор фикстур для ``benchmarks.parsers``.
+
+Пока живые страницы не сняты ``benchmarks.capture``, набор собирается из
+разметки сайтов: карточки - страницы из ``tests/pages`` (на них экстракторы
+сверены с прежними BeautifulSoup-версиями), листинги - генератор
+``benchmarks.listing``. Вокруг карточки добавляются мега-меню, подвал,
+встроенные скрипты и, у сайтов с ``json_ld`` в схеме, блок JSON-LD -
+так страница по объёму и числу элементов похожа на настоящую.
+
+    python -m benchmarks.synthetic --menu 1000 --products 60
+
+Файлы ложатся в ``benchmarks/fixtures/<сайт>/<вид>/synthetic.html``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Dict
+
+from src.core.settings import load_settings  # noqa: F401  (порядок импорта, см. api_client)
+from benchmarks.listing import make_page as make_listing
+
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+PAGES = Path(__file__).parent.parent / 'tests' / 'pages'
+
+# Product из JSON-LD для сайтов, схемы которых его читают
+JSON_LD: Dict[str, Dict[str, str]] = {
+    'iek': {'name': 'Автомат ВА47', 'sku': 'MVA20-1', 'price': '1234.50'},
+    'luminaled': {'name': 'LED прожектор 50W', 'sku': 'LM-50', 'price': '450.00'},
+    'electromotor': {'name': 'Электродвигатель АИР 80', 'sku': 'E-80', 'price': '1725.00'},
+    'cablu': {'name': 'Кабель NYM 3x1,5', 'sku': 'NYM-315', 'price': '1021.00'},
+}
+
+_BODY = re.compile(r'<body>(.*)</body>', re.DOTALL)
+
+
+def _json_ld(site: str) -> str:
+    product = JSON_LD.get(site)
+    if product is None:
+        return ''
+    data = {
+        '@context': 'https://schema.org/',
+        '@type': 'Product',
+        'name': product['name'],
+        'sku': product['sku'],
+        'offers': {'@type': 'Offer', 'price': product['price'], 'priceCurrency': 'MDL'},
+    }
+    return f'<script type="application/ld+json">{json.dumps(data, ensure_ascii=False)}</script>'
+
+
+def make_product(site: str, menu: int) -> str:
+    content = _BODY.search((PAGES / f'{site}.html').read_text(encoding='utf-8')).group(1)
+    links = ''.join(
+        f'<li class="menu-item"><a class="menu-link" href="/c/{i}/"><span>Категория {i}</span></a></li>'
+        for i in range(menu)
+    )
+    script = '<script>window.dataLayer = [' + ','.join(f'{{"id": {i}}}' for i in range(menu)) + '];</script>'
+    return (
+        '<html><head><meta charset="utf-8"><title>Товар</title>'
+        f'{script}{_json_ld(site)}</head><body>'
+        f'<header><nav><ul class="menu">{links}</ul></nav></header>'
+        f'<main>{content}</main>'
+        f'<footer><ul>{links}</ul></footer>{script}'
+        '</body></html>'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', type=Path, default=FIXTURES)
+    parser.add_argument('--menu', type=int, default=1000, help='пунктов в меню и подвале')
+    parser.add_argument('--products', type=int, default=60, help='карточек на странице категории')
+    args = parser.parse_args()
+
+    for path in sorted(PAGES.glob('*.html')):
+        site = path.stem
+        pages = {
+            'product': make_product(site, args.menu),
+            'listing': make_listing(site, args.products, args.menu),
+        }
+        for kind, html in pages.items():
+            target = args.fixtures / site / kind / 'synthetic.html'
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(html, encoding='utf-8')
+            print(f'{target}  {len(html.encode()) / 1024:.0f} КБ')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,6 @@ import time
 
 from src.core import (
     ApplicationSupraten, 
-    load_settings, 
     ApplicationIek, 
     ApplicationHabsev, 
     ApplicationLuminaled,
@@ -14,10 +13,18 @@ from src.core import (
     ApplicationOkm,
     ApplicationPolev,
 )
-from src.core.settings import load_settings
+from src.core.settings import get_settings
+from src.parser.executor import get_parse_executor, shutdown_parse_executor
+from src.parser.memo import get_parse_memo
+from src.session.breaker import get_circuit_breaker
+from src.session.httpx import close_http2_clients
+from src.session.pool import close_session_pool
+from src.session.proxies import get_proxy_pool
+from src.session.replay import get_replay_archive
+from src.session.singleflight import get_single_flight
 
 
-settings = load_settings()
+settings = get_settings()
 
 async def scheduler():
     try:
@@ -48,8 +55,33 @@ async def main() -> None:
         ApplicationPolev
     ]
 
-    for app_class in app_classes:
-        await start_application(app_class)
+    try:
+        for app_class in app_classes:
+            await start_application(app_class)
+    finally:
+        await close_session_pool()
+        await close_http2_clients()
+        parser = get_parse_executor()
+        print(f"Разобрано страниц: {parser.parsed}, загрузки ждали разбора {parser.waits} раз(а)")
+        shutdown_parse_executor()
+        memo = get_parse_memo()
+        if memo is not None:
+            # Приложения сохраняют память сами; здесь - на случай прерванного прогона
+            memo.save()
+
+    single_flight = get_single_flight()
+    if single_flight is not None:
+        print(f"Склеено запросов: {single_flight.saved}/{single_flight.requests}")
+        single_flight.reset_stats()
+    for host, trips in get_circuit_breaker().trips().items():
+        print(f"Хост {host} отключался {trips} раз(а)")
+    archive = get_replay_archive()
+    if archive is not None:
+        archive.close()
+        print(f"Архив {archive.mode}: записей {len(archive)}, из архива {archive.hits}, промахов {archive.misses}")
+    proxy_pool = get_proxy_pool()
+    if proxy_pool is not None:
+        print(f"Живых прокси: {proxy_pool.alive}/{len(proxy_pool)}")
 
     print("Итерация завершена \n")
     
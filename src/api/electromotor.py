@@ -1,17 +1,17 @@
 
 import re
 import math
-import asyncio
 import lxml.html
 from typing import List, Optional, Dict, Any
 
 from bs4 import BeautifulSoup
 from aiohttp import ClientConnectorError
 
-from src.session.aiohttp import AiohttpSession
+from src.parser.listing import harvest_links
+from src.session.factory import make_session
 from src.utils.user_agent import get_user_agent
-from src.core.settings import load_settings
-from src.utils.logger import Logger
+from src.core.settings import Settings, get_settings
+from src.utils.logger import Logger, get_logger
 
 
 class ElectromotorAPI:
@@ -20,14 +20,13 @@ class ElectromotorAPI:
 
     def __init__(
             self, 
-            tasks_starts_at_once: int = 100, 
             proxy: Optional[str] = None,
+            settings: Optional[Settings] = None,
             logger: Optional[Logger] = None
     ) -> None:
-        self._session = AiohttpSession(api=self.API, proxy=proxy)
-        self._semaphore = asyncio.Semaphore(tasks_starts_at_once)
-        self.settings = load_settings()
-        self.logger = logger or Logger()
+        self._session = make_session('electromotor', self.API, proxy=proxy)
+        self.settings = settings or get_settings()
+        self.logger = logger or get_logger()
         self._headers = {
             'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
             'accept-language': 'ru-RU,ru;q=0.9',
@@ -42,7 +41,7 @@ class ElectromotorAPI:
     async def __aexit__(self, *args) -> None:
         await self._session.close()
 
-    async def _make_request(self, url: str, page: int = None) -> str:
+    async def _make_request(self, url: str, page: int = None, raw: bool = False) -> str:
         """Универсальный метод для выполнения запроса."""
         full_url = f"{url}page/{page}/" if page else url
         self._headers['user-agent'] = get_user_agent()  # Предполагается, что get_user_agent() определен
@@ -52,6 +51,7 @@ class ElectromotorAPI:
                 f'{full_url}', 
                 headers=self._headers, 
                 cookies=self._cookies,
+                raw=raw,
             )
         
         return response
@@ -122,12 +122,8 @@ class ElectromotorAPI:
         
         for page in range(0, num_pages):
             html = await self._make_request(url, page + 1)
-            soup = BeautifulSoup(html, "lxml")
             # self.logger.info(f'{url}page/{page + 1}/')
-            products = soup.find_all('h3', attrs={'class': 'product-title'})
-            for elem in products:
-                url_a = elem.find('a').get('href')
-                product_links.append(url_a)
+            product_links.extend(harvest_links('electromotor', html))
 
         return product_links
 
@@ -135,7 +131,7 @@ class ElectromotorAPI:
 
     async def get_html_product(self, url: str):
 
-        html = await self._make_request(url)
+        html = await self._make_request(url, raw=True)
 
         return html
 
@@ -8,10 +8,11 @@ from typing import List, Optional, Dict, Any
 from bs4 import BeautifulSoup
 from aiohttp import ClientConnectorError
 
-from src.session.aiohttp import AiohttpSession
+from src.parser.listing import harvest_links
+from src.session.factory import make_session
 from src.utils.user_agent import get_user_agent
-from src.core.settings import load_settings
-from src.utils.logger import Logger
+from src.core.settings import Settings, get_settings
+from src.utils.logger import Logger, get_logger
 
 
 class HabsevAPI:
@@ -20,14 +21,13 @@ class HabsevAPI:
 
     def __init__(
             self, 
-            tasks_starts_at_once: int = 100, 
             proxy: Optional[str] = None,
+            settings: Optional[Settings] = None,
             logger: Optional[Logger] = None
     ) -> None:
-        self._session = AiohttpSession(api=self.API, proxy=proxy)
-        self._semaphore = asyncio.Semaphore(tasks_starts_at_once)
-        self.settings = load_settings()
-        self.logger = logger or Logger()
+        self._session = make_session('habsev', self.API, proxy=proxy)
+        self.settings = settings or get_settings()
+        self.logger = logger or get_logger()
         self._headers = {
             'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
             'accept-language': 'ru-RU,ru;q=0.7',
@@ -171,15 +171,7 @@ class HabsevAPI:
         async def fetch_page(url: str, page: int = 1) -> List[str]:
 
             html = await _make_request(url, page)
-            soup = BeautifulSoup(html, "lxml")
-            product_links = []
-            products = soup.find_all('div', attrs={'class': 'product__item'})
-            
-            for div in products:
-                url = div.find('a').get('href')
-                product_links.append(f'{self.API}{url}')
-
-            return product_links
+            return [f'{self.API}{href}' for href in harvest_links('habsev', html)]
 
         number_pages = await check_page_num(url)
         data = []
@@ -201,6 +193,7 @@ class HabsevAPI:
             f'{url}', 
             headers=self._headers, 
             cookies=self._cookies,
+            raw=True,
         )
 
         return response
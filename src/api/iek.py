@@ -1,17 +1,17 @@
 
 import re
 import math
-import asyncio
 import lxml.html
 from typing import List, Optional, Dict, Any
 
 from bs4 import BeautifulSoup
 from aiohttp import ClientConnectorError
 
-from src.session.aiohttp import AiohttpSession
+from src.parser.listing import harvest_links
+from src.session.factory import make_session
 from src.utils.user_agent import get_user_agent
-from src.core.settings import load_settings
-from src.utils.logger import Logger
+from src.core.settings import Settings, get_settings
+from src.utils.logger import Logger, get_logger
 
 
 class IEKAPI:
@@ -20,14 +20,13 @@ class IEKAPI:
 
     def __init__(
             self, 
-            tasks_starts_at_once: int = 100, 
             proxy: Optional[str] = None,
+            settings: Optional[Settings] = None,
             logger: Optional[Logger] = None
     ) -> None:
-        self._session = AiohttpSession(api=self.API, proxy=proxy)
-        self._semaphore = asyncio.Semaphore(tasks_starts_at_once)
-        self.settings = load_settings()
-        self.logger = logger or Logger()
+        self._session = make_session('iek', self.API, proxy=proxy)
+        self.settings = settings or get_settings()
+        self.logger = logger or get_logger()
         self._headers = {
             'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
             'accept-language': 'ru-RU,ru;q=0.8',
@@ -100,16 +99,7 @@ class IEKAPI:
         async def fetch_page(page: int = 1) -> List[str]:
 
             html = await _make_request(url, page)
-            soup = BeautifulSoup(html, "lxml")
-            product_links = []
-            for div in soup.select("div.product-list-content.wd-scroll"):
-                h3 = div.select_one("h3.wd-entities-title")  # Ищем h3 внутри div
-                if h3:
-                    a = h3.select_one("a")  # Берем ссылку из h3
-                    if a and "href" in a.attrs:
-                        product_links.append(a["href"])
-            
-            return product_links
+            return harvest_links('iek', html)
 
         number_pages = await check_page_num(url)
         data = []
@@ -131,6 +121,7 @@ class IEKAPI:
             'GET', 
             f'{url}', 
             headers=self._headers, 
+            raw=True,
         )
 
         return response
@@ -1,18 +1,19 @@
 
 import re
 import math
-import asyncio
 import lxml.html
-from typing import List, Optional, Dict, Any
+from typing import AsyncGenerator, List, Optional, Dict, Any
 
 from bs4 import BeautifulSoup
 from aiohttp import ClientConnectorError
 
-from src.session.aiohttp import AiohttpSession
+from src.parser.stream import iter_links
+from src.parser.listing import harvest_links
+from src.session.factory import make_session
 from src.session.errors import ServerError
 from src.utils.user_agent import get_user_agent
-from src.core.settings import load_settings
-from src.utils.logger import Logger
+from src.core.settings import Settings, get_settings
+from src.utils.logger import Logger, get_logger
 
 
 class LuminaledAPI:
@@ -21,14 +22,13 @@ class LuminaledAPI:
 
     def __init__(
             self, 
-            tasks_starts_at_once: int = 100, 
             proxy: Optional[str] = None,
+            settings: Optional[Settings] = None,
             logger: Optional[Logger] = None
     ) -> None:
-        self._session = AiohttpSession(api=self.API, proxy=proxy)
-        self._semaphore = asyncio.Semaphore(tasks_starts_at_once)
-        self.settings = load_settings()
-        self.logger = logger or Logger()
+        self._session = make_session('luminaled', self.API, proxy=proxy)
+        self.settings = settings or get_settings()
+        self.logger = logger or get_logger()
         self._headers = {
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
             'Accept-Language': 'ru-RU,ru;q=0.8',
@@ -118,17 +118,20 @@ class LuminaledAPI:
     async def get_all_products(self, url: str) -> List[str]:
 
         html = await self._make_request(url, 1)
-        soup = BeautifulSoup(html, "lxml")
-
-        product_links = []
-        main_div = soup.find('div', attrs={'class': 'row flex-wrap toggleGrid mb-4 products'})
-        products = main_div.find_all('a', attrs={'class': 'link-dark text-decoration-none'})
-        
-        for a in products:
-            url = a.get('href')
-            product_links.append(url)
+        return harvest_links('luminaled', html)
 
-        return product_links
+    async def stream_all_products(self, url: str) -> AsyncGenerator[str, None]:
+        """То же, что ``get_all_products``, но ссылки отдаются по мере загрузки страницы."""
+        self._headers['user-agent'] = get_user_agent()
+        headers = {
+            **self._headers,
+            'Cookie': '; '.join(f'{name}={value}' for name, value in self._cookies.items()),
+        }
+        chunks = self._session.stream_content(f'{url}&limit=1000', headers=headers)
+        async for href in iter_links(
+            chunks, 'row flex-wrap toggleGrid mb-4 products', 'link-dark text-decoration-none'
+        ):
+            yield href
 
 
 
@@ -141,6 +144,7 @@ class LuminaledAPI:
             f'{url}', 
             headers=self._headers, 
             cookies=self._cookies,
+            raw=True,
         )
 
         return response
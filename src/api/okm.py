@@ -1,4 +1,3 @@
-import asyncio
 from typing import (
     List, 
     Optional,
@@ -6,11 +5,13 @@ from typing import (
     Any,
 )
 
-from src.session.aiohttp import AiohttpSession
+from src.session.factory import make_session
+from src.session.base import fast_json_loads
 from src.utils.user_agent import get_user_agent
-from src.core.settings import load_settings
-from src.utils.logger import Logger
+from src.core.settings import Settings, get_settings
+from src.utils.logger import Logger, get_logger
 from src.utils.normalize_data import normalize_name
+from src.utils.price import parse_price
 
 
 class OkmAPI:
@@ -19,14 +20,13 @@ class OkmAPI:
 
     def __init__(
             self, 
-            tasks_starts_at_once: int = 50, 
             proxy: Optional[str] = None,
+            settings: Optional[Settings] = None,
             logger: Optional[Logger] = None
     ) -> None:
-        self._session = AiohttpSession(api=self.API, proxy=proxy)
-        self._semaphore = asyncio.Semaphore(tasks_starts_at_once)
-        self.settings = load_settings()
-        self.logger = logger or Logger()
+        self._session = make_session('okm', self.API, proxy=proxy, json_loads=fast_json_loads)
+        self.settings = settings or get_settings()
+        self.logger = logger or get_logger()
         self._headers = {
             'accept': '*/*',
             'accept-language': 'ru',
@@ -117,12 +117,12 @@ class OkmAPI:
 
         price = data.get('price')
         if price:
-            price = str(price).replace('.', ',')
+            price = parse_price(str(price), decimal='.')
 
         result = {
             "URL": f'https://okm.md/ru/product/{slug}',
             "Название": data.get('title'),
-            "price": str(price) if price else None,
+            "price": price.minor if price else None,
             "Категория": category,
             "Субкатегория": subcategory,
             "Артикул": data.get('code'),  
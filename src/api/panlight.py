@@ -1,4 +1,3 @@
-import asyncio
 from typing import (
     List, 
     Optional,
@@ -8,10 +7,11 @@ from typing import (
 
 from bs4 import BeautifulSoup
 
-from src.session.aiohttp import AiohttpSession
+from src.parser.listing import harvest_links
+from src.session.factory import make_session
 from src.utils.user_agent import get_user_agent
-from src.core.settings import load_settings
-from src.utils.logger import Logger
+from src.core.settings import Settings, get_settings
+from src.utils.logger import Logger, get_logger
 
 
 class PanlightAPI:
@@ -20,14 +20,13 @@ class PanlightAPI:
 
     def __init__(
             self, 
-            tasks_starts_at_once: int = 50, 
             proxy: Optional[str] = None,
+            settings: Optional[Settings] = None,
             logger: Optional[Logger] = None
     ) -> None:
-        self._session = AiohttpSession(api=self.API, proxy=proxy)
-        self._semaphore = asyncio.Semaphore(tasks_starts_at_once)
-        self.settings = load_settings()
-        self.logger = logger or Logger()
+        self._session = make_session('panlight', self.API, proxy=proxy)
+        self.settings = settings or get_settings()
+        self.logger = logger or get_logger()
         self._headers = {
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
             'Accept-Language': 'ru-RU,ru;q=0.7',
@@ -149,16 +148,11 @@ class PanlightAPI:
         product_links = []
         for page in range(100):
             html = await self._make_request(url, page + 1)
-            soup = BeautifulSoup(html, "lxml")
-            products = soup.find_all('div', class_='goods-item-content')
+            products = harvest_links('panlight', html)
             if not products:
                 # self.logger.info(f'PAge not found... no products {page + 1}')
                 break
-            
-            for div in products:
-                a_tag = div.find('a')
-                href = a_tag.get('href')
-                product_links.append(f'{href}')
+            product_links.extend(products)
 
         # self.logger.info(f'{url} products -> {len(product_links)}')
         return product_links
@@ -173,6 +167,7 @@ class PanlightAPI:
             f'{url}', 
             headers=self._headers, 
             cookies=self._cookies,
+            raw=True,
         )
 
         return response
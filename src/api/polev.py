@@ -1,13 +1,13 @@
 import re
-import asyncio
 from typing import List, Optional, Dict, Any
 
 from bs4 import BeautifulSoup
 
-from src.session.aiohttp import AiohttpSession
+from src.parser.listing import harvest_links
+from src.session.factory import make_session
 from src.utils.user_agent import get_user_agent
-from src.core.settings import load_settings
-from src.utils.logger import Logger
+from src.core.settings import Settings, get_settings
+from src.utils.logger import Logger, get_logger
 
 
 class PolevAPI:
@@ -16,14 +16,13 @@ class PolevAPI:
 
     def __init__(
             self, 
-            tasks_starts_at_once: int = 50, 
             proxy: Optional[str] = None,
+            settings: Optional[Settings] = None,
             logger: Optional[Logger] = None
     ) -> None:
-        self._session = AiohttpSession(api=self.API, proxy=proxy)
-        self._semaphore = asyncio.Semaphore(tasks_starts_at_once)
-        self.settings = load_settings()
-        self.logger = logger or Logger()
+        self._session = make_session('polev', self.API, proxy=proxy)
+        self.settings = settings or get_settings()
+        self.logger = logger or get_logger()
         self._headers = {
                 'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
                 'accept-language': 'ru-RU,ru;q=0.8',
@@ -36,7 +35,7 @@ class PolevAPI:
     async def __aexit__(self, *args) -> None:
         await self._session.close()
 
-    async def _make_request(self, url: str, start: int = None) -> str:
+    async def _make_request(self, url: str, start: int = None, raw: bool = False) -> str:
         """Универсальный метод для выполнения запроса."""
         
         full_url = f"{url}?start={start}" if start else url
@@ -47,6 +46,7 @@ class PolevAPI:
                 full_url, 
                 headers=self._headers, 
                 cookies=self._cookies,
+                raw=raw,
             )
         
         return response
@@ -142,15 +142,9 @@ class PolevAPI:
             
             try:
                 html = await self._make_request(page_url)
-                soup = BeautifulSoup(html, "lxml")
-                products = soup.find_all('td', class_='block_product')
-                
-                for product in products:
-                    div_name = product.find('div', class_='name')
-                    a_tag = div_name.find('a')
-                    product_url = a_tag.get('href')
-                    if product_url:
-                        product_links.append(f'{self.API}{product_url}')
+                product_links.extend(
+                    f'{self.API}{product_url}' for product_url in harvest_links('polev', html) if product_url
+                )
                         
             except Exception as e:
                 self.logger.error(f"Error processing page {page + 1}: {str(e)}")
@@ -161,6 +155,6 @@ class PolevAPI:
 
     async def get_html_product(self, url: str):
 
-        response = await self._make_request(url)
+        response = await self._make_request(url, raw=True)
 
         return response
@@ -7,10 +7,11 @@ from typing import List, Optional, Dict, Any
 from bs4 import BeautifulSoup
 from aiohttp import ClientConnectorError
 
-from src.session.aiohttp import AiohttpSession
+from src.parser.listing import harvest_links
+from src.session.factory import make_session
 from src.utils.user_agent import get_user_agent
-from src.core.settings import load_settings
-from src.utils.logger import Logger
+from src.core.settings import Settings, get_settings
+from src.utils.logger import Logger, get_logger
 
 
 class SupratenAPI:
@@ -19,14 +20,13 @@ class SupratenAPI:
 
     def __init__(
             self, 
-            tasks_starts_at_once: int = 100, 
             proxy: Optional[str] = None,
+            settings: Optional[Settings] = None,
             logger: Optional[Logger] = None
     ) -> None:
-        self._session = AiohttpSession(api=self.API, proxy=proxy)
-        self._semaphore = asyncio.Semaphore(tasks_starts_at_once)
-        self.settings = load_settings()
-        self.logger = logger or Logger()
+        self._session = make_session('supraten', self.API, proxy=proxy)
+        self.settings = settings or get_settings()
+        self.logger = logger or get_logger()
         self._headers = {
             'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
             'accept-language': 'ru-RU,ru;q=0.8',
@@ -122,17 +122,6 @@ class SupratenAPI:
             
             return response
 
-        # Функция для извлечения данных о продуктах со страницы
-        def parse_products(soup):
-            div_sp_products = soup.find('div', attrs={'class': 'sp-products'})
-            if div_sp_products is None:
-                return []
-
-            links_products = div_sp_products.find_all(
-                'div', attrs={'class': 'sp-show-product-vertical'}
-            )
-            return [product.find('a').get('href') for product in links_products]
-
         # Шаг 1: Получаем общее количество продуктов и количество страниц
         first_page_response = await fetch_page(page=1)
         soup = BeautifulSoup(first_page_response, "lxml")
@@ -159,9 +148,7 @@ class SupratenAPI:
         for page in range(1, total_pages + 1):
             # print(f"Обработка страницы {page}...")
             page_response = await fetch_page(page)
-            soup = BeautifulSoup(page_response, 'lxml')
-            products = parse_products(soup)
-            data.extend(products)
+            data.extend(harvest_links('supraten', page_response))
 
         self.logger.info(f"Собрано {len(data)} продуктов с {total_pages} страниц. | {url}")
         return data
@@ -175,6 +162,7 @@ class SupratenAPI:
             'GET', 
             f'{url}', 
             headers=self._headers, 
+            raw=True,
         )
 
         if not response:
@@ -182,6 +170,7 @@ class SupratenAPI:
             'GET', 
             f'{url}', 
             headers=self._headers, 
+            raw=True,
         )
 
         return response
@@ -1,18 +1,18 @@
 
 import re
 import math
-import asyncio
 import lxml.html
 from typing import List, Optional, Dict, Any
 
 from bs4 import BeautifulSoup
 from aiohttp import ClientConnectorError
 
-from src.session.aiohttp import AiohttpSession
+from src.parser.listing import harvest_links
+from src.session.factory import make_session
 from src.session.errors import ServerError
 from src.utils.user_agent import get_user_agent
-from src.core.settings import load_settings
-from src.utils.logger import Logger
+from src.core.settings import Settings, get_settings
+from src.utils.logger import Logger, get_logger
 
 
 class VoltaAPI:
@@ -21,14 +21,13 @@ class VoltaAPI:
 
     def __init__(
             self, 
-            tasks_starts_at_once: int = 50, 
             proxy: Optional[str] = None,
+            settings: Optional[Settings] = None,
             logger: Optional[Logger] = None
     ) -> None:
-        self._session = AiohttpSession(api=self.API, proxy=proxy)
-        self._semaphore = asyncio.Semaphore(tasks_starts_at_once)
-        self.settings = load_settings()
-        self.logger = logger or Logger()
+        self._session = make_session('volta', self.API, proxy=proxy)
+        self.settings = settings or get_settings()
+        self.logger = logger or get_logger()
         self._headers = {
             'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
             'accept-language': 'ru-RU,ru;q=0.8',
@@ -158,12 +157,7 @@ class VoltaAPI:
         for page in range(pages):
 
             html = await self._make_request(valid_href, page + 1)
-            soup = BeautifulSoup(html, "lxml")
-            products = soup.find_all('a', class_='product-card__description')
-
-            for a in products:
-                url = a.get('href')
-                product_links.append(f'{self.API}{url}')
+            product_links.extend(f'{self.API}{href}' for href in harvest_links('volta', html))
 
         return product_links
 
@@ -178,6 +172,7 @@ class VoltaAPI:
             f'{url}', 
             headers=self._headers, 
             cookies=self._cookies,
+            raw=True,
         )
 
         return response
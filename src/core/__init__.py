@@ -8,12 +8,13 @@ from src.core.panlight_app import ApplicationPanlight
 from src.core.cablu_app import ApplicationCablu
 from src.core.okm_app import ApplicationOkm
 from src.core.polev_app import ApplicationPolev
-from src.core.settings import load_settings
+from src.core.settings import get_settings, load_settings
 
 
 __all__ = (
     'ApplicationSupraten',
     'load_settings',
+    'get_settings',
     'ApplicationIek',
     'ApplicationHabsev',
     'ApplicationLuminaled',
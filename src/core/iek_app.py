@@ -1,15 +1,16 @@
 import asyncio
-import random
-from typing import Optional, Tuple
+from typing import Optional, Tuple, List
 from datetime import datetime
 
-from aiohttp import ClientConnectorError
-
-from src.session.errors import NetworkError, NotFoundError, APIError
+from src.parser.executor import get_parse_executor
+from src.session.errors import NetworkError
+from src.session.factory import warm_up
+from src.session.metrics import get_request_metrics
+from src.session.retry import REQUEST_ERRORS, RetryPolicy, log_retry
 from src.api.iek import IEKAPI
-from src.utils.logger import Logger
-from src.utils.helper import data_extraction_iek
-from src.core.settings import load_settings, Settings, path
+from src.utils.logger import Logger, get_logger
+from src.parser.memo import extract_cached, get_parse_memo
+from src.core.settings import get_settings, Settings, path
 from src.utils.google import GoogleSheetsWriter
 
 
@@ -21,30 +22,29 @@ class ApplicationIek:
             settings: Optional[Settings] = None, 
             logger: Optional[Logger] = None
     ) -> None:
-        self.logger = logger or Logger()
-        self.settings = settings or load_settings()
+        self.logger = logger or get_logger()
+        self.settings = settings or get_settings()
         self.semaphore = asyncio.Semaphore(max_concurrent_sessions)
+        self.retry = RetryPolicy.from_settings(self.settings.session)
+        self.parser = get_parse_executor()
         self.data = [] 
         self.final_data = {}
+        self.unchanged_urls = set()
 
 
     async def choise_category(self, category_num: int) -> Tuple[str]:
 
-        retries = 3  
-        async with IEKAPI() as ses:
-            categories = None
-            for attempt in range(retries):
-                try:
-                    categories = await ses.get_categories()  
-                    break  # Если запрос успешен, выходим из цикла
-                except (ClientConnectorError, NetworkError, TimeoutError, APIError) as e:
-                    self.logger.warning(f"{attempt + 1}/{retries} Ошибка: {type(e).__name__}")
-                    if attempt < retries - 1:
-                        await asyncio.sleep(5)  
-                    else:
-                        self.logger.error(f"Не удалось получить категории.")
-                except Exception as e:
-                    self.logger.exception(f"Непредвиденная ошибка: {type(e).__name__} -> {e}")
+        async def fetch_categories():
+            async with IEKAPI(settings=self.settings, logger=self.logger) as ses:
+                return await ses.get_categories()
+
+        try:
+            categories = await self.retry.run(
+                fetch_categories, on_retry=log_retry(self.logger, 'Категории')
+            )
+        except Exception as e:
+            self.logger.error(f"Не удалось получить категории: {type(e).__name__}")
+            raise
 
         categories_list = list(categories.items())
         if not 1 <= category_num <= len(categories_list):
@@ -55,39 +55,55 @@ class ApplicationIek:
         return selected_name, selected_url
 
 
-    async def _task_html_to_data(self, url: str, count: int) -> tuple[str, str] | None:
-        async with self.semaphore:
-            retries = 3
-            for attempt in range(retries):
-                async with IEKAPI() as api:
-                    try:
-                        await asyncio.sleep(random.uniform(0.1, 2.0))
-                        response = await api.get_html_product(url)
-                        if response:
-                            data = await data_extraction_iek(response) 
-                        else:
-                            continue
-                        self.final_data[url] = data
-                        self.logger.info(f' {count} Готово -> {url} ✅')
-                        return True
-                    except (ClientConnectorError, NetworkError, NotFoundError, APIError) as e:
-                        if attempt < retries - 1:
-                            retry_delay = random.uniform(3.0, 5.0)
-                            self.logger.warning(
-                                f'{count} ({attempt + 1}/{retries}) Повтор через {retry_delay:.1f} сек. Ошибка: {type(e).__name__}'
-                            )
-                            await asyncio.sleep(retry_delay)
-                            continue
-                        self.logger.error(f'{count} Превышены попытки для {url}')
-                    except KeyboardInterrupt:
-                        self.logger.error("Остановлено пользователем")
-                        raise
-                    except Exception as e:
-                        self.logger.exception(f'{count} Критическая ошибка: {type(e).__name__}')
-                        if attempt == retries - 1:  
-                            return None
-        
-        return None
+    async def _task_all_products(self, url: str) -> List[str]:
+
+        async def fetch_products():
+            async with IEKAPI(settings=self.settings, logger=self.logger) as api:
+                return await api.get_all_products(url)
+
+        try:
+            result = await self.retry.run(fetch_products, on_retry=log_retry(self.logger, url))
+        except REQUEST_ERRORS as e:
+            self.logger.error(f'Ошибка task_all_products {type(e).__name__} -> {url}')
+            return []
+        except Exception as e:
+            self.logger.exception(f'{type(e).__name__} -> {e}')
+            return []
+
+        return result if result is not None else []
+
+
+    async def _task_html_to_data(self, url: str, count: int) -> Optional[bool]:
+
+        async def fetch_product():
+            async with self.semaphore:
+                async with IEKAPI(settings=self.settings, logger=self.logger) as api:
+                    response = await api.get_html_product(url)
+            if not response:
+                raise NetworkError('Пустой ответ')
+            return response
+
+        try:
+            response = await self.retry.run(fetch_product, on_retry=log_retry(self.logger, count))
+            if response.unchanged:
+                # 304 от сервера: страница та же, что в прошлом прогоне
+                self.unchanged_urls.add(url)
+                self.logger.info(f' {count} Без изменений -> {url}')
+                return True
+            # Место в очереди разбора - только под загруженную страницу,
+            # не на время загрузки и пауз между повторами
+            async with self.parser.slot():
+                data = await extract_cached(self.parser, 'iek', url, response)
+        except REQUEST_ERRORS as e:
+            self.logger.error(f'{count} Превышены попытки для {url}: {type(e).__name__}')
+            return None
+        except Exception as e:
+            self.logger.exception(f'{count} Критическая ошибка: {type(e).__name__}')
+            return None
+
+        self.final_data[url] = data
+        self.logger.info(f' {count} Готово -> {url} ✅')
+        return True
         
 
     async def start(self):
@@ -112,11 +128,11 @@ class ApplicationIek:
         for category in to_parse:
             name_category, url = await self.choise_category(category)
 
-            async with IEKAPI() as ses:
-                self.data = await ses.get_all_products(url)
+            self.data = await self._task_all_products(url)
 
             tasks_html_data = []
             self.logger.info(f"Всего товаров найдено: {len(self.data)}")
+            await warm_up('iek', IEKAPI.API)
 
             for count, url in enumerate(self.data, 1):
                 task = asyncio.create_task(self._task_html_to_data(url, count))
@@ -138,5 +154,16 @@ class ApplicationIek:
             rows=rows + 100,
             cols=320
         )
-        await write.write_to_google_sheets(self.final_data, currency='MDL')
+        await write.write_to_google_sheets(
+            self.final_data, currency='MDL', unchanged=self.unchanged_urls
+        )
+        budget = self.retry.budget
+        self.logger.info(f'Повторов за прогон: {budget.spent}/{budget.limit}')
+        metrics = get_request_metrics()
+        if metrics is not None:
+            self.logger.info(metrics.report(clear=True))
+        memo = get_parse_memo()
+        if memo is not None:
+            self.logger.info(memo.report('iek'))
+            memo.save()
         self.logger.info(f'Парсинг завершено {name_list} ...\n')
\ No newline at end of file
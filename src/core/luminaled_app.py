@@ -1,15 +1,16 @@
 import asyncio
-import random
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Tuple, List
 from datetime import datetime
 
-from aiohttp import ClientConnectorError
-
-from src.session.errors import NetworkError, NotFoundError, APIError, ServerError
+from src.parser.executor import get_parse_executor
+from src.session.errors import NetworkError
+from src.session.factory import warm_up
+from src.session.metrics import get_request_metrics
+from src.session.retry import REQUEST_ERRORS, RetryPolicy, log_retry
 from src.api.luminaled import LuminaledAPI
-from src.utils.logger import Logger
-from src.utils.helper import data_extraction_luminaled
-from src.core.settings import load_settings, Settings, path
+from src.utils.logger import Logger, get_logger
+from src.parser.memo import extract_cached, get_parse_memo
+from src.core.settings import get_settings, Settings, path
 from src.utils.google import GoogleSheetsWriter
 
 
@@ -19,33 +20,37 @@ class ApplicationLuminaled:
     def __init__(
             self, 
             max_concurrent_sessions: int = 7,
+            max_concurrent_listings: int = 2,
             settings: Optional[Settings] = None, 
             logger: Optional[Logger] = None
     ) -> None:
-        self.logger = logger or Logger()
-        self.settings = settings or load_settings()
+        self.logger = logger or get_logger()
+        self.settings = settings or get_settings()
         self.semaphore = asyncio.Semaphore(max_concurrent_sessions)
+        # Листинг держит слот всё время чтения потока - у листингов свои
+        # слоты, чтобы запущенные ими товары не ждали конца листингов
+        self.listing_semaphore = asyncio.Semaphore(max_concurrent_listings)
+        self.retry = RetryPolicy.from_settings(self.settings.session)
+        self.parser = get_parse_executor()
         self.data = [] 
+        self.seen_urls = set()
         self.final_data = {}
+        self.unchanged_urls = set()
 
 
     async def choise_category(self, category_num: int) -> Tuple[str]:
 
-        retries = 3  
-        async with LuminaledAPI() as ses:
-            categories = None
-            for attempt in range(retries):
-                try:
-                    categories = await ses.get_categories()  
-                    break  # Если запрос успешен, выходим из цикла
-                except (ClientConnectorError, NetworkError, TimeoutError, APIError) as e:
-                    self.logger.warning(f"{attempt + 1}/{retries} Ошибка: {type(e).__name__}")
-                    if attempt < retries - 1:
-                        await asyncio.sleep(5)  
-                    else:
-                        self.logger.error(f"Не удалось получить категории.")
-                except Exception as e:
-                    self.logger.exception(f"Непредвиденная ошибка: {type(e).__name__} -> {e}")
+        async def fetch_categories():
+            async with LuminaledAPI(settings=self.settings, logger=self.logger) as ses:
+                return await ses.get_categories()
+
+        try:
+            categories = await self.retry.run(
+                fetch_categories, on_retry=log_retry(self.logger, 'Категории')
+            )
+        except Exception as e:
+            self.logger.error(f"Не удалось получить категории: {type(e).__name__}")
+            raise
 
         categories_list = list(categories.items())
         if not 1 <= category_num <= len(categories_list):
@@ -56,85 +61,79 @@ class ApplicationLuminaled:
         return selected_name, selected_url
 
 
-    async def _task_all_products(self, url: str) -> None:
-        async with self.semaphore:  # Use semaphore here
-            retries = 3  # Количество попыток
-            for attempt in range(retries):
-                async with LuminaledAPI() as api:
-                    try:
-                        result = await api.get_all_products(url) 
-                        self.logger.info(f'Спарсил страницы -> {url} ✅')
-                        return result if result is not None else []
-                    except (ClientConnectorError, NetworkError, TimeoutError, APIError) as e:
-                        if attempt < retries - 1:
-                            retry_delay = random.uniform(2.0, 4.0)
-                            self.logger.warning(
-                                f'({attempt + 1}/{retries}) Повтор через {retry_delay:.1f} сек. Ошибка: {type(e).__name__}'
-                            )
-                    except KeyboardInterrupt:
-                        self.logger.error(f'Завершение таски по запросу пользователя.')
-                    except Exception as e:
-                        self.logger.exception(f'{type(e).__name__} -> {e}')
+    async def _task_all_products(self, url: str, tasks: List[asyncio.Task]) -> None:
+        """Читает листинг потоком и сразу ставит в работу каждый найденный товар."""
+
+        async def stream_products():
+            async with self.listing_semaphore:
+                async with LuminaledAPI(settings=self.settings, logger=self.logger) as api:
+                    async for href in api.stream_all_products(url):
+                        # После повтора листинга уже запущенные товары пропускаем
+                        if href in self.seen_urls:
+                            continue
+                        self.seen_urls.add(href)
+                        self.data.append(href)
+                        tasks.append(asyncio.create_task(self._task_html_to_data(href, len(self.data))))
+
+        try:
+            await self.retry.run(stream_products, on_retry=log_retry(self.logger, url))
+        except REQUEST_ERRORS as e:
+            self.logger.error(f'Ошибка task_all_products {type(e).__name__} -> {url}')
+            return
+        except Exception as e:
+            self.logger.exception(f'{type(e).__name__} -> {e}')
+            return
+
+        self.logger.info(f'Спарсил страницы -> {url} ✅')
         
         
 
     async def get_all_urls_in_category_with_retry(self, url: str) -> Dict[str, str]:
-        retries = 3  
-        categories = None
-        for attempt in range(retries):
-            try:
-                async with LuminaledAPI() as ses:
-                    categories = await ses.get_all_urls_in_category(url)
-                    return categories
-            except (ClientConnectorError, 
-                    NetworkError, 
-                    TimeoutError, 
-                    APIError, 
-                    ServerError
-                ) as e:
-                self.logger.warning(f"Попытка {attempt + 1}/{retries} не удалась: {type(e).__name__}")
-                if attempt < retries - 1:
-                    await asyncio.sleep(4)  
-                else:
-                    self.logger.error(f"Не удалось получить категории после {retries} попыток.")
-            except Exception as e:
-                self.logger.exception(f"Непредвиденная ошибка: {type(e).__name__} -> {e}")
+
+        async def fetch_urls():
+            async with LuminaledAPI(settings=self.settings, logger=self.logger) as ses:
+                return await ses.get_all_urls_in_category(url)
+
+        try:
+            return await self.retry.run(fetch_urls, on_retry=log_retry(self.logger, url))
+        except REQUEST_ERRORS as e:
+            self.logger.error(f"Не удалось получить категории {url}: {type(e).__name__}")
+        except Exception as e:
+            self.logger.exception(f"Непредвиденная ошибка: {type(e).__name__} -> {e}")
         return None
     
 
-    async def _task_html_to_data(self, url: str, count: int) -> tuple[str, str] | None:
-        async with self.semaphore:
-            retries = 3
-            for attempt in range(retries):
-                async with LuminaledAPI() as api:
-                    try:
-                        await asyncio.sleep(random.uniform(0.1, 2.0))
-                        response = await api.get_html_product(url)
-                        if response:
-                            data = await data_extraction_luminaled(response) 
-                        else:
-                            continue
-                        self.final_data[url] = data
-                        self.logger.info(f' {count} Готово -> {url} ✅')
-                        return True
-                    except (ClientConnectorError, NetworkError, NotFoundError, APIError) as e:
-                        if attempt < retries - 1:
-                            retry_delay = random.uniform(3.0, 5.0)
-                            self.logger.warning(
-                                f'{count} ({attempt + 1}/{retries}) Повтор через {retry_delay:.1f} сек. Ошибка: {type(e).__name__}'
-                            )
-                            await asyncio.sleep(retry_delay)
-                            continue
-                        self.logger.error(f'{count} Превышены попытки для {url}')
-                    except KeyboardInterrupt:
-                        self.logger.error("Остановлено пользователем")
-                        raise
-                    except Exception as e:
-                        self.logger.exception(f'{count} Критическая ошибка: {type(e).__name__}')
-                        if attempt == retries - 1:  
-                            return None
-        
-        return None
+    async def _task_html_to_data(self, url: str, count: int) -> Optional[bool]:
+
+        async def fetch_product():
+            async with self.semaphore:
+                async with LuminaledAPI(settings=self.settings, logger=self.logger) as api:
+                    response = await api.get_html_product(url)
+            if not response:
+                raise NetworkError('Пустой ответ')
+            return response
+
+        try:
+            response = await self.retry.run(fetch_product, on_retry=log_retry(self.logger, count))
+            if response.unchanged:
+                # 304 от сервера: страница та же, что в прошлом прогоне
+                self.unchanged_urls.add(url)
+                self.logger.info(f' {count} Без изменений -> {url}')
+                return True
+            # Место в очереди разбора - только под загруженную страницу,
+            # не на время загрузки и пауз между повторами
+            async with self.parser.slot():
+                data = await extract_cached(self.parser, 'luminaled', url, response)
+        except REQUEST_ERRORS as e:
+            self.logger.error(f'{count} Превышены попытки для {url}: {type(e).__name__}')
+            return None
+        except Exception as e:
+            self.logger.exception(f'{count} Критическая ошибка: {type(e).__name__}')
+            return None
+
+        self.final_data[url] = data
+        self.logger.info(f' {count} Готово -> {url} ✅')
+        return True
     
 
     async def start(self):
@@ -164,22 +163,18 @@ class ApplicationLuminaled:
                 self.logger.info(f'Не смог собрать ссылки с категории {name_category}')
                 continue
 
+            # Листинги сразу запускают загрузку товаров - прогреваем до них
+            await warm_up('luminaled', LuminaledAPI.API)
+            tasks_html_data = []
             for name, url_category in categories.items():
-                task = asyncio.create_task(self._task_all_products(f'{url_category}'))
+                task = asyncio.create_task(self._task_all_products(f'{url_category}', tasks_html_data))
                 tasks.append(task)
 
-            results = await asyncio.gather(*tasks)
-            
-            for result in results:
-                self.data.extend(result)
+            # Товары начинают грузиться, пока листинги ещё читаются
+            await asyncio.gather(*tasks)
             tasks.clear()
 
-            tasks_html_data = []
             self.logger.info(f"Всего товаров найдено: {len(self.data)}")
-            for count, url in enumerate(self.data, 1):
-                task = asyncio.create_task(self._task_html_to_data(url, count))
-                tasks_html_data.append(task)
-
             await asyncio.gather(*tasks_html_data)
             self.logger.info(f'Парсинг категории {name_category} завершено ...\n')
             self.data.clear()
@@ -196,5 +191,16 @@ class ApplicationLuminaled:
             rows=rows + 100,
             cols=110
         )
-        await write.write_to_google_sheets(self.final_data, currency='MDL')
+        await write.write_to_google_sheets(
+            self.final_data, currency='MDL', unchanged=self.unchanged_urls
+        )
+        budget = self.retry.budget
+        self.logger.info(f'Повторов за прогон: {budget.spent}/{budget.limit}')
+        metrics = get_request_metrics()
+        if metrics is not None:
+            self.logger.info(metrics.report(clear=True))
+        memo = get_parse_memo()
+        if memo is not None:
+            self.logger.info(memo.report('luminaled'))
+            memo.save()
         self.logger.info(f'Парсинг завершено {name_list} ...\n')
@@ -1,13 +1,13 @@
 import asyncio
-from typing import Optional, Tuple
+from typing import Optional, Tuple, List
 from datetime import datetime
 
-from aiohttp import ClientConnectorError
-
-from src.session.errors import NetworkError, NotFoundError, APIError
+from src.session.factory import warm_up
+from src.session.metrics import get_request_metrics
+from src.session.retry import REQUEST_ERRORS, RetryPolicy, log_retry
 from src.api.okm import OkmAPI
-from src.core.settings import load_settings, Settings, path
-from src.utils.logger import Logger
+from src.core.settings import get_settings, Settings, path
+from src.utils.logger import Logger, get_logger
 from src.utils.google import GoogleSheetsWriter
 
 
@@ -19,30 +19,27 @@ class ApplicationOkm:
             settings: Optional[Settings] = None, 
             logger: Optional[Logger] = None
     ) -> None:
-        self.logger = logger or Logger()
-        self.settings = settings or load_settings()
+        self.logger = logger or get_logger()
+        self.settings = settings or get_settings()
         self.semaphore = asyncio.Semaphore(max_concurrent_sessions)
+        self.retry = RetryPolicy.from_settings(self.settings.session)
         self.data = [] 
         self.final_data = {}
 
 
     async def choise_category(self, category_num: int) -> Tuple[str]:
 
-        retries = 3  
-        async with OkmAPI() as ses:
-            categories = None
-            for attempt in range(retries):
-                try:
-                    categories = await ses.get_categories()  
-                    break  # Если запрос успешен, выходим из цикла
-                except (ClientConnectorError, NetworkError, TimeoutError, APIError) as e:
-                    self.logger.warning(f"Попытка {attempt + 1}/{retries} не удалась: {type(e).__name__}")
-                    if attempt < retries - 1:
-                        await asyncio.sleep(5)  
-                    else:
-                        self.logger.error(f"Не удалось получить категории после {retries} попыток.")
-                except Exception as e:
-                    self.logger.exception(f"Непредвиденная ошибка: {type(e).__name__} -> {e}")
+        async def fetch_categories():
+            async with OkmAPI(settings=self.settings, logger=self.logger) as ses:
+                return await ses.get_categories()
+
+        try:
+            categories = await self.retry.run(
+                fetch_categories, on_retry=log_retry(self.logger, 'Категории')
+            )
+        except Exception as e:
+            self.logger.error(f"Не удалось получить категории: {type(e).__name__}")
+            raise
 
         categories_list = list(categories.items())
         if not 1 <= category_num <= len(categories_list):
@@ -53,43 +50,45 @@ class ApplicationOkm:
         return selected_name, selected_url
 
 
-    async def _task_all_products(self, slug: str) -> None:
-        async with self.semaphore:  
-            retries = 3  
-            for attempt in range(retries):
-                try:
-                    async with OkmAPI() as api:
-                        result = await api.get_all_products(slug) 
-                        self.logger.info(f'Спарсил страницы -> {slug} ✅')
-                        return result if result is not None else []
-                except (ClientConnectorError, NetworkError, TimeoutError, APIError) as e:
-                    if attempt < retries - 1:
-                        await asyncio.sleep(5)
-                        self.logger.error(f'Ошибка task_all_products {type(e).__name__} ')
-                except KeyboardInterrupt:
-                    self.logger.error(f'Завершение таски по запросу пользователя.')
-                except Exception as e:
-                    self.logger.exception(f'{type(e).__name__} -> {e}')
-
-
-    async def _task_html_data(self, slug: str, count: int) -> None:
-        async with self.semaphore:  # Use semaphore here
-            retries = 3  # Количество попыток
-            for attempt in range(retries):
-                async with OkmAPI() as api:
-                    try:
-                        result = await api.get_data_product(slug)
-                        self.final_data[f'https://okm.md/ru/product/{slug}'] = result
-                        self.logger.info(f' {count} Готово -> {slug} ✅')
-                        return True
-                    except (ClientConnectorError, NetworkError, NotFoundError, APIError) as e:
-                        if attempt < retries - 1:
-                            self.logger.info(f'{count} ({attempt})Повторный запрос на товар -> {slug}')
-                            await asyncio.sleep(4)
-                    except KeyboardInterrupt:
-                        self.logger.error(f'Завершение таски по запросу пользователя.')
-                    except Exception as e:
-                        self.logger.exception(f'{type(e).__name__} -> {e}')
+    async def _task_all_products(self, slug: str) -> List[str]:
+
+        async def fetch_products():
+            async with self.semaphore:
+                async with OkmAPI(settings=self.settings, logger=self.logger) as api:
+                    return await api.get_all_products(slug)
+
+        try:
+            result = await self.retry.run(fetch_products, on_retry=log_retry(self.logger, slug))
+        except REQUEST_ERRORS as e:
+            self.logger.error(f'Ошибка task_all_products {type(e).__name__} -> {slug}')
+            return []
+        except Exception as e:
+            self.logger.exception(f'{type(e).__name__} -> {e}')
+            return []
+
+        self.logger.info(f'Спарсил страницы -> {slug} ✅')
+        return result if result is not None else []
+
+
+    async def _task_html_data(self, slug: str, count: int) -> Optional[bool]:
+
+        async def fetch_product():
+            async with self.semaphore:
+                async with OkmAPI(settings=self.settings, logger=self.logger) as api:
+                    return await api.get_data_product(slug)
+
+        try:
+            result = await self.retry.run(fetch_product, on_retry=log_retry(self.logger, count))
+        except REQUEST_ERRORS as e:
+            self.logger.error(f'{count} Превышены попытки для {slug}: {type(e).__name__}')
+            return None
+        except Exception as e:
+            self.logger.exception(f'{type(e).__name__} -> {e}')
+            return None
+
+        self.final_data[f'https://okm.md/ru/product/{slug}'] = result
+        self.logger.info(f' {count} Готово -> {slug} ✅')
+        return True
             
 
     async def start(self):
@@ -125,6 +124,7 @@ class ApplicationOkm:
                     self.data.extend(result)
             tasks.clear()
             self.logger.info(f"Всего товаров найдено: {len(self.data)}")
+            await warm_up('okm', OkmAPI.API)
 
             tasks_html_data = []
             for count, slug in enumerate(self.data, 1):
@@ -148,4 +148,9 @@ class ApplicationOkm:
             cols=100
         )
         await write.write_to_google_sheets(self.final_data, currency='лей')
+        budget = self.retry.budget
+        self.logger.info(f'Повторов за прогон: {budget.spent}/{budget.limit}')
+        metrics = get_request_metrics()
+        if metrics is not None:
+            self.logger.info(metrics.report(clear=True))
         self.logger.info(f'Парсинг завершено {name_list} ...\n')
\ No newline at end of file
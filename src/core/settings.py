@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from typing import (
+    Literal,
     Optional,
     Union,
     List,
@@ -47,16 +48,116 @@ class GoogleSettings(BaseSettings):
     
     json_name: str
 
+class SessionSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file="./.env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        env_prefix="SESSION_",
+        extra="ignore",
+    )
+
+    # Пул keep-alive соединений, общий для всех сайтов
+    limit_per_host: int = 10
+    keepalive_timeout: float = 30.0
+    idle_timeout: float = 120.0
+
+    # Прогрев соединений перед загрузкой товаров и кэш DNS, сек
+    warmup_connections: int = 4
+    dns_ttl: int = 300
+
+    # Дисковый HTTP-кэш с ревалидацией (выключен, если каталог не задан)
+    cache_dir: Optional[str] = None
+    cache_max_mb: int = 512
+
+    # Адаптивный лимит запросов в секунду на хост
+    rate_initial: float = 5.0
+    rate_min: float = 0.5
+    rate_max: float = 20.0
+
+    # Общая политика повторов и бюджет повторов на прогон одного сайта
+    retry_attempts: int = 3
+    retry_base_delay: float = 2.0
+    retry_max_delay: float = 30.0
+    retry_budget: int = 500
+    # Сколько всего задача ждёт разомкнутый автомат хоста, прежде чем сдаться
+    retry_max_circuit_wait: float = 600.0
+
+    # Одинаковые одновременные GET-запросы выполняются один раз
+    single_flight: bool = True
+
+    # Автомат отключения хоста по доле ошибок в последних запросах
+    breaker_window: int = 20
+    breaker_min_requests: int = 10
+    breaker_failure_ratio: float = 0.5
+    breaker_cooldown: float = 30.0
+    breaker_max_cooldown: float = 300.0
+
+    # Пул прокси из файла (по одному на строку), выключен, если файл не задан
+    proxy_file: Optional[str] = None
+    proxy_max_per_proxy: int = 4
+    proxy_max_error_rate: float = 0.5
+    proxy_min_requests: int = 10
+
+    # Сайты, которые ходят через HTTP/2 (httpx) вместо aiohttp
+    http2_sites: List[str] = []
+    http2_max_connections: int = 20
+
+    # Гистограммы задержек по хостам в конце прогона каждого сайта
+    metrics: bool = True
+
+    # Запись ответов в архив и прогон из него без сети
+    replay_mode: Optional[Literal['record', 'replay']] = None
+    replay_dir: str = 'replay'
+    replay_latency: float = 0.0
+    replay_jitter: float = 0.0
+
+class ParserSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file="./.env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        env_prefix="PARSER_",
+        extra="ignore",
+    )
+
+    # Где разбирать страницы: процессы, потоки или прямо в цикле событий
+    executor: Literal['process', 'thread', 'inline'] = 'process'
+    # Число воркеров (по умолчанию - число ядер)
+    workers: Optional[int] = None
+    # Сколько загруженных, но ещё не разобранных страниц может ждать воркера
+    queue_size: int = 32
+    # Файл памяти разбора: неизменившиеся страницы не разбираются повторно
+    memo_file: Optional[str] = None
+    # Через сколько дней без обращений запись удаляется из памяти
+    memo_max_age_days: int = 30
+
 class Settings(BaseSettings):
 
     google: GoogleSettings
+    session: SessionSettings
+    parser: ParserSettings
 
 
 def load_settings(
         google: Optional[GoogleSettings] = None,
-
+        session: Optional[SessionSettings] = None,
+        parser: Optional[ParserSettings] = None,
 ) -> Settings:
     return Settings(
         google=google or GoogleSettings(),
+        session=session or SessionSettings(),
+        parser=parser or ParserSettings(),
     )
 
+
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """Настройки процесса: .env разбирается один раз, дальше отдаётся тот же объект."""
+    global _settings
+
+    if _settings is None:
+        _settings = load_settings()
+    return _settings
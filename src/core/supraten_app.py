@@ -1,15 +1,16 @@
 import asyncio
-import random
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Tuple, List, Any
 from datetime import datetime
 
-from aiohttp import ClientConnectorError
-
-from src.session.errors import NetworkError, ForbiddenError, APIError, ServerError, NotFoundError
+from src.parser.executor import get_parse_executor
+from src.session.errors import NetworkError
+from src.session.factory import warm_up
+from src.session.metrics import get_request_metrics
+from src.session.retry import REQUEST_ERRORS, RetryPolicy, log_retry
 from src.api.supraten import SupratenAPI
-from src.utils.logger import Logger
-from src.utils.helper import data_extraction_supraten
-from src.core.settings import load_settings, Settings, path
+from src.utils.logger import Logger, get_logger
+from src.parser.memo import extract_cached, get_parse_memo
+from src.core.settings import get_settings, Settings, path
 from src.utils.google import GoogleSheetsWriter
 
 
@@ -21,30 +22,29 @@ class ApplicationSupraten:
             settings: Optional[Settings] = None, 
             logger: Optional[Logger] = None
     ) -> None:
-        self.logger = logger or Logger()
-        self.settings = settings or load_settings()
+        self.logger = logger or get_logger()
+        self.settings = settings or get_settings()
         self.semaphore = asyncio.Semaphore(max_concurrent_sessions)
+        self.retry = RetryPolicy.from_settings(self.settings.session)
+        self.parser = get_parse_executor()
         self.data = [] 
         self.final_data = {}
+        self.unchanged_urls = set()
 
 
     async def choise_category(self, category_num: int) -> Tuple[str]:
 
-        retries = 3  
-        async with SupratenAPI() as ses:
-            categories = None
-            for attempt in range(retries):
-                try:
-                    categories = await ses.get_categories()  
-                    break  # Если запрос успешен, выходим из цикла
-                except (ClientConnectorError, NetworkError, TimeoutError, APIError) as e:
-                    self.logger.warning(f"{attempt + 1}/{retries} Ошибка: {type(e).__name__}")
-                    if attempt < retries - 1:
-                        await asyncio.sleep(5)  
-                    else:
-                        self.logger.error(f"Не удалось получить категории.")
-                except Exception as e:
-                    self.logger.exception(f"Непредвиденная ошибка: {type(e).__name__} -> {e}")
+        async def fetch_categories():
+            async with SupratenAPI(settings=self.settings, logger=self.logger) as ses:
+                return await ses.get_categories()
+
+        try:
+            categories = await self.retry.run(
+                fetch_categories, on_retry=log_retry(self.logger, 'Категории')
+            )
+        except Exception as e:
+            self.logger.error(f"Не удалось получить категории: {type(e).__name__}")
+            raise
 
         categories_list = list(categories.items())
         if not 1 <= category_num <= len(categories_list):
@@ -59,104 +59,89 @@ class ApplicationSupraten:
         
 
     
-    async def _task_all_products(self, url: str) -> None:
-        async with self.semaphore:  # Use semaphore here
-            retries = 3  # Количество попыток
-            for attempt in range(retries):
-                async with SupratenAPI() as api:
-                    try:
-                        result = await api.get_all_products(url) 
-                        return result if result is not None else []
-                    except (ClientConnectorError, NetworkError) as e:
-                        if attempt < retries - 1:
-                            await asyncio.sleep(6)
-                            result = await api.get_all_products(url) 
-                            return result if result is not None else []
-                    except KeyboardInterrupt:
-                        self.logger.error(f'Завершение таски по запросу пользователя.')
-                    except Exception as e:
-                        self.logger.exception(f'{type(e).__name__} -> {e}')
-
-
-    async def _task_html_data(self, api: SupratenAPI, url: str, count: int) -> None:
-        async with self.semaphore:  # Используем семафор
-            retries = 6  # Количество попыток
-
-            for attempt in range(retries):
-                try:
-                    result = await api.get_html_product(url)
-                    self.logger.info(f'{count} Запрос на товар -> {url}')
-                    return url, result  # Успешный запрос – сразу возвращаем
-                except (ClientConnectorError, NetworkError, ForbiddenError, APIError) as e:
-                    self.logger.warning(f'Попытка {attempt + 1}/{retries} не удалась: {type(e).__name__} -> {e}')
-                    if attempt < retries - 1:
-                        await asyncio.sleep(5)  # Ждем перед повторной попыткой
-                    else:
-                        self.logger.error(f'Не удалось получить данные для {url} после {retries} попыток.')
-                except KeyboardInterrupt:
-                    self.logger.error(f'Завершение таски по запросу пользователя.')
-                    return None
-                except Exception as e:
-                    self.logger.exception(f'Непредвиденная ошибка: {type(e).__name__} -> {e}')
-                    return None  # Прерываем попытки на критической ошибке
-            return None  # Если после всех попыток не удалось получить данные
+    async def _task_all_products(self, url: str) -> List[str]:
 
-    async def get_all_urls_in_category_with_retry(self, url: str) -> Dict[str, str]:
-            retries = 3  # Количество попыток
-            categories = None
-            for attempt in range(retries):
-                try:
-                    async with SupratenAPI() as ses:
-                        categories = await ses.get_all_urls_in_category(url)
-                        return categories
-                except (ClientConnectorError, 
-                        NetworkError, 
-                        TimeoutError, 
-                        APIError, 
-                        ServerError
-                    ) as e:
-                    self.logger.warning(f"Попытка {attempt + 1}/{retries} не удалась: {type(e).__name__}")
-                    if attempt < retries - 1:
-                        await asyncio.sleep(4)  # Ждем 5 секунд перед повторной попыткой
-                    else:
-                        self.logger.error(f"Не удалось получить категории после {retries} попыток.")
-                except Exception as e:
-                    self.logger.exception(f"Непредвиденная ошибка: {type(e).__name__} -> {e}")
+        async def fetch_products():
+            async with self.semaphore:
+                async with SupratenAPI(settings=self.settings, logger=self.logger) as api:
+                    return await api.get_all_products(url)
+
+        try:
+            result = await self.retry.run(fetch_products, on_retry=log_retry(self.logger, url))
+        except REQUEST_ERRORS as e:
+            self.logger.error(f'Ошибка task_all_products {type(e).__name__} -> {url}')
+            return []
+        except Exception as e:
+            self.logger.exception(f'{type(e).__name__} -> {e}')
+            return []
+
+        self.logger.info(f'Спарсил страницы -> {url} ✅')
+        return result if result is not None else []
+
+
+    async def _task_html_data(self, api: SupratenAPI, url: str, count: int) -> Optional[Tuple[str, Any]]:
+
+        async def fetch_product():
+            async with self.semaphore:
+                return await api.get_html_product(url)
+
+        try:
+            result = await self.retry.run(fetch_product, on_retry=log_retry(self.logger, count))
+        except REQUEST_ERRORS as e:
+            self.logger.error(f'Не удалось получить данные для {url}: {type(e).__name__}')
             return None
-    
-    async def _task_html_to_data(self, url: str, count: int) -> tuple[str, str] | None:
-        async with self.semaphore:
-            retries = 3
-            for attempt in range(retries):
-                async with SupratenAPI() as api:
-                    try:
-                        await asyncio.sleep(random.uniform(0.1, 2.0))
-                        response = await api.get_html_product(url)
-                        if response:
-                            data = await data_extraction_supraten(response) 
-                        else:
-                            continue
-                        self.final_data[url] = data
-                        self.logger.info(f' {count} Готово -> {url} ✅')
-                        return True
-                    except (ClientConnectorError, NetworkError, NotFoundError, APIError) as e:
-                        if attempt < retries - 1:
-                            retry_delay = random.uniform(3.0, 5.0)
-                            self.logger.warning(
-                                f'{count} ({attempt + 1}/{retries}) Повтор через {retry_delay:.1f} сек. Ошибка: {type(e).__name__}'
-                            )
-                            await asyncio.sleep(retry_delay)
-                            continue
-                        self.logger.error(f'{count} Превышены попытки для {url}')
-                    except KeyboardInterrupt:
-                        self.logger.error("Остановлено пользователем")
-                        raise
-                    except Exception as e:
-                        self.logger.exception(f'{count} Критическая ошибка: {type(e).__name__}')
-                        if attempt == retries - 1:  
-                            return None
-        
+        except Exception as e:
+            self.logger.exception(f'Непредвиденная ошибка: {type(e).__name__} -> {e}')
+            return None
+
+        self.logger.info(f'{count} Запрос на товар -> {url}')
+        return url, result
+
+    async def get_all_urls_in_category_with_retry(self, url: str) -> Dict[str, str]:
+
+        async def fetch_urls():
+            async with SupratenAPI(settings=self.settings, logger=self.logger) as ses:
+                return await ses.get_all_urls_in_category(url)
+
+        try:
+            return await self.retry.run(fetch_urls, on_retry=log_retry(self.logger, url))
+        except REQUEST_ERRORS as e:
+            self.logger.error(f"Не удалось получить категории {url}: {type(e).__name__}")
+        except Exception as e:
+            self.logger.exception(f"Непредвиденная ошибка: {type(e).__name__} -> {e}")
         return None
+    
+    async def _task_html_to_data(self, url: str, count: int) -> Optional[bool]:
+
+        async def fetch_product():
+            async with self.semaphore:
+                async with SupratenAPI(settings=self.settings, logger=self.logger) as api:
+                    response = await api.get_html_product(url)
+            if not response:
+                raise NetworkError('Пустой ответ')
+            return response
+
+        try:
+            response = await self.retry.run(fetch_product, on_retry=log_retry(self.logger, count))
+            if response.unchanged:
+                # 304 от сервера: страница та же, что в прошлом прогоне
+                self.unchanged_urls.add(url)
+                self.logger.info(f' {count} Без изменений -> {url}')
+                return True
+            # Место в очереди разбора - только под загруженную страницу,
+            # не на время загрузки и пауз между повторами
+            async with self.parser.slot():
+                data = await extract_cached(self.parser, 'supraten', url, response)
+        except REQUEST_ERRORS as e:
+            self.logger.error(f'{count} Превышены попытки для {url}: {type(e).__name__}')
+            return None
+        except Exception as e:
+            self.logger.exception(f'{count} Критическая ошибка: {type(e).__name__}')
+            return None
+
+        self.final_data[url] = data
+        self.logger.info(f' {count} Готово -> {url} ✅')
+        return True
         
 
     async def start(self):
@@ -196,6 +181,7 @@ class ApplicationSupraten:
 
             tasks_html_data = []
             self.logger.info(f'Всего товаров найдено: {len(self.data)} ...')
+            await warm_up('supraten', SupratenAPI.API)
             
             for count, url in enumerate(self.data, 1):
                 task = asyncio.create_task(self._task_html_to_data(url, count))
@@ -217,5 +203,16 @@ class ApplicationSupraten:
             rows=rows + 100,
             cols=200
         )
-        await write.write_to_google_sheets(self.final_data, currency='лей')
+        await write.write_to_google_sheets(
+            self.final_data, currency='лей', unchanged=self.unchanged_urls
+        )
+        budget = self.retry.budget
+        self.logger.info(f'Повторов за прогон: {budget.spent}/{budget.limit}')
+        metrics = get_request_metrics()
+        if metrics is not None:
+            self.logger.info(metrics.report(clear=True))
+        memo = get_parse_memo()
+        if memo is not None:
+            self.logger.info(memo.report('supraten'))
+            memo.save()
         self.logger.info(f'Парсинг завершено {name_list} ...\n')
\ No newline at end of file
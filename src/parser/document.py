@@ -0,0 +1,38 @@
+from typing import Dict, Optional, Union
+
+import lxml.html
+from bs4 import BeautifulSoup
+
+from src.session.response import RawContent
+
+
+_Markup = Union[str, bytes, RawContent]
+
+_DEFAULT_ENCODING = 'utf-8'
+_html_parsers: Dict[str, lxml.html.HTMLParser] = {}
+
+
+def _html_parser(encoding: Optional[str]) -> lxml.html.HTMLParser:
+    encoding = (encoding or _DEFAULT_ENCODING).lower()
+    parser = _html_parsers.get(encoding)
+    if parser is None:
+        parser = _html_parsers[encoding] = lxml.html.HTMLParser(encoding=encoding)
+    return parser
+
+
+def make_tree(markup: _Markup) -> lxml.html.HtmlElement:
+    """Строит lxml-дерево из строки, байтов или RawContent без лишнего декодирования."""
+    if isinstance(markup, RawContent):
+        return lxml.html.fromstring(markup.body, parser=_html_parser(markup.encoding))
+    if isinstance(markup, bytes):
+        return lxml.html.fromstring(markup, parser=_html_parser(None))
+    return lxml.html.fromstring(markup)
+
+
+def make_soup(markup: _Markup) -> BeautifulSoup:
+    """То же для BeautifulSoup: байты уходят в lxml вместе с кодировкой."""
+    if isinstance(markup, RawContent):
+        return BeautifulSoup(markup.body, "lxml", from_encoding=markup.encoding or _DEFAULT_ENCODING)
+    if isinstance(markup, bytes):
+        return BeautifulSoup(markup, "lxml", from_encoding=_DEFAULT_ENCODING)
+    return BeautifulSoup(markup, "lxml")
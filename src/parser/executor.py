@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Literal, Optional, Tuple, TypeAlias
+
+
+_Kind: TypeAlias = Literal['process', 'thread', 'inline']
+
+
+def _drive(func: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+    """Выполняет ``func`` в воркере.
+
+    Экстракторы объявлены как ``async def``, но ничего не ждут, поэтому их
+    корутина завершается за один шаг без цикла событий.
+    """
+    result = func(*args)
+    if not asyncio.iscoroutine(result):
+        return result
+    try:
+        result.send(None)
+    except StopIteration as stop:
+        return stop.value
+    result.close()
+    raise RuntimeError(f'{func.__qualname__} waits for I/O and cannot run in the parse executor')
+
+
+class ParseExecutor:
+    """Стадия разбора страниц вне цикла событий.
+
+    BeautifulSoup и lxml работают синхронно: разбор в цикле событий
+    останавливает все запросы в полёте. Здесь разбор уходит в пул процессов
+    (``process``) или потоков (``thread``); ``inline`` оставляет его в цикле.
+
+    Очередь ограничена: ``slot()`` берётся, когда страница уже загружена, и
+    держится до конца её разбора. Пока воркеры заняты, задачи с готовыми
+    страницами ждут места, а загрузки и паузы повторов мест не занимают.
+    """
+
+    __slots__ = ('kind', 'workers', 'queue_size', '_pool', '_slots', 'parsed', 'waits',)
+
+    def __init__(
+            self,
+            kind: _Kind = 'process',
+            workers: Optional[int] = None,
+            queue_size: int = 32,
+    ) -> None:
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self._pool: Optional[Executor] = None
+        self._slots = asyncio.Semaphore(self.workers + queue_size)
+        self.parsed = 0
+        self.waits = 0
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            if self.kind == 'process':
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='parse')
+        return self._pool
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self._slots.locked():
+            self.waits += 1
+        async with self._slots:
+            yield
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Результат ``func(*args)``, посчитанный в пуле."""
+        if self.kind == 'inline':
+            result = _drive(func, args)
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._executor(), _drive, func, args
+            )
+        self.parsed += 1
+        return result
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+_parse_executor: Optional[ParseExecutor] = None
+
+
+def get_parse_executor() -> ParseExecutor:
+    """Общий для процесса пул разбора по настройкам PARSER_*."""
+    global _parse_executor
+
+    if _parse_executor is None:
+        from src.core.settings import get_settings
+
+        settings = get_settings().parser
+        _parse_executor = ParseExecutor(
+            kind=settings.executor,
+            workers=settings.workers,
+            queue_size=settings.queue_size,
+        )
+    return _parse_executor
+
+
+def shutdown_parse_executor() -> None:
+    """Останавливает воркеры разбора. Вызывается один раз в конце прогона."""
+    global _parse_executor
+
+    if _parse_executor is not None:
+        executor, _parse_executor = _parse_executor, None
+        executor.shutdown()
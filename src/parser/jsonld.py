@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import html
+import json
+import re
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+from src.session.response import RawContent
+
+
+_Markup = Union[str, bytes, RawContent]
+
+# Блоки <script type="application/ld+json"> ищутся прямо в байтах, без дерева
+_LD_MARKER = b'application/ld+json'
+_LD_SCRIPT = re.compile(
+    rb'<script[^>]*application/ld\+json[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def _body(markup: _Markup) -> Tuple[bytes, Optional[str]]:
+    if isinstance(markup, RawContent):
+        return markup.body, markup.encoding
+    if isinstance(markup, str):
+        return markup.encode('utf-8'), 'utf-8'
+    return markup, None
+
+
+def _objects(node: Any) -> Iterator[Dict[str, Any]]:
+    # Верхний уровень бывает объектом, списком или {"@graph": [...]}
+    if isinstance(node, list):
+        for item in node:
+            yield from _objects(item)
+    elif isinstance(node, dict):
+        yield node
+        graph = node.get('@graph')
+        if graph is not None:
+            yield from _objects(graph)
+
+
+def _is_product(node: Dict[str, Any]) -> bool:
+    kind = node.get('@type')
+    if isinstance(kind, list):
+        return 'Product' in kind
+    return kind == 'Product'
+
+
+def find_product(markup: _Markup) -> Optional[Dict[str, Any]]:
+    """Первый schema.org ``Product`` из JSON-LD страницы или ``None``.
+
+    Числа разбираются в строки (``"1725.00"`` остаётся ``"1725.00"``), чтобы
+    цена не теряла запись из-за преобразования в float.
+    """
+    body, encoding = _body(markup)
+    if _LD_MARKER not in body:
+        return None
+    for match in _LD_SCRIPT.finditer(body):
+        raw = match.group(1)
+        try:
+            if encoding and encoding.lower().replace('-', '') not in ('utf8', 'ascii'):
+                raw = raw.decode(encoding)
+            data = json.loads(raw, parse_float=str, parse_int=str, strict=False)
+        except (ValueError, LookupError):
+            continue
+        for node in _objects(data):
+            if _is_product(node):
+                return node
+    return None
+
+
+def lookup(node: Dict[str, Any], paths: Union[str, Sequence[str]]) -> Optional[str]:
+    """Значение по пути вида ``offers.price``; у списков берётся первый элемент.
+
+    ``paths`` может быть несколькими путями - возвращается первый непустой.
+    """
+    for path in (paths,) if isinstance(paths, str) else paths:
+        value: Any = node
+        for key in path.split('.'):
+            if isinstance(value, list):
+                value = value[0] if value else None
+            if not isinstance(value, dict):
+                value = None
+                break
+            value = value.get(key)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, str) and (value := html.unescape(value).strip()):
+            return value
+    return None
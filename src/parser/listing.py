@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from lxml import etree
+
+from src.parser.document import make_tree
+from src.parser.xpath import class_is, has_class, has_classes
+
+
+class Listing:
+    """Ссылки на товары со страницы категории одним XPath до ``@href``.
+
+    ``links`` - выражение, сразу возвращающее значения ``href``: дерево
+    строится один раз, объекты BeautifulSoup не создаются. ``container`` -
+    блок списка товаров; если он задан и его нет на странице, ``harvest``
+    возвращает ``None`` (для сайтов, где так заканчивается пагинация).
+    """
+
+    __slots__ = ('links', 'container',)
+
+    def __init__(self, links: str, container: Optional[str] = None) -> None:
+        self.links = etree.XPath(links)
+        self.container = etree.XPath(container) if container is not None else None
+
+    def harvest(self, markup: Any) -> Optional[List[str]]:
+        tree = make_tree(markup)
+        if self.container is not None and not self.container(tree):
+            return None
+        return [str(href) for href in self.links(tree)]
+
+
+# ``descendant::a[1]`` - первая ссылка внутри каждой карточки, как find('a')
+LISTINGS: Dict[str, Listing] = {
+    'supraten': Listing(
+        f'(//div[{has_class("sp-products")}])[1]'
+        f'//div[{has_class("sp-show-product-vertical")}]/descendant::a[1]/@href',
+    ),
+    'iek': Listing(
+        f'//div[{has_classes("product-list-content wd-scroll")}]'
+        f'/descendant::h3[{has_class("wd-entities-title")}][1]/descendant::a[1]/@href',
+    ),
+    'habsev': Listing(f'//div[{has_class("product__item")}]/descendant::a[1]/@href'),
+    'luminaled': Listing(
+        f'(//div[{class_is("row flex-wrap toggleGrid mb-4 products")}])[1]'
+        f'//a[{class_is("link-dark text-decoration-none")}]/@href',
+    ),
+    'electromotor': Listing(f'//h3[{has_class("product-title")}]/descendant::a[1]/@href'),
+    'volta': Listing(f'//a[{has_class("product-card__description")}]/@href'),
+    'panlight': Listing(f'//div[{has_class("goods-item-content")}]/descendant::a[1]/@href'),
+    'cablu': Listing(
+        f'(//ul[@id="product-list-grid"])[1]//div[{has_class("name")}]/descendant::a[1]/@href',
+        container='//ul[@id="product-list-grid"]',
+    ),
+    'polev': Listing(
+        f'//td[{has_class("block_product")}]'
+        f'/descendant::div[{has_class("name")}][1]/descendant::a[1]/@href',
+    ),
+}
+
+
+def harvest_links(site: str, markup: Any) -> Optional[List[str]]:
+    """Значения ``href`` карточек товаров на странице категории ``site``."""
+    return LISTINGS[site].harvest(markup)
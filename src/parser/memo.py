@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, Final, List, Optional, Tuple
+
+from src.parser.schema import get_schema
+from src.session.cache import forget_cached
+from src.session.response import RawContent
+from src.utils.normalize_data import normalize_name
+
+
+# Меняется при смене формата файла - старый файл тогда просто не читается
+MEMO_VERSION: Final[int] = 1
+
+# Модули, от кода которых зависит запись товара: правка любого из них
+# сбрасывает все сохранённые записи
+_SOURCES: Final[Tuple[str, ...]] = (
+    'src.parser.sites',
+    'src.parser.schema',
+    'src.parser.jsonld',
+    'src.parser.region',
+    'src.parser.xpath',
+    'src.utils.normalize_data',
+    'src.utils.price',
+)
+
+# То, что меняется от запроса к запросу при той же карточке товара:
+# скрипты аналитики, комментарии, скрытые поля и токены форм. JSON-LD
+# остаётся - из него берутся поля товара
+_VOLATILE: Final[Tuple[re.Pattern, ...]] = (
+    re.compile(rb'<script\b(?![^>]*ld\+json)[^>]*>.*?</script\s*>', re.IGNORECASE | re.DOTALL),
+    re.compile(rb'<!--.*?-->', re.DOTALL),
+    re.compile(rb'<input\b[^>]*type=["\']hidden["\'][^>]*>', re.IGNORECASE),
+    re.compile(rb'<meta\b[^>]*name=["\'][^"\']*(?:csrf|token)[^"\']*["\'][^>]*>', re.IGNORECASE),
+)
+
+_signature: Optional[bytes] = None
+
+
+def _code_signature() -> bytes:
+    global _signature
+
+    if _signature is None:
+        digest = hashlib.blake2b(str(MEMO_VERSION).encode(), digest_size=16)
+        for name in _SOURCES:
+            __import__(name)
+            with open(sys.modules[name].__file__, 'rb') as file:
+                digest.update(file.read())
+        _signature = digest.digest()
+    return _signature
+
+
+def _body(markup: Any) -> bytes:
+    if isinstance(markup, RawContent):
+        return markup.body
+    if isinstance(markup, str):
+        return markup.encode('utf-8')
+    return markup
+
+
+def fingerprint(site: str, markup: Any, region: bool) -> Optional[str]:
+    """Хэш содержимого страницы, от которого зависит запись товара.
+
+    ``region`` - хэшировать только срез блоков товара (если запись в
+    прошлый раз целиком взята из него). Иначе хэшируется вся страница без
+    ``_VOLATILE``. ``None`` - на странице нет блока товара.
+    """
+    digest = hashlib.blake2b(_code_signature(), digest_size=16)
+    digest.update(site.encode())
+    if region:
+        slicer = get_schema(site).slicer
+        fragment = slicer.slice(markup) if slicer is not None else None
+        if fragment is None:
+            return None
+        digest.update(b'\x01')
+        digest.update(fragment.body)
+    else:
+        body = _body(markup)
+        for pattern in _VOLATILE:
+            body = pattern.sub(b'', body)
+        digest.update(b'\x00')
+        digest.update(body)
+    return digest.hexdigest()
+
+
+class ParseMemo:
+    """Записи товаров между прогонами по хэшу содержимого страницы.
+
+    Файл - JSON ``{url: [хэш, срез ли это, запись, время]}``. Если хэш
+    свежей страницы совпал с сохранённым, запись берётся из файла и
+    страница не разбирается. Записи, к которым не обращались дольше
+    ``max_age`` секунд (товар пропал с сайта), при сохранении удаляются.
+    """
+
+    __slots__ = ('file', 'max_age', '_entries', '_hits', '_misses', '_dirty',)
+
+    def __init__(self, file: str, max_age: float) -> None:
+        self.file = file
+        self.max_age = max_age
+        self._entries: Dict[str, List[Any]] = {}
+        self._hits: Counter[str] = Counter()
+        self._misses: Counter[str] = Counter()
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.file, 'r', encoding='utf-8') as file:
+                stored = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            # Битый файл - начинаем с пустой памяти, при сохранении он перезапишется
+            return
+        if stored.get('version') == MEMO_VERSION:
+            self._entries = stored['entries']
+
+    def get(self, site: str, url: str, markup: Any) -> Optional[Dict[str, Any]]:
+        """Сохранённая запись, если страница не изменилась, иначе ``None``."""
+        entry = self._entries.get(url)
+        if entry is not None:
+            digest, region, record, _ = entry
+            if fingerprint(site, markup, region) == digest:
+                entry[3] = time.time()
+                self._dirty = True
+                self._hits[site] += 1
+                # Копия: приложения дописывают в запись свои поля
+                return dict(record)
+        self._misses[site] += 1
+        return None
+
+    def put(self, site: str, url: str, markup: Any, record: Dict[str, Any], region: bool) -> None:
+        digest = fingerprint(site, markup, region)
+        if digest is None:
+            return
+        self._entries[url] = [digest, region, dict(record), time.time()]
+        self._dirty = True
+
+    def save(self) -> None:
+        """Атомарно пишет файл, отбросив устаревшие записи."""
+        if not self._dirty:
+            return
+        horizon = time.time() - self.max_age
+        self._entries = {
+            url: entry for url, entry in self._entries.items() if entry[3] >= horizon
+        }
+        directory = os.path.dirname(self.file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': MEMO_VERSION, 'entries': self._entries}, file, ensure_ascii=False)
+        os.replace(tmp_path, self.file)
+        self._dirty = False
+
+    def report(self, site: str) -> str:
+        hits, misses = self._hits.pop(site, 0), self._misses.pop(site, 0)
+        total = hits + misses
+        share = hits / total if total else 0.0
+        return f'Память разбора {site}: без разбора {hits}/{total} ({share:.0%}), записей всего {len(self)}'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+async def _extract_sourced(site: str, response: Any) -> Tuple[Optional[Dict[str, Any]], bool]:
+    # То же, что schema.extract, но с признаком «запись взята из среза»
+    data, region = get_schema(site).extract_sourced(response)
+    if data is None:
+        return None, False
+    return await normalize_name(data), region
+
+
+async def extract_cached(parser: Any, site: str, url: str, response: Any) -> Optional[Dict[str, Any]]:
+    """Запись товара из памяти разбора или, если страница изменилась, через ``parser``.
+
+    Хэш считается в цикле событий: поиск блоков и хэш дешевле, чем отдать
+    страницу в пул и построить дерево. Если записи со страницы не вышло,
+    её ответ убирается из HTTP-кэша, чтобы следующий прогон не счёл её
+    неизменной по 304.
+    """
+    memo = get_parse_memo()
+    if memo is not None:
+        data = memo.get(site, url, response)
+        if data is not None:
+            return data
+    try:
+        data, region = await parser.run(_extract_sourced, site, response)
+    except Exception:
+        forget_cached(url)
+        raise
+    if data is None:
+        # Записи нет - без кэша следующий прогон скачает страницу заново, а не
+        # получит 304 и не перенесёт цену, которой в прошлый раз не было
+        forget_cached(url)
+    elif memo is not None:
+        memo.put(site, url, response, data, region)
+    return data
+
+
+_parse_memo: Optional[ParseMemo] = None
+_parse_memo_loaded = False
+
+
+def get_parse_memo() -> Optional[ParseMemo]:
+    """Общая для процесса память разбора или ``None``, если PARSER_MEMO_FILE не задан."""
+    global _parse_memo, _parse_memo_loaded
+
+    if not _parse_memo_loaded:
+        from src.core.settings import get_settings, path
+
+        settings = get_settings().parser
+        if settings.memo_file:
+            _parse_memo = ParseMemo(
+                file=path(settings.memo_file),
+                max_age=settings.memo_max_age_days * 24 * 3600,
+            )
+        _parse_memo_loaded = True
+    return _parse_memo
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import re
+from typing import List, Optional, Sequence, Tuple, Union
+
+from src.session.response import RawContent
+
+
+_Markup = Union[str, bytes, RawContent]
+
+_WRAP_START = b'<html><body>'
+_WRAP_END = b'</body></html>'
+
+
+def _start_tag(selector: str) -> re.Pattern:
+    """Регулярка открывающего тега по селектору ``tag.class`` или ``tag#id``.
+
+    Класс проверяется как токен атрибута - так же, как ``has_class`` в XPath.
+    """
+    if '#' in selector:
+        tag, name = selector.split('#', 1)
+        attr = rb'id=(["\'])' + re.escape(name.encode()) + rb'\1'
+    else:
+        tag, name = selector.split('.', 1)
+        attr = rb'class=(["\'])(?:[^"\']*\s)?' + re.escape(name.encode()) + rb'(?:\s[^"\']*)?\1'
+    return re.compile(rb'<' + re.escape(tag.encode()) + rb'\b[^>]*?\s' + attr + rb'[^>]*>', re.IGNORECASE)
+
+
+class _Region:
+
+    __slots__ = ('name', 'start', 'tags',)
+
+    def __init__(self, selector: str) -> None:
+        tag, name = re.split(r'[.#]', selector, 1)
+        self.name = name.encode()
+        self.start = _start_tag(selector)
+        self.tags = re.compile(rb'<(/?)' + re.escape(tag.encode()) + rb'\b[^>]*>', re.IGNORECASE)
+
+    def _start(self, body: bytes, position: int) -> Optional[re.Match]:
+        # Сначала ищем имя класса как подстроку - это быстрее регулярки по
+        # каждому тегу, - и только вокруг найденного проверяем сам тег
+        position = body.find(self.name, position)
+        while position != -1:
+            opening = body.rfind(b'<', 0, position)
+            if opening != -1 and body.find(b'>', opening, position) == -1:
+                match = self.start.match(body, opening)
+                if match is not None:
+                    return match
+            position = body.find(self.name, position + len(self.name))
+        return None
+
+    def find(self, body: bytes, position: int = 0) -> Optional[Tuple[int, int]]:
+        """Байтовый диапазон первого такого элемента (с ``position``) вместе с закрывающим тегом."""
+        match = self._start(body, position)
+        if match is None:
+            return None
+        depth = 1
+        for tag in self.tags.finditer(body, match.end()):
+            depth += -1 if tag.group(1) else 1
+            if depth == 0:
+                return match.start(), tag.end()
+        return None
+
+    def find_all(self, body: bytes) -> List[Tuple[int, int]]:
+        """Диапазоны всех таких элементов, кроме вложенных друг в друга."""
+        spans: List[Tuple[int, int]] = []
+        span = self.find(body)
+        while span is not None:
+            spans.append(span)
+            span = self.find(body, span[1])
+        return spans
+
+
+class RegionSlicer:
+    """Вырезает из страницы нужные блоки до построения дерева.
+
+    Первый селектор - блок товара: без него срез не делается и страница
+    разбирается целиком. Берётся его первое вхождение, а из остальных
+    (крошки, характеристики) - все: они необязательны и на странице их
+    бывает несколько. Вложенные друг в друга блоки берутся один раз. Разметка внутри
+    ``<script>`` и комментариев не разбирается - на таких страницах
+    блок может не найтись, и тогда тоже разбирается вся страница.
+    """
+
+    __slots__ = ('regions',)
+
+    def __init__(self, selectors: Sequence[str]) -> None:
+        if not selectors:
+            raise ValueError('RegionSlicer needs at least the product block selector')
+        self.regions = [_Region(selector) for selector in selectors]
+
+    def slice(self, markup: _Markup) -> Optional[RawContent]:
+        if isinstance(markup, RawContent):
+            body, encoding = markup.body, markup.encoding
+        elif isinstance(markup, str):
+            body, encoding = markup.encode('utf-8'), 'utf-8'
+        else:
+            body, encoding = markup, None
+
+        product, *optional = self.regions
+        found = product.find(body)
+        if found is None:
+            return None
+        spans: List[Tuple[int, int]] = [found]
+        for region in optional:
+            spans.extend(region.find_all(body))
+
+        spans.sort()
+        parts: List[bytes] = [_WRAP_START]
+        end = -1
+        for start, stop in spans:
+            if start < end:
+                continue
+            parts.append(body[start:stop])
+            end = stop
+        parts.append(_WRAP_END)
+        return RawContent(b''.join(parts), encoding)
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Literal, Mapping, Optional, Sequence, Tuple, TypeAlias, Union
+
+from lxml import etree
+
+from src.parser import jsonld
+from src.parser.document import make_tree
+from src.parser.region import RegionSlicer
+from src.parser.xpath import get_text
+from src.utils.normalize_data import normalize_name
+
+
+_Text: TypeAlias = Literal['strip', 'raw']
+_Merge: TypeAlias = Literal['list', 'last']
+_Post: TypeAlias = Callable[[str], Any]
+
+
+def _text(node: Any, mode: _Text) -> str:
+    # XPath может вернуть и строку (text(), @href) - её берём как есть
+    if isinstance(node, str):
+        return node.strip()
+    if mode == 'strip':
+        return get_text(node)
+    return get_text(node, strip=False).strip()
+
+
+class Field:
+    """Одно поле товара: XPath от корня документа и обработка текста.
+
+    ``index`` - какой из найденных узлов взять (``-2`` для предпоследней
+    крошки), ``min_count`` - сколько узлов должно найтись, чтобы поле
+    вообще считалось. ``text='strip'`` склеивает обрезанные куски текста
+    как ``get_text(strip=True)``, ``'raw'`` обрезает только края.
+    Пустой результат превращается в ``None``.
+
+    ``json_ld`` - путь к тому же значению в schema.org ``Product`` страницы
+    (``'sku'``, ``'offers.price'`` или несколько путей). Если он задан и
+    значение нашлось, XPath не вычисляется; ``json_ld_post`` заменяет
+    ``post`` для такого значения.
+    """
+
+    __slots__ = ('xpath', 'index', 'min_count', 'text', 'post', 'json_ld', 'json_ld_post',)
+
+    def __init__(
+            self,
+            xpath: str,
+            index: int = 0,
+            min_count: int = 1,
+            text: _Text = 'strip',
+            post: Optional[_Post] = None,
+            json_ld: Optional[Union[str, Sequence[str]]] = None,
+            json_ld_post: Optional[_Post] = None,
+    ) -> None:
+        self.xpath = xpath
+        self.index = index
+        self.min_count = min_count
+        self.text = text
+        self.post = post
+        self.json_ld = json_ld
+        self.json_ld_post = json_ld_post
+
+
+class Table:
+    """Таблица «ключ - значение»: строки и ячейки в каждой строке.
+
+    Ключ и значение берутся из первых узлов ``key``/``value`` строки, либо,
+    если задан ``split``, из текста строки до и после разделителя. Строки
+    без ключа пропускаются; без значения - тоже, если не ``keep_missing``.
+    ``rename`` переименовывает ключи, ``only`` оставляет только их.
+    Повторный ключ при ``merge='list'`` собирается в список, при ``'last'``
+    перезаписывается.
+    """
+
+    __slots__ = (
+        'rows', 'key', 'value', 'split', 'text', 'key_post', 'value_post',
+        'rename', 'only', 'merge', 'keep_missing',
+    )
+
+    def __init__(
+            self,
+            rows: str,
+            key: Optional[str] = None,
+            value: Optional[str] = None,
+            split: Optional[str] = None,
+            text: _Text = 'strip',
+            key_post: Optional[_Post] = None,
+            value_post: Optional[_Post] = None,
+            rename: Optional[Mapping[str, str]] = None,
+            only: bool = False,
+            merge: _Merge = 'last',
+            keep_missing: bool = False,
+    ) -> None:
+        if split is None and (key is None or value is None):
+            raise ValueError('Table needs either key and value XPaths or split')
+        self.rows = rows
+        self.key = key
+        self.value = value
+        self.split = split
+        self.text = text
+        self.key_post = key_post
+        self.value_post = value_post
+        self.rename = dict(rename or {})
+        self.only = only
+        self.merge = merge
+        self.keep_missing = keep_missing
+
+
+class Schema:
+    """Описание страницы товара одного сайта.
+
+    ``guard`` - XPath блока, без которого страница не считается страницей
+    товара (экстрактор вернёт ``None``). Поля заполняются в порядке
+    объявления, затем таблицы дописывают характеристики в тот же словарь.
+
+    Если у полей есть ``json_ld``, сначала читается JSON-LD страницы, а
+    XPath считаются только для недостающих полей и таблиц. Когда JSON-LD
+    закрывает все поля и таблиц нет, дерево не строится вовсе.
+
+    ``regions`` - селекторы ``tag.class``/``tag#id`` блоков, в которых лежат
+    все поля: первый - блок товара, дальше крошки и прочее. Тогда дерево
+    строится только из этих блоков, без меню, подвала и скриптов. Если на
+    срезе не нашлось хоть одно поле или ни одной строки какой-то таблицы,
+    страница разбирается целиком.
+    """
+
+    __slots__ = ('site', 'guard', 'fields', 'tables', 'regions',)
+
+    def __init__(
+            self,
+            site: str,
+            guard: str,
+            fields: Mapping[str, Field],
+            tables: Sequence[Table] = (),
+            regions: Sequence[str] = (),
+    ) -> None:
+        self.site = site
+        self.guard = guard
+        self.fields = dict(fields)
+        self.tables = tuple(tables)
+        self.regions = tuple(regions)
+
+    def compile(self) -> CompiledSchema:
+        return CompiledSchema(self)
+
+
+class _CompiledField:
+
+    __slots__ = ('name', 'xpath', 'index', 'min_count', 'text', 'post', 'json_ld', 'json_ld_post',)
+
+    def __init__(self, name: str, field: Field) -> None:
+        self.name = name
+        self.xpath = etree.XPath(field.xpath)
+        self.index = field.index
+        self.min_count = max(field.min_count, field.index + 1 if field.index >= 0 else -field.index)
+        self.text = field.text
+        self.post = field.post
+        self.json_ld = field.json_ld
+        self.json_ld_post = field.json_ld_post
+
+    def __call__(self, tree: etree._Element) -> Any:
+        nodes = self.xpath(tree)
+        if len(nodes) < self.min_count:
+            return None
+        value = _text(nodes[self.index], self.text)
+        if self.post is not None:
+            value = self.post(value)
+        return value or None
+
+    def from_json_ld(self, product: Dict[str, Any]) -> Any:
+        value = jsonld.lookup(product, self.json_ld)
+        if value is not None and self.json_ld_post is not None:
+            value = self.json_ld_post(value)
+        return value or None
+
+
+class _CompiledTable:
+
+    __slots__ = ('table', 'rows', 'key', 'value',)
+
+    def __init__(self, table: Table) -> None:
+        self.table = table
+        self.rows = etree.XPath(table.rows)
+        self.key = etree.XPath(table.key) if table.key is not None else None
+        self.value = etree.XPath(table.value) if table.value is not None else None
+
+    def _pair(self, row: etree._Element) -> Optional[tuple]:
+        table = self.table
+        if table.split is not None:
+            text = _text(row, table.text)
+            if table.split not in text:
+                return None
+            key, value = text.split(table.split, 1)
+            return key.strip(), value.strip()
+
+        keys = self.key(row)
+        if not keys:
+            return None
+        values = self.value(row)
+        if not values and not table.keep_missing:
+            return None
+        return _text(keys[0], table.text), _text(values[0], table.text) if values else None
+
+    def __call__(self, tree: etree._Element, data: Dict[str, Any]) -> bool:
+        """Дописывает строки в ``data``; ``False``, если строк таблицы нет вовсе."""
+        table = self.table
+        rows = self.rows(tree)
+        for row in rows:
+            pair = self._pair(row)
+            if pair is None:
+                continue
+            key, value = pair
+            if table.key_post is not None:
+                key = table.key_post(key)
+            if table.rename:
+                if key in table.rename:
+                    key = table.rename[key]
+                elif table.only:
+                    continue
+            if value is not None and table.value_post is not None:
+                value = table.value_post(value)
+
+            if table.merge == 'list' and key in data:
+                if isinstance(data[key], list):
+                    data[key].append(value)
+                else:
+                    data[key] = [data[key], value]
+            else:
+                data[key] = value
+        return bool(rows)
+
+
+class CompiledSchema:
+    """Схема с XPath и срезом блоков, скомпилированными один раз."""
+
+    __slots__ = ('site', 'guard', 'fields', 'tables', 'json_ld', 'slicer',)
+
+    def __init__(self, schema: Schema) -> None:
+        self.site = schema.site
+        self.guard = etree.XPath(schema.guard)
+        self.fields: List[_CompiledField] = [
+            _CompiledField(name, field) for name, field in schema.fields.items()
+        ]
+        self.tables: List[_CompiledTable] = [_CompiledTable(table) for table in schema.tables]
+        self.json_ld = [field for field in self.fields if field.json_ld is not None]
+        self.slicer = RegionSlicer(schema.regions) if schema.regions else None
+
+    def _evaluate(self, tree: etree._Element, found: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Запись и признак полноты: все поля заполнены и у каждой таблицы есть строки."""
+        # JSON-LD Product есть только на странице товара - тогда guard не нужен
+        if not found and not self.guard(tree):
+            return None, False
+        data = {
+            field.name: found[field.name] if field.name in found else field(tree)
+            for field in self.fields
+        }
+        complete = all(value is not None for value in data.values())
+        for table in self.tables:
+            # Без короткого замыкания: строки дописываются из всех таблиц
+            complete = table(tree, data) and complete
+        return data, complete
+
+    def extract(self, markup: Any) -> Optional[Dict[str, Any]]:
+        """Запись товара из страницы: сначала JSON-LD, затем дерево среза или всей страницы."""
+        return self.extract_sourced(markup)[0]
+
+    def extract_sourced(self, markup: Any) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Как ``extract``, плюс признак, что запись целиком взята из среза блоков."""
+        found: Dict[str, Any] = {}
+        if self.json_ld:
+            product = jsonld.find_product(markup)
+            if product is not None:
+                found = {
+                    field.name: value for field in self.json_ld
+                    if (value := field.from_json_ld(product)) is not None
+                }
+        if len(found) == len(self.fields) and not self.tables:
+            return {field.name: found[field.name] for field in self.fields}, False
+
+        if self.slicer is not None:
+            fragment = self.slicer.slice(markup)
+            if fragment is not None:
+                data, complete = self._evaluate(make_tree(fragment), found)
+                if complete:
+                    return data, not found
+        return self._evaluate(make_tree(markup), found)[0], False
+
+
+_compiled: Dict[str, CompiledSchema] = {}
+
+
+def get_schema(site: str) -> CompiledSchema:
+    """Скомпилированная схема сайта. Компилируется один раз на процесс."""
+    schema = _compiled.get(site)
+    if schema is None:
+        from src.parser.sites import SCHEMAS
+
+        schema = _compiled[site] = SCHEMAS[site].compile()
+    return schema
+
+
+async def extract(site: str, response: Any) -> Optional[Dict[str, Any]]:
+    """Общий экстрактор страницы товара по схеме сайта ``site``.
+
+    Функция уровня модуля и принимает имя сайта, а не схему, - так её можно
+    отдать в пул процессов ``ParseExecutor``: каждый воркер компилирует
+    схемы у себя.
+    """
+    data = get_schema(site).extract(response)
+    if data is None:
+        return None
+    return await normalize_name(data)
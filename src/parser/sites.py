@@ -0,0 +1,258 @@
+"""Схемы страниц товара для всех сайтов с HTML-карточками.
+
+Селекторы каждого сайта собраны здесь, разбор выполняет общий движок
+``src.parser.schema``. Новый сайт - это новая ``Schema`` в ``SCHEMAS``,
+отдельный модуль-парсер не нужен. OKM отдаёт JSON и схемы не имеет.
+"""
+from typing import Dict, Optional
+
+from src.parser.schema import Field, Schema, Table
+from src.parser.xpath import class_is, has_class, has_classes
+from src.utils.price import parse_price
+
+
+def after_colon(text: str) -> str:
+    # "Артикул: AB-1" -> "AB-1"
+    return text.split(':')[-1].strip()
+
+
+def _price(text: str) -> Optional[int]:
+    # "1.725,00 MDL", "839.00 MDL", "Цена: 21,00 LEI / шт." -> копейки
+    price = parse_price(text)
+    return price.minor if price is not None else None
+
+
+def _ld_price(text: str) -> Optional[int]:
+    # В JSON-LD цена записана числом: "1725.00" - точка всегда дробная
+    price = parse_price(text, decimal='.')
+    return price.minor if price is not None else None
+
+
+_LD_PRICE = ('offers.price', 'offers.lowPrice')
+
+
+def _drop_soft_hyphen(text: str) -> str:
+    return text.replace('\xad', '').strip()
+
+
+_SUPRATEN_MAIN = '(//div[@class="sp-page-content"])[1]'
+_IEK_SPECS_TAB = (
+    f'(//div[{class_is("wc-tab-inner wd-scroll-content")}]'
+    '[contains(., "Технические характеристики")])[1]'
+)
+_ELECTROMOTOR_SUMMARY = f'(//div[{has_class("summary-inner")}])[1]'
+_HABSEV_PAGE = '(//*[@id="product__page"])[1]'
+_LUMINALED_PAGE = '(//*[@id="product"])[1]'
+_POLEV_FORM = '(//form[@name="product"])[1]'
+
+
+SCHEMAS: Dict[str, Schema] = {schema.site: schema for schema in (
+    Schema(
+        site='supraten',
+        guard=_SUPRATEN_MAIN,
+        fields={
+            'Название': Field(f'{_SUPRATEN_MAIN}//h1[@class="sp-single-product__title"]', text='raw'),
+            'Артикул': Field(f'{_SUPRATEN_MAIN}//div[@class="sp-single-product__sku"]', text='raw', post=after_colon),
+            'Категория': Field(
+                '(//ul[@class="sp-breadcrumbs__list"])[1]//li[@class="sp-breadcrumbs__item"]',
+                index=-2, text='raw',
+            ),
+            'price': Field(f'{_SUPRATEN_MAIN}//p[@class="sp-single-product__price-current"]', text='raw', post=_price),
+        },
+        tables=(
+            Table(
+                rows=(
+                    f'({_SUPRATEN_MAIN}//*[@id="characteristic"]//table[@class="table table-bordered"])[1]'
+                    '//tbody/tr[count(.//td) >= 2]'
+                ),
+                key='(.//td)[1]',
+                value='(.//td)[2]',
+                text='raw',
+            ),
+        ),
+        regions=('div.sp-page-content', 'ul.sp-breadcrumbs__list'),
+    ),
+    Schema(
+        site='iek',
+        guard=f'//h1[{has_class("product_title")}]',
+        fields={
+            'Название': Field(f'//h1[{has_class("product_title")}]', json_ld='name'),
+            'Артикул': Field(
+                f'(//div[{has_class("product_meta")}])[1]//span[{has_class("sku")}]', text='raw', json_ld='sku',
+            ),
+            'Категория': Field(f'//a[{class_is("breadcrumb-link breadcrumb-link-last")}]'),
+            'price': Field(
+                f'//p[{has_class("price")}]', text='raw', post=_price,
+                json_ld=_LD_PRICE, json_ld_post=_ld_price,
+            ),
+        },
+        tables=(
+            Table(
+                # Таблица лежит внутри вкладки или сразу после неё
+                rows=f'({_IEK_SPECS_TAB}//table | {_IEK_SPECS_TAB}/following::table)[1]//tbody//tr',
+                key='.//td[1]',
+                value='.//td[2]',
+                keep_missing=True,
+            ),
+        ),
+        # Блоки страницы WoodMart по отдельности: общего контейнера у полей нет
+        regions=('h1.product_title', 'a.breadcrumb-link-last', 'div.product_meta', 'p.price', 'div.wc-tab-inner'),
+    ),
+    Schema(
+        site='habsev',
+        guard=_HABSEV_PAGE,
+        fields={
+            'Название': Field(f'{_HABSEV_PAGE}//h1[{has_class("product__title")}]'),
+            'Артикул': Field(f'{_HABSEV_PAGE}//div[{has_class("product__code")}]', post=after_colon),
+            'Категория': Field(
+                f'//ol[{has_class("breadcrumb__items")}]//li[{has_class("breadcrumb__item")}]', index=-2,
+            ),
+            'price': Field(f'{_HABSEV_PAGE}//div[{has_class("product__prices")}]', post=_price),
+            'Описание': Field(f'//div[{has_class("description__section")}]//div[{has_class("content")}]'),
+        },
+    ),
+    Schema(
+        site='luminaled',
+        guard=_LUMINALED_PAGE,
+        fields={
+            'Название': Field(f'{_LUMINALED_PAGE}//h1[{has_class("product-item__title")}]', json_ld='name'),
+            'Артикул': Field(f'{_LUMINALED_PAGE}//span[{has_class("changeSkuTo")}]', post=after_colon, json_ld='sku'),
+            'Категория': Field(f'//li[{has_class("breadcrumb-item")}]', index=-2),
+            'price': Field(
+                f'{_LUMINALED_PAGE}//span[{has_class("changePriceTo")}]', post=_price,
+                json_ld=_LD_PRICE, json_ld_post=_ld_price,
+            ),
+        },
+        tables=(
+            Table(
+                rows=f'//div[{class_is("row feature fz-sm mb-4")}]',
+                key=f'.//div[{has_class("feature__title")}]',
+                value=f'.//div[{has_class("feature__description")}]',
+                merge='list',
+            ),
+        ),
+        regions=('div#product', 'li.breadcrumb-item', 'div.feature'),
+    ),
+    Schema(
+        site='electromotor',
+        guard=f'//div[{has_classes("row product-image-summary-wrap")}]',
+        fields={
+            'Название': Field(f'{_ELECTROMOTOR_SUMMARY}//h1[{has_class("product_title")}]', json_ld='name'),
+            'Артикул': Field(
+                f'{_ELECTROMOTOR_SUMMARY}//span[{has_class("sku_wrapper")}]', post=after_colon, json_ld='sku',
+            ),
+            'Категория': Field(f'{_ELECTROMOTOR_SUMMARY}//a[{has_class("breadcrumb-link")}]', index=-1, min_count=2),
+            'price': Field(
+                f'({_ELECTROMOTOR_SUMMARY}//p[{has_class("price")}]'
+                f'//span[{has_class("woocommerce-Price-amount")}])[1]//bdi',
+                text='raw', post=_price,
+                json_ld=_LD_PRICE, json_ld_post=_ld_price,
+            ),
+        },
+        tables=(
+            Table(
+                rows=f'//table[{has_class("woocommerce-product-attributes")}]//tr',
+                key=f'.//th[{has_class("woocommerce-product-attributes-item__label")}]',
+                value=f'.//td[{has_class("woocommerce-product-attributes-item__value")}]//p',
+                text='raw',
+            ),
+        ),
+        regions=('div.product-image-summary-wrap', 'table.woocommerce-product-attributes'),
+    ),
+    Schema(
+        site='volta',
+        guard=f'//div[{class_is("row space-between slider-buy")}]',
+        fields={
+            'Название': Field(f'//h1[{has_class("page-title")}]', text='raw'),
+            'price': Field(f'//div[{has_class("price")}]', post=_price),
+            'Категория': Field(f'(//div[{has_class("breadcrumbs")}])[1]//span', index=-1, min_count=2),
+            'Артикул': Field(f'//div[{has_class("code")}]', text='raw', post=after_colon),
+        },
+        tables=(
+            Table(
+                rows=f'(//div[{has_class("about-item__features-item")}])[1]//div[{has_class("item-wrapper")}]',
+                key=f'.//div[{has_class("key")}]',
+                value=f'.//div[{has_class("value")}]',
+                merge='list',
+            ),
+        ),
+        regions=('div.slider-buy', 'div.breadcrumbs', 'div.about-item__features-item'),
+    ),
+    Schema(
+        site='panlight',
+        guard=f'//div[{has_class("product-page-inner")}]',
+        fields={
+            'Название': Field(f'//div[{has_class("product-page-title")}]', text='raw'),
+            'price': Field(f'//div[{has_class("goods-item-current-price")}]', post=_price),
+            'Категория': Field(f'(//ul[{has_class("breadcrumbs")}])[1]//a', index=-1, min_count=2),
+        },
+        tables=(
+            # "Код товара: P-36", "Бренд: ..." - ключ и значение в одном блоке
+            Table(
+                rows=f'//div[{has_class("product-page-id")}]',
+                split=': ',
+                rename={'Код товара': 'Артикул'},
+            ),
+            Table(
+                rows=f'(//div[{has_class("product-page-characteristics")}])[1]//li[count(.//p) = 2]',
+                key='(.//p)[1]',
+                value='(.//p)[2]',
+                merge='list',
+            ),
+        ),
+        regions=(
+            'div.product-page-inner', 'ul.breadcrumbs', 'div.product-page-id', 'div.product-page-characteristics',
+        ),
+    ),
+    Schema(
+        site='cablu',
+        guard=f'//div[{has_class("product-info")}]',
+        fields={
+            'Название': Field(f'//h1[{class_is("item name fn")}]', text='raw', json_ld='name'),
+            'price': Field(
+                f'//div[{has_class("price")}]', post=_price, json_ld=_LD_PRICE, json_ld_post=_ld_price,
+            ),
+            'Категория': Field(f'//*[{has_class("breadcrumb")}]//li//a//span', index=-2),
+        },
+        tables=(
+            Table(
+                rows=f'//table[{has_class("product-description")}]//tr',
+                key='(.//td//span)[1]',
+                value=f'(.//td[{has_class("description-right")}])[1]',
+                text='raw',
+                key_post=str.lower,
+                rename={'бренд:': 'Бренд', 'код продукта:': 'Артикул'},
+                only=True,
+            ),
+            Table(
+                # Первая строка - заголовок "Характеристики"
+                rows=(
+                    f'((//div[@id="tab-attribute"])[1]//table[{has_class("attribute")}])[1]'
+                    '/descendant::tr[position() > 1][count(.//td) = 2]'
+                ),
+                key='(.//td)[1]',
+                value='(.//td)[2]',
+                key_post=_drop_soft_hyphen,
+                merge='list',
+            ),
+        ),
+        regions=(
+            'div.product-info', 'h1.name', 'div.price', 'ul.breadcrumb',
+            'table.product-description', 'div#tab-attribute',
+        ),
+    ),
+    Schema(
+        site='polev',
+        guard=f'//div[{class_is("jshop productfull")}]',
+        fields={
+            'Название': Field(f'{_POLEV_FORM}//h1', text='raw'),
+            'price': Field('//span[@id="block_price"]', post=_price),
+            'Категория': Field(f'(//ul[{has_class("breadcrumb")}])[1]//a', index=-1, min_count=2),
+            'Артикул': Field(f'{_POLEV_FORM}//span[@id="product_code"]', text='raw', post=after_colon),
+            'Производитель': Field(f'({_POLEV_FORM}//div[{has_class("manufacturer_name")}])[1]//span', text='raw'),
+            'Описание': Field(
+                f'(//div[@id="tabs_container"])[1]//div[{has_class("jshop_prod_description")}]', text='raw',
+            ),
+        },
+    ),
+)}
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import AsyncGenerator, AsyncIterable, FrozenSet, List, Optional
+
+from lxml import etree
+
+
+def _classes(value: Optional[str]) -> FrozenSet[str]:
+    return frozenset(value.split()) if value else frozenset()
+
+
+class StreamingLinkParser:
+    """Инкрементальный разбор листинга: ссылки на товары по мере прихода HTML.
+
+    Куски страницы подаются в ``feed`` и сразу уходят в ``lxml.etree.HTMLPullParser``.
+    Ссылки ``<a>`` с классами ``link_class`` внутри контейнера с классами
+    ``container_class`` возвращаются, как только закрыт их тег. Разобранные
+    элементы тут же удаляются из дерева, поэтому память не растёт вместе
+    со страницей.
+    """
+
+    __slots__ = ('_parser', '_container_class', '_link_class', '_container', 'found',)
+
+    def __init__(
+            self,
+            container_class: str,
+            link_class: str,
+            encoding: Optional[str] = 'utf-8',
+    ) -> None:
+        self._parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+        self._container_class = _classes(container_class)
+        self._link_class = _classes(link_class)
+        self._container: Optional[etree._Element] = None
+        self.found = 0
+
+    def feed(self, chunk: bytes) -> List[str]:
+        self._parser.feed(chunk)
+        return self._read_events()
+
+    def close(self) -> List[str]:
+        self._parser.close()
+        return self._read_events()
+
+    def _read_events(self) -> List[str]:
+        links: List[str] = []
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                if (
+                    self._container is None
+                    and element.tag == 'div'
+                    and self._container_class <= _classes(element.get('class'))
+                ):
+                    self._container = element
+                continue
+
+            if self._container is not None:
+                if element is self._container:
+                    self._container = None
+                elif element.tag == 'a' and self._link_class <= _classes(element.get('class')):
+                    href = element.get('href')
+                    if href:
+                        links.append(href)
+            self._drop(element)
+        self.found += len(links)
+        return links
+
+    @staticmethod
+    def _drop(element: etree._Element) -> None:
+        # Закрытый элемент больше не нужен: чистим его и уже разобранных соседей
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+async def iter_links(
+        chunks: AsyncIterable[bytes],
+        container_class: str,
+        link_class: str,
+        encoding: Optional[str] = 'utf-8',
+) -> AsyncGenerator[str, None]:
+    """Ссылки из потока кусков страницы, см. ``StreamingLinkParser``."""
+    parser = StreamingLinkParser(container_class, link_class, encoding)
+    async for chunk in chunks:
+        for href in parser.feed(chunk):
+            yield href
+    for href in parser.close():
+        yield href
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from lxml import etree
+
+
+# Текст потомков без содержимого <script> и <style> - как get_text() в BeautifulSoup
+_TEXT = etree.XPath('.//text()[not(parent::script or parent::style)]')
+
+
+def has_class(name: str) -> str:
+    """Условие XPath «у элемента есть класс ``name``» - как ``.name`` в CSS."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+def has_classes(names: str) -> str:
+    """Все классы из ``names`` сразу - как ``.a.b`` в CSS."""
+    return ' and '.join(has_class(name) for name in names.split())
+
+
+def class_is(value: str) -> str:
+    """Атрибут class целиком равен ``value`` - как ``class_='a b'`` в BeautifulSoup."""
+    return f'normalize-space(@class)="{value}"'
+
+
+def get_text(element: etree._Element, strip: bool = True) -> str:
+    """Текст элемента по правилам BeautifulSoup.
+
+    ``strip=True`` повторяет ``get_text(strip=True)``: каждый кусок текста
+    обрезается, пустые выбрасываются, остальные склеиваются без разделителя.
+    ``strip=False`` - то же, что ``.text``.
+    """
+    if not strip:
+        return ''.join(_TEXT(element))
+    return ''.join(piece for text in _TEXT(element) if (piece := text.strip()))
+
+
+def first(elements: List[etree._Element]) -> Optional[etree._Element]:
+    return elements[0] if elements else None
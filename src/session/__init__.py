@@ -1,6 +1,20 @@
 from src.session.aiohttp import AiohttpSession 
+from src.session.factory import make_session
+from src.session.httpx import HttpxSession
+from src.session.pool import SessionPool, get_session_pool, close_session_pool
+from src.session.response import HttpResponse, RawContent
+from src.session.singleflight import SingleFlight, get_single_flight
 
 
 __all__ = (
     'AiohttpSession',
+    'HttpxSession',
+    'make_session',
+    'SessionPool',
+    'get_session_pool',
+    'close_session_pool',
+    'HttpResponse',
+    'RawContent',
+    'SingleFlight',
+    'get_single_flight',
 )
\ No newline at end of file
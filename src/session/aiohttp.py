@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import asyncio
-import ssl
 import json
+from http import HTTPStatus
+from contextlib import aclosing, asynccontextmanager, contextmanager
 from typing import (
     Any,
     AsyncGenerator,
+    AsyncIterator,
     Dict,
     Iterable,
+    Iterator,
     List,
+    Mapping,
     TypeAlias,
     Optional,
     Tuple,
@@ -17,8 +21,8 @@ from typing import (
     cast,
 )
 
-import certifi
 from pydantic import BaseModel
+from multidict import CIMultiDict
 from aiohttp import (
     BasicAuth,
     ClientError,
@@ -27,11 +31,28 @@ from aiohttp import (
     FormData,
 )
 
-from src.session.response import ResultType, Response
-from src.session.base import _RequestMethod, BaseSession
+from src.session.response import HttpResponse, RawContent, ResultType
+from src.session.base import _Decode, _RequestMethod, BaseSession, resolve_decode
+from src.session.breaker import CircuitBreaker
+from src.session.cache import CacheEntry, HttpCache
+from src.session.limiter import THROTTLE_ON, RateLimiter
+from src.session.metrics import RequestMetrics
+from src.session.pool import SessionPool, get_ssl_context
+from src.session.proxies import ProxyPool
+from src.session.replay import ReplayArchive
+from src.session.retry import parse_retry_after
+from src.session.singleflight import SingleFlight, request_key
 from src.session import errors as err
 
 
+try:
+    from aiohttp_socks import ProxyConnectionError, ProxyError, ProxyTimeoutError  # type: ignore
+    _PROXY_ERRORS: Tuple[Type[Exception], ...] = (
+        ProxyError, ProxyConnectionError, ProxyTimeoutError,
+    )
+except ImportError:
+    _PROXY_ERRORS = ()
+
 _ProxyBasic: TypeAlias = Union[str, Tuple[str, BasicAuth]]
 _ProxyChain: TypeAlias = Iterable[_ProxyBasic]
 _ProxyType: TypeAlias = Union[_ProxyChain, _ProxyBasic]
@@ -88,12 +109,32 @@ def _prepare_connector(
 
 class AiohttpSession(BaseSession):
 
-    def __init__(self, proxy: Optional[_ProxyType] = None, **kwargs: Any) -> None:
+    def __init__(
+            self, 
+            proxy: Optional[_ProxyType] = None, 
+            pool: Optional[SessionPool] = None, 
+            cache: Optional[HttpCache] = None,
+            limiter: Optional[RateLimiter] = None,
+            single_flight: Optional[SingleFlight] = None,
+            breaker: Optional[CircuitBreaker] = None,
+            proxies: Optional[ProxyPool] = None,
+            metrics: Optional[RequestMetrics] = None,
+            archive: Optional[ReplayArchive] = None,
+            **kwargs: Any
+    ) -> None:
         super().__init__(**kwargs)
         self._session: Optional[ClientSession] = None
+        self._pool = pool
+        self._cache = cache
+        self._limiter = limiter
+        self._single_flight = single_flight
+        self._breaker = breaker
+        self._proxies = proxies
+        self._metrics = metrics
+        self._archive = archive
         self._connector_type: Type[TCPConnector] = TCPConnector
         self._connector_init: Dict[str, Any] = {
-            "ssl": ssl.create_default_context(cafile=certifi.where())
+            "ssl": get_ssl_context()
         }
         self._should_reset_connector = True
         self._proxy = proxy
@@ -150,25 +191,48 @@ class AiohttpSession(BaseSession):
         
         if self._session is None or self._session.closed:
             self._session = ClientSession(
-                connector=self._connector_type(**self._connector_init)
+                connector=self._connector_type(**self._connector_init),
+                trace_configs=[self._metrics.trace_config()] if self._metrics is not None else None,
             )
             self._should_reset_connector = False
         
         return self._session
     
     async def close(self) -> None:
+        # Сессии из пула закрывает сам пул в конце прогона
         if self._session is not None and not self._session.closed:
             await self._session.close()
+
+    @asynccontextmanager
+    async def _borrow_session(
+            self, 
+            url: str, 
+            proxy: Optional[_ProxyType] = None
+    ) -> AsyncIterator[ClientSession]:
+        if self._pool is None:
+            yield await self.create_session()
+            return
+
+        if proxy is None or proxy is self._proxy:
+            proxy = self._proxy
+            connector_type, connector_init = self._connector_type, self._connector_init
+        else:
+            connector_type, connector_init = _prepare_connector(proxy)
+        async with self._pool.session(
+            url, connector_type, connector_init, proxy=proxy
+        ) as session:
+            yield session
     
     async def _make_request(
             self, 
             method: _RequestMethod,
             endpoint: str,
             timeout: Optional[int] = None,
+            decode: Optional[_Decode] = None,
+            raw: bool = False,
             **kwargs: Any
     ) -> ResultType:
         
-        session = await self.create_session()
         if method == 'POST':
             if 'data' in kwargs:
                 kwargs['data'] = self.build_data(kwargs.get('data', {}))
@@ -179,29 +243,211 @@ class AiohttpSession(BaseSession):
             url = endpoint
         else:
             url = self.api + endpoint
-        methods = {
-            'GET': session.get,
-            'POST': session.post
-        }
+
+        key = request_key(method, url, kwargs, timeout, decode, raw)
+        if self._single_flight is not None and key is not None:
+            # Одинаковый GET уже летит - ждём его ответ вместо второго запроса
+            return await self._single_flight.do(
+                key, lambda: self._send(method, url, timeout, decode, raw, **kwargs)
+            )
+        return await self._send(method, url, timeout, decode, raw, **kwargs)
+
+    async def _send(
+            self,
+            method: _RequestMethod,
+            url: str,
+            timeout: Optional[int],
+            decode: Optional[_Decode],
+            raw: bool,
+            **kwargs: Any
+    ) -> ResultType:
+
+        host_breaker = self._breaker.host(url) if self._breaker is not None else None
+        host_limiter = self._limiter.host(url) if self._limiter is not None else None
+
+        if host_breaker is not None:
+            # При разомкнутой цепи хост не трогаем - ошибка уходит сразу
+            host_breaker.before_request()
         try:
-            async with methods[method.upper()](
-                url=url, timeout=self.timeout if timeout is None else timeout, **kwargs
-            ) as resp:
-                raw_result = await resp.text()
-                # raw_result = await resp.json()
+            if host_limiter is not None:
+                await host_limiter.acquire()
+            async with self._route() as proxy:
+                result = await self._exchange(method, url, timeout, decode, raw, proxy, **kwargs)
+        except BaseException as e:
+            if host_breaker is not None:
+                host_breaker.on_result(e)
+            if host_limiter is not None and isinstance(e, THROTTLE_ON):
+                host_limiter.on_throttle()
+            raise
+        if host_breaker is not None:
+            host_breaker.on_result()
+        if host_limiter is not None:
+            host_limiter.on_success()
+        return result
+
+    @asynccontextmanager
+    async def _route(self) -> AsyncIterator[Optional[_ProxyType]]:
+        # Свой прокси у клиента важнее общего пула; без пула сессий
+        # соединение через чужой прокси открыть негде
+        if self._proxy is not None or self._proxies is None or self._pool is None:
+            yield self._proxy
+            return
+
+        async with self._proxies.lease() as proxy:
+            yield proxy
+
+    @contextmanager
+    def _measure(self, url: str, kwargs: Dict[str, Any]) -> Iterator[None]:
+        # Хуки TraceConfig получают замер через trace_request_ctx
+        if self._metrics is None:
+            yield
+            return
+        with self._metrics.measure(url) as timing:
+            kwargs['trace_request_ctx'] = timing
+            yield
+
+    async def _exchange(
+            self,
+            method: _RequestMethod,
+            url: str,
+            timeout: Optional[int],
+            decode: Optional[_Decode],
+            raw: bool,
+            proxy: Optional[_ProxyType],
+            **kwargs: Any
+    ) -> ResultType:
+
+        if self._archive is not None and self._archive.replaying:
+            # Прогон без сети: ответ из архива с синтетической задержкой
+            response = await self._archive.replay(self._archive.make_key(method, url, kwargs))
+        else:
+            response = await self._fetch(method, url, timeout, proxy, **kwargs)
+            if self._archive is not None:
+                self._archive.record(self._archive.make_key(method, url, kwargs), response)
+
+        body = cast(RawContent, response.body)
+        if decode is None and not raw:
+            decode = resolve_decode(response.content_type)
+        if raw:
+            # Байты и кодировку из заголовка отдаём парсеру как есть
+            raw_result: Any = body
+        elif decode == 'json':
+            # JSON-декодеры сами разбирают байты, без промежуточной строки
+            raw_result = body.body
+        else:
+            raw_result = body.text()
+        
+        try:
+            self.check_response(
+                method=method, 
+                status_code=response.status_code, 
+                content=raw_result, 
+                decode=decode, 
+                response=response
+            )
+        except err.APIError as e:
+            e.retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            raise
+
+        return cast(ResultType, response.result)
+
+    async def _fetch(
+            self,
+            method: _RequestMethod,
+            url: str,
+            timeout: Optional[int],
+            proxy: Optional[_ProxyType],
+            **kwargs: Any
+    ) -> HttpResponse:
+
+        cache_key: Optional[str] = None
+        cache_entry: Optional[CacheEntry] = None
+        if self._cache is not None and method.upper() == 'GET':
+            cache_key = self._cache.make_key(url, kwargs.get('params'))
+            cache_entry = self._cache.get(cache_key)
+            if cache_entry is not None:
+                kwargs['headers'] = {
+                    **(kwargs.get('headers') or {}), 
+                    **cache_entry.conditional_headers()
+                }
+
+        try:
+            with self._measure(url, kwargs):
+                async with self._borrow_session(url, proxy) as session:
+                    methods = {
+                        'GET': session.get,
+                        'POST': session.post
+                    }
+                    async with methods[method.upper()](
+                        url=url, timeout=self.timeout if timeout is None else timeout, **kwargs
+                    ) as resp:
+                        response = HttpResponse(
+                            resp.status,
+                            url=str(resp.url),
+                            headers=resp.headers,
+                            cookies={name: morsel.value for name, morsel in resp.cookies.items()},
+                        )
+                        if resp.status == HTTPStatus.NOT_MODIFIED and cache_entry is not None:
+                            # Страница не менялась с прошлого прогона - тело берём из кэша
+                            response.status_code = HTTPStatus.OK
+                            response.body = RawContent(cache_entry.body, cache_entry.encoding, unchanged=True)
+                            if cache_entry.content_type:
+                                headers = CIMultiDict(resp.headers)
+                                headers['Content-Type'] = cache_entry.content_type
+                                response.headers = headers
+                        else:
+                            response.body = RawContent(await resp.read(), resp.charset)
+                            if cache_key is not None and resp.status == HTTPStatus.OK:
+                                self._store_in_cache(cache_key, url, resp.headers, response.body)
         except asyncio.TimeoutError:
             raise err.NetworkError('Request timeout error')
-        except ClientError as e:
+        except (ClientError, *_PROXY_ERRORS) as e:
             raise err.NetworkError(f'{type(e).__name__}: {e}')
-        
-        response: Response[ResultType] = self.check_response(
-            method=method, status_code=resp.status, content=raw_result
-        )
 
-        await session.close() # close session
+        return response
 
-        return cast(ResultType, response.result)
+    def _store_in_cache(
+            self, 
+            key: str, 
+            url: str, 
+            headers: Mapping[str, str], 
+            body: RawContent
+    ) -> None:
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return  # без валидаторов ревалидировать нечем
+        self._cache.put(key, CacheEntry(
+            url=url,
+            body=body.body,
+            etag=etag,
+            last_modified=last_modified,
+            content_type=headers.get('Content-Type'),
+            encoding=body.encoding,
+        ))
     
+    async def warm_up(self, connections: int) -> int:
+        """Открывает до ``connections`` keep-alive соединений к хосту ``api``.
+
+        Одновременные HEAD-запросы заставляют коннектор открыть отдельное
+        соединение на каждый (и заодно кладут адрес хоста в кэш DNS), после
+        ответа соединения возвращаются в пул сессии. Прогревается свой маршрут
+        клиента - прямой или через его ``proxy``.
+        """
+        if connections <= 0 or (self._archive is not None and self._archive.replaying):
+            return 0
+
+        async with self._borrow_session(self.api) as session:
+            async def probe() -> bool:
+                try:
+                    async with session.head(self.api, allow_redirects=False, timeout=self.timeout):
+                        return True
+                except (asyncio.TimeoutError, ClientError, *_PROXY_ERRORS):
+                    return False
+
+            opened = await asyncio.gather(*(probe() for _ in range(connections)))
+        return sum(opened)
+
     async def stream_content(
             self, 
             url: str, 
@@ -210,19 +456,82 @@ class AiohttpSession(BaseSession):
             chunk_size: int = 65536, 
             raise_for_status: bool = True
     ) -> AsyncGenerator[bytes, None]:
+        # Поток идёт через те же автомат и лимит хоста, что и _send
+        host_breaker = self._breaker.host(url) if self._breaker is not None else None
+        host_limiter = self._limiter.host(url) if self._limiter is not None else None
+
+        if host_breaker is not None:
+            host_breaker.before_request()
+        try:
+            if host_limiter is not None:
+                await host_limiter.acquire()
+            async with aclosing(
+                self._stream(url, headers, timeout, chunk_size, raise_for_status)
+            ) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+        except GeneratorExit:
+            # Читатель бросил поток сам - хост ответил, это успех
+            pass
+        except BaseException as e:
+            if host_breaker is not None:
+                host_breaker.on_result(e)
+            if host_limiter is not None and isinstance(e, THROTTLE_ON):
+                host_limiter.on_throttle()
+            raise
+        if host_breaker is not None:
+            host_breaker.on_result()
+        if host_limiter is not None:
+            host_limiter.on_success()
+
+    async def _stream(
+            self,
+            url: str,
+            headers: Optional[Dict[str, Any]],
+            timeout: int,
+            chunk_size: int,
+            raise_for_status: bool
+    ) -> AsyncGenerator[bytes, None]:
         
         if headers is None:
             headers = {}
 
-        session = await self.create_session()
+        if self._archive is not None and self._archive.replaying:
+            body = cast(RawContent, (await self._archive.replay(self._archive.make_key('GET', url, {}))).body)
+            for start in range(0, len(body), chunk_size):
+                yield body.body[start:start + chunk_size]
+            return
 
-        async with session.get(
-            url, timeout=timeout, headers=headers, raise_for_status=raise_for_status
-        ) as resp:
-            async for chunk in resp.content.iter_chunked(chunk_size):
-                yield chunk
+        chunks: List[bytes] = []
+        try:
+            async with self._borrow_session(url) as session:
+                async with session.get(url, timeout=timeout, headers=headers) as resp:
+                    if raise_for_status and resp.status >= HTTPStatus.BAD_REQUEST:
+                        # Те же исключения, что и у обычного запроса
+                        self.check_response('GET', resp.status, await resp.text(), decode='text')
+                    async for chunk in resp.content.iter_chunked(chunk_size):
+                        if self._archive is not None:
+                            chunks.append(chunk)
+                        yield chunk
+        except asyncio.TimeoutError:
+            raise err.NetworkError('Request timeout error')
+        except (ClientError, *_PROXY_ERRORS) as e:
+            raise err.NetworkError(f'{type(e).__name__}: {e}')
+
+        if self._archive is not None:
+            self._archive.record(
+                self._archive.make_key('GET', url, {}),
+                HttpResponse(
+                    resp.status,
+                    RawContent(b''.join(chunks), resp.charset),
+                    url=str(resp.url),
+                    headers=resp.headers,
+                ),
+            )
 
     async def __aenter__(self) -> AiohttpSession:
-        await self.create_session()
+        replaying = self._archive is not None and self._archive.replaying
+        if self._pool is None and not replaying:
+            await self.create_session()
         return self
     
\ No newline at end of file
@@ -18,16 +18,37 @@ from typing import (
     Literal,
 )
 
-from src.session.response import Response, ResultType
+from src.session.response import HttpResponse, RawContent, ResultType
 from src.session import errors as err
 
+try:
+    from orjson import loads as fast_json_loads  # type: ignore
+except ImportError:  
+    fast_json_loads = json.loads
+
 _JsonLoads: TypeAlias = Callable[..., Any]
 _JsonDumps: TypeAlias = Callable[..., str]
 _RequestMethod: TypeAlias = Literal['GET', 'POST']
+_Decode: TypeAlias = Literal['json', 'text']
 
 DEFAULT_TIMEOUT: Final[float] = 60.0
 
 
+def resolve_decode(content_type: Optional[str]) -> Optional[_Decode]:
+    """Выбирает способ декодирования тела по заголовку Content-Type.
+
+    ``None`` означает, что тип неизвестен и нужно пробовать JSON с откатом на текст.
+    """
+    if not content_type:
+        return None
+    mimetype = content_type.split(';', 1)[0].strip().lower()
+    if mimetype == 'application/json' or mimetype.endswith('+json'):
+        return 'json'
+    if mimetype.startswith('text/') or mimetype in ('application/xhtml+xml', 'application/xml'):
+        return 'text'
+    return None
+
+
 class BaseSession(abc.ABC):
 
     __slots__ = ('api', 'json_loads', 'json_dumps', 'timeout',)
@@ -44,33 +65,47 @@ class BaseSession(abc.ABC):
        self.json_dumps = json_dumps
        self.timeout = timeout
 
+    @staticmethod
+    def _decode_text(content: Any, response: Optional[HttpResponse]) -> Any:
+        # Не-JSON тело ошибки - текстом в кодировке из заголовка ответа
+        if not isinstance(content, bytes):
+            return content
+        body = response.body if response is not None else None
+        encoding = body.encoding if isinstance(body, RawContent) else None
+        return RawContent(content, encoding).text()
+
     def check_response(
         self,
         method: _RequestMethod,
         status_code: int,
         content: Any,
-        **kwargs: Any
-    ) -> Response[ResultType]:
+        decode: Optional[_Decode] = None,
+        response: Optional[HttpResponse] = None,
+    ) -> HttpResponse:
         
         # Check if content is a dictionary
         if isinstance(content, dict):
             data = content  # No need to decode, it's already a dict
+        elif decode == 'text' or isinstance(content, RawContent):
+            data = content  # HTML and other text is returned as is, no JSON attempt
         else:
             try:
                 data = self.json_loads(content)
             except Exception as e:
                 if method.upper() == 'GET':
-                    data = content
+                    data = self._decode_text(content, response)
                 else:
                     raise err.ClientDecodeError("Failed to decode object", e, content)
 
         # Continue with status code checks
         if HTTPStatus.OK <= status_code <= HTTPStatus.IM_USED:
-            return Response(
-                status_code=status_code,
-                result=data,
-                **kwargs
-            )
+            if response is None:
+                response = HttpResponse(status_code)
+            response.result = data
+            return response
+
+        if isinstance(data, RawContent):
+            data = data.text()
 
         # Handle specific HTTP errors as before
         if status_code == HTTPStatus.BAD_REQUEST:
@@ -105,6 +140,12 @@ class BaseSession(abc.ABC):
             raise err.ServerError(
                 status_code=status_code, content=data, message='Server is disabled or you are banned'
             )
+        if status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            # 502/503/504 - шлюз или перегрузка: для повторов, автомата и
+            # снижения темпа это та же ошибка сервера
+            raise err.ServerError(
+                status_code=status_code, content=data, message='Server is unavailable'
+            )
 
         raise err.APIError(
             status_code=status_code, content=data, message='Unknown Error'
@@ -120,10 +161,16 @@ class BaseSession(abc.ABC):
         method: _RequestMethod,
         endpoint: str,
         timeout: Optional[int] = None,
+        decode: Optional[_Decode] = None,
+        raw: bool = False,
         **kwargs: Any
     ) -> ResultType:
         raise NotImplementedError
     
+    async def warm_up(self, connections: int) -> int:
+        """Заранее открывает соединения к ``api``; возвращает, сколько открыто."""
+        return 0
+
     @abc.abstractmethod
     async def stream_content(
         self,
@@ -191,9 +238,13 @@ class BaseSession(abc.ABC):
             method: _RequestMethod, 
             endpoint: str, 
             timeout: Optional[int] = None,
+            decode: Optional[_Decode] = None,
+            raw: bool = False,
             **kwargs: Any
     ) -> ResultType:
-        return await self._make_request(method=method, endpoint=endpoint, timeout=timeout, **kwargs)
+        return await self._make_request(
+            method=method, endpoint=endpoint, timeout=timeout, decode=decode, raw=raw, **kwargs
+        )
     
     async def __aenter__(self) -> BaseSession:
         return self
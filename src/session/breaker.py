@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Final, Optional, Tuple, Type
+
+from yarl import URL
+
+from src.session import errors as err
+
+
+DEFAULT_WINDOW: Final[int] = 20
+DEFAULT_MIN_REQUESTS: Final[int] = 10
+DEFAULT_FAILURE_RATIO: Final[float] = 0.5
+DEFAULT_COOLDOWN: Final[float] = 30.0
+DEFAULT_MAX_COOLDOWN: Final[float] = 300.0
+
+CLOSED: Final[str] = 'closed'
+OPEN: Final[str] = 'open'
+HALF_OPEN: Final[str] = 'half_open'
+
+# Ответы, по которым видно, что хост лежит или нас забанили (ServerError - любой 5xx)
+HOST_FAILURES: Final[Tuple[Type[BaseException], ...]] = (
+    err.NetworkError,
+    err.ServerError,
+    err.ForbiddenError,
+)
+
+
+class HostCircuitBreaker:
+    """Автомат закрыт / открыт / полуоткрыт для одного хоста.
+
+    Считает исходы последних ``window`` запросов. Когда доля ошибок среди них
+    достигает ``failure_ratio``, цепь размыкается: запросы к хосту сразу
+    получают ``CircuitOpenError`` с ``retry_after`` до конца паузы. После паузы
+    пропускается один пробный запрос - успех замыкает цепь, ошибка размыкает
+    её снова на вдвое большую паузу (но не дольше ``max_cooldown``).
+    """
+
+    __slots__ = (
+        'host', 'window', 'min_requests', 'failure_ratio', 'cooldown', 'max_cooldown',
+        'state', 'trips', '_outcomes', '_opened_at', '_current_cooldown', '_probing',
+    )
+
+    def __init__(
+            self,
+            host: str,
+            window: int = DEFAULT_WINDOW,
+            min_requests: int = DEFAULT_MIN_REQUESTS,
+            failure_ratio: float = DEFAULT_FAILURE_RATIO,
+            cooldown: float = DEFAULT_COOLDOWN,
+            max_cooldown: float = DEFAULT_MAX_COOLDOWN,
+    ) -> None:
+        self.host = host
+        self.window = window
+        self.min_requests = min_requests
+        self.failure_ratio = failure_ratio
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.trips = 0
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._current_cooldown = cooldown
+        self._probing = False
+
+    def before_request(self) -> None:
+        """Пропускает запрос или бросает ``CircuitOpenError``."""
+        if self.state == CLOSED:
+            return
+        if self.state == OPEN:
+            remaining = self._opened_at + self._current_cooldown - time.monotonic()
+            if remaining > 0:
+                raise err.CircuitOpenError(self.host, remaining)
+            self.state = HALF_OPEN
+        if self._probing:
+            # Пробный запрос уже летит - остальные ждут его исхода
+            raise err.CircuitOpenError(self.host, self.cooldown / 2)
+        self._probing = True
+
+    def on_result(self, error: Optional[BaseException] = None) -> None:
+        if isinstance(error, asyncio.CancelledError):
+            # Исход неизвестен - просто освобождаем место пробного запроса
+            self._probing = False
+            return
+        failed = isinstance(error, HOST_FAILURES)
+        if self.state == HALF_OPEN:
+            self._probing = False
+            if failed:
+                self._open(min(self.max_cooldown, self._current_cooldown * 2))
+            else:
+                self._close()
+            return
+        if self.state == OPEN:
+            return  # ответ на запрос, начатый до размыкания
+        self._outcomes.append(failed)
+        if len(self._outcomes) >= self.min_requests and (
+            sum(self._outcomes) / len(self._outcomes) >= self.failure_ratio
+        ):
+            self._open(self.cooldown)
+
+    def _open(self, cooldown: float) -> None:
+        self.state = OPEN
+        self.trips += 1
+        self._opened_at = time.monotonic()
+        self._current_cooldown = cooldown
+        self._outcomes.clear()
+
+    def _close(self) -> None:
+        self.state = CLOSED
+        self._current_cooldown = self.cooldown
+        self._outcomes.clear()
+
+
+class CircuitBreaker:
+    """Реестр ``HostCircuitBreaker`` по хостам."""
+
+    __slots__ = ('window', 'min_requests', 'failure_ratio', 'cooldown', 'max_cooldown', '_hosts',)
+
+    def __init__(
+            self,
+            window: int = DEFAULT_WINDOW,
+            min_requests: int = DEFAULT_MIN_REQUESTS,
+            failure_ratio: float = DEFAULT_FAILURE_RATIO,
+            cooldown: float = DEFAULT_COOLDOWN,
+            max_cooldown: float = DEFAULT_MAX_COOLDOWN,
+    ) -> None:
+        self.window = window
+        self.min_requests = min_requests
+        self.failure_ratio = failure_ratio
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._hosts: Dict[str, HostCircuitBreaker] = {}
+
+    def host(self, url: str) -> HostCircuitBreaker:
+        host = URL(url).host or ''
+        breaker = self._hosts.get(host)
+        if breaker is None:
+            breaker = self._hosts[host] = HostCircuitBreaker(
+                host,
+                window=self.window,
+                min_requests=self.min_requests,
+                failure_ratio=self.failure_ratio,
+                cooldown=self.cooldown,
+                max_cooldown=self.max_cooldown,
+            )
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        return {host: breaker.state for host, breaker in self._hosts.items()}
+
+    def trips(self) -> Dict[str, int]:
+        return {host: breaker.trips for host, breaker in self._hosts.items() if breaker.trips}
+
+
+_circuit_breaker: Optional[CircuitBreaker] = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Общий для процесса набор автоматов, настроенный из .env."""
+    global _circuit_breaker
+
+    if _circuit_breaker is None:
+        from src.core.settings import get_settings
+
+        settings = get_settings().session
+        _circuit_breaker = CircuitBreaker(
+            window=settings.breaker_window,
+            min_requests=settings.breaker_min_requests,
+            failure_ratio=settings.breaker_failure_ratio,
+            cooldown=settings.breaker_cooldown,
+            max_cooldown=settings.breaker_max_cooldown,
+        )
+    return _circuit_breaker
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Final, Optional
+
+from yarl import URL
+
+
+DEFAULT_MAX_SIZE: Final[int] = 512 * 1024 * 1024  # 512 MB
+
+_SUFFIX: Final[str] = '.cache'
+
+
+class CacheEntry:
+
+    __slots__ = ('url', 'etag', 'last_modified', 'content_type', 'encoding', 'body',)
+
+    def __init__(
+            self,
+            url: str,
+            body: bytes,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None,
+            content_type: Optional[str] = None,
+            encoding: Optional[str] = None,
+    ) -> None:
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_type = content_type
+        self.encoding = encoding
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """Дисковый кэш GET-ответов с валидаторами ETag / Last-Modified.
+
+    Каждая запись - отдельный файл: первая строка JSON с метаданными, дальше тело.
+    Общий размер ограничен ``max_size``, при переполнении удаляются записи,
+    к которым дольше всего не обращались (порядок восстанавливается по mtime файлов).
+    """
+
+    __slots__ = ('directory', 'max_size', '_index', '_size',)
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        full_url = URL(url).update_query(params) if params else URL(url)
+        return hashlib.sha1(str(full_url).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def _load_index(self) -> None:
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(_SUFFIX):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            files.append((stat.st_mtime, name[:-len(_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(files):
+            self._index[key] = size
+            self._size += size
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        if key not in self._index:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                meta = json.loads(file.readline())
+                body = file.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            self._discard(key)
+            return None
+        self._index.move_to_end(key)
+        return CacheEntry(body=body, **meta)
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        meta = json.dumps({
+            'url': entry.url,
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+            'content_type': entry.content_type,
+            'encoding': entry.encoding,
+        }).encode()
+        path = self._path(key)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(meta + b'\n')
+            file.write(entry.body)
+        os.replace(tmp_path, path)
+
+        self._size -= self._index.pop(key, 0)
+        size = len(meta) + 1 + len(entry.body)
+        self._index[key] = size
+        self._size += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_size and len(self._index) > 1:
+            key = next(iter(self._index))
+            self._discard(key)
+
+    def forget(self, url: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Удаляет запись: следующий запрос уйдёт без валидаторов и получит тело, а не 304."""
+        self._discard(self.make_key(url, params))
+
+    def _discard(self, key: str) -> None:
+        self._size -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+_http_cache: Optional[HttpCache] = None
+_http_cache_loaded = False
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Общий для процесса кэш или ``None``, если SESSION_CACHE_DIR не задан."""
+    global _http_cache, _http_cache_loaded
+
+    if not _http_cache_loaded:
+        from src.core.settings import get_settings, path
+
+        settings = get_settings().session
+        if settings.cache_dir:
+            _http_cache = HttpCache(
+                directory=path(settings.cache_dir),
+                max_size=settings.cache_max_mb * 1024 * 1024,
+            )
+        _http_cache_loaded = True
+    return _http_cache
+
+
+def forget_cached(url: str) -> None:
+    """Удаляет ``url`` из общего кэша, если кэш включён."""
+    cache = get_http_cache()
+    if cache is not None:
+        cache.forget(url)
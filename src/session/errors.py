@@ -22,6 +22,7 @@ class DetailedError(BaseError):
 
 class APIError(DetailedError):
     label: str = 'API server says'
+    retry_after: Optional[float] = None
 
     def __init__(
         self,
@@ -54,6 +55,12 @@ class ClientDecodeError(BaseError):
 class NetworkError(BaseError):
     pass
 
+class CircuitOpenError(NetworkError):
+    def __init__(self, host: str, retry_after: float) -> None:
+        super().__init__(f'Circuit for {host} is open, retry in {retry_after:.1f}s')
+        self.host = host
+        self.retry_after = retry_after
+
 class BadRequestError(APIError):
     pass
 
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Optional
+
+from src.session.base import BaseSession
+from src.session.breaker import get_circuit_breaker
+from src.session.cache import get_http_cache
+from src.session.limiter import get_rate_limiter
+from src.session.metrics import get_request_metrics
+from src.session.replay import get_replay_archive
+from src.session.singleflight import get_single_flight
+
+
+def make_session(site: str, api: str, proxy: Optional[str] = None, **kwargs: Any) -> BaseSession:
+    """Сессия для клиента сайта ``site`` с общими для процесса пулом, кэшем и лимитами.
+
+    Сайты из SESSION_HTTP2_SITES получают ``HttpxSession`` (HTTP/2),
+    остальные - ``AiohttpSession``. В режимах записи и воспроизведения
+    (SESSION_REPLAY_MODE) всегда используется ``AiohttpSession``.
+    """
+    from src.core.settings import get_settings
+
+    archive = get_replay_archive()
+    if archive is not None and archive.replaying:
+        # Воспроизведение без сети: лимиты, кэш и прокси только исказят тайминги
+        from src.session.aiohttp import AiohttpSession
+
+        return AiohttpSession(
+            api=api, single_flight=get_single_flight(), archive=archive, **kwargs
+        )
+
+    shared = dict(
+        cache=get_http_cache(),
+        limiter=get_rate_limiter(),
+        single_flight=get_single_flight(),
+        breaker=get_circuit_breaker(),
+        metrics=get_request_metrics(),
+    )
+    if archive is None and site.lower() in get_settings().session.http2_sites:
+        from src.session.httpx import HttpxSession, get_http2_client
+
+        return HttpxSession(
+            api=api, proxy=proxy, client=get_http2_client(proxy), **shared, **kwargs
+        )
+
+    from src.session.aiohttp import AiohttpSession
+    from src.session.pool import get_session_pool
+    from src.session.proxies import get_proxy_pool
+
+    return AiohttpSession(
+        api=api,
+        proxy=proxy,
+        pool=get_session_pool(),
+        proxies=get_proxy_pool(),
+        archive=archive,
+        **shared,
+        **kwargs
+    )
+
+
+async def warm_up(site: str, api: str, connections: Optional[int] = None) -> int:
+    """Прогревает соединения к ``api`` перед массовой загрузкой товаров.
+
+    Без прогрева тысячи задач одновременно резолвят хост и открывают
+    соединения. Число соединений берётся из SESSION_WARMUP_CONNECTIONS,
+    время прогрева попадает в отчёт метрик рядом с холодными запросами.
+    """
+    from src.core.settings import get_settings
+
+    if connections is None:
+        connections = get_settings().session.warmup_connections
+    if connections <= 0:
+        return 0
+
+    started = time.perf_counter()
+    async with make_session(site, api) as session:
+        opened = await session.warm_up(connections)
+    metrics = get_request_metrics()
+    if metrics is not None:
+        metrics.observe_warm_up(api, opened, time.perf_counter() - started)
+    return opened
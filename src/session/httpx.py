@@ -0,0 +1,403 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import aclosing, contextmanager
+from http import HTTPStatus
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Union,
+    cast,
+)
+
+from pydantic import BaseModel
+
+from src.session.base import _Decode, _RequestMethod, BaseSession, resolve_decode
+from src.session.breaker import CircuitBreaker
+from src.session.cache import CacheEntry, HttpCache
+from src.session.limiter import THROTTLE_ON, RateLimiter
+from src.session.metrics import RequestMetrics, RequestTiming
+from src.session.pool import get_ssl_context
+from src.session.response import HttpResponse, RawContent, ResultType
+from src.session.retry import parse_retry_after
+from src.session.singleflight import SingleFlight, request_key
+from src.session import errors as err
+
+if TYPE_CHECKING:
+    import httpx
+
+
+DEFAULT_MAX_CONNECTIONS = 20
+
+
+def _import_httpx() -> Any:
+    try:
+        import httpx  # type: ignore
+        import h2  # type: ignore  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError(
+            "In order to use HTTP/2 client, install "
+            "https://pypi.org/project/httpx/ with the http2 extra (httpx[http2])"
+        ) from exc
+    return httpx
+
+
+def create_http2_client(
+        proxy: Optional[str] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        keepalive_timeout: float = 30.0,
+        prior_knowledge: bool = False,
+) -> httpx.AsyncClient:
+    """``httpx.AsyncClient`` с HTTP/2.
+
+    По HTTPS протокол выбирается через ALPN, и сервер без HTTP/2 получит
+    HTTP/1.1. ``prior_knowledge`` включает h2c (HTTP/2 без TLS) - только для
+    локальных тестовых серверов.
+    """
+    httpx = _import_httpx()
+    return httpx.AsyncClient(
+        http1=not prior_knowledge,
+        http2=True,
+        verify=get_ssl_context(),
+        proxy=proxy,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_timeout,
+        ),
+    )
+
+
+class HttpxSession(BaseSession):
+    """HTTP/2 реализация ``BaseSession`` поверх httpx.
+
+    Все запросы к хосту мультиплексируются в одно-два соединения вместо
+    соединения на каждый запрос в полёте. Кэш, ограничитель скорости,
+    склейка запросов и автомат отключения хоста работают так же, как в
+    ``AiohttpSession``; пул прокси не поддерживается - явный ``proxy``
+    передаётся клиенту целиком.
+    """
+
+    def __init__(
+            self,
+            proxy: Optional[str] = None,
+            client: Optional[httpx.AsyncClient] = None,
+            cache: Optional[HttpCache] = None,
+            limiter: Optional[RateLimiter] = None,
+            single_flight: Optional[SingleFlight] = None,
+            breaker: Optional[CircuitBreaker] = None,
+            metrics: Optional[RequestMetrics] = None,
+            **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self._proxy = proxy
+        self._own_client = client is None
+        self._client = client
+        self._cache = cache
+        self._limiter = limiter
+        self._single_flight = single_flight
+        self._breaker = breaker
+        self._metrics = metrics
+
+    @property
+    def proxy(self) -> Optional[str]:
+        return self._proxy
+
+    def create_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = create_http2_client(proxy=self._proxy)
+            self._own_client = True
+        return self._client
+
+    async def close(self) -> None:
+        # Общий клиент закрывается в конце прогона, свой - здесь
+        if self._own_client and self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+
+    def build_data(self, method: Union[BaseModel, Dict[str, Any], str, bytes]) -> Any:
+        if isinstance(method, (bytes, str)):
+            return method
+        if isinstance(method, BaseModel):
+            method = method.model_dump(
+                warnings=False,
+                exclude_none=True,
+                exclude_unset=True
+            )
+        elif not isinstance(method, dict):
+            raise err.NotValidMethodError(f'Expected BaseModel instance, dict, str or bytes, not {type(method)}')
+        return {
+            key: value for key, item in method.items()
+            if (value := self.prepare_value(item))
+        }
+
+    async def _make_request(
+            self,
+            method: _RequestMethod,
+            endpoint: str,
+            timeout: Optional[int] = None,
+            decode: Optional[_Decode] = None,
+            raw: bool = False,
+            **kwargs: Any
+    ) -> ResultType:
+
+        if method == 'POST' and 'data' in kwargs:
+            data = self.build_data(kwargs.pop('data'))
+            kwargs.pop('json', None)
+            kwargs['content' if isinstance(data, (bytes, str)) else 'data'] = data
+        url = endpoint if '://' in endpoint else self.api + endpoint
+
+        key = request_key(method, url, kwargs, timeout, decode, raw)
+        if self._single_flight is not None and key is not None:
+            return await self._single_flight.do(
+                key, lambda: self._send(method, url, timeout, decode, raw, **kwargs)
+            )
+        return await self._send(method, url, timeout, decode, raw, **kwargs)
+
+    async def _send(
+            self,
+            method: _RequestMethod,
+            url: str,
+            timeout: Optional[int],
+            decode: Optional[_Decode],
+            raw: bool,
+            **kwargs: Any
+    ) -> ResultType:
+
+        host_breaker = self._breaker.host(url) if self._breaker is not None else None
+        host_limiter = self._limiter.host(url) if self._limiter is not None else None
+
+        if host_breaker is not None:
+            host_breaker.before_request()
+        try:
+            if host_limiter is not None:
+                await host_limiter.acquire()
+            result = await self._exchange(method, url, timeout, decode, raw, **kwargs)
+        except BaseException as e:
+            if host_breaker is not None:
+                host_breaker.on_result(e)
+            if host_limiter is not None and isinstance(e, THROTTLE_ON):
+                host_limiter.on_throttle()
+            raise
+        if host_breaker is not None:
+            host_breaker.on_result()
+        if host_limiter is not None:
+            host_limiter.on_success()
+        return result
+
+    async def _exchange(
+            self,
+            method: _RequestMethod,
+            url: str,
+            timeout: Optional[int],
+            decode: Optional[_Decode],
+            raw: bool,
+            **kwargs: Any
+    ) -> ResultType:
+        httpx = _import_httpx()
+
+        cache_key: Optional[str] = None
+        cache_entry: Optional[CacheEntry] = None
+        if self._cache is not None and method.upper() == 'GET':
+            cache_key = self._cache.make_key(url, kwargs.get('params'))
+            cache_entry = self._cache.get(cache_key)
+            if cache_entry is not None:
+                kwargs['headers'] = {
+                    **(kwargs.get('headers') or {}),
+                    **cache_entry.conditional_headers()
+                }
+
+        try:
+            with self._measure(url, kwargs) as timing:
+                resp = await self.create_client().request(
+                    method.upper(), url, timeout=self.timeout if timeout is None else timeout, **kwargs
+                )
+                if timing is not None:
+                    timing.status = resp.status_code
+                    timing.bytes = len(resp.content)
+        except httpx.TimeoutException:
+            raise err.NetworkError('Request timeout error')
+        except httpx.HTTPError as e:
+            raise err.NetworkError(f'{type(e).__name__}: {e}')
+
+        response = HttpResponse(
+            resp.status_code, url=str(resp.url), headers=resp.headers, cookies=dict(resp.cookies)
+        )
+        if resp.status_code == HTTPStatus.NOT_MODIFIED and cache_entry is not None:
+            response.status_code = HTTPStatus.OK
+            body = RawContent(cache_entry.body, cache_entry.encoding, unchanged=True)
+            if cache_entry.content_type:
+                headers = resp.headers.copy()
+                headers['Content-Type'] = cache_entry.content_type
+                response.headers = headers
+        else:
+            body = RawContent(resp.content, resp.charset_encoding)
+            if cache_key is not None and resp.status_code == HTTPStatus.OK:
+                self._store_in_cache(cache_key, url, resp.headers, body)
+        response.body = body
+
+        if decode is None and not raw:
+            decode = resolve_decode(response.content_type)
+        if raw:
+            raw_result: Any = body
+        elif decode == 'json':
+            raw_result = body.body
+        else:
+            raw_result = body.text()
+
+        try:
+            self.check_response(
+                method=method, 
+                status_code=response.status_code, 
+                content=raw_result, 
+                decode=decode, 
+                response=response
+            )
+        except err.APIError as e:
+            e.retry_after = parse_retry_after(resp.headers.get('Retry-After'))
+            raise
+
+        return cast(ResultType, response.result)
+
+    @contextmanager
+    def _measure(self, url: str, kwargs: Dict[str, Any]) -> Iterator[Optional[RequestTiming]]:
+        # Фазы снимаются через trace-расширение httpcore
+        if self._metrics is None:
+            yield None
+            return
+        with self._metrics.measure(url) as timing:
+            kwargs['extensions'] = {**kwargs.get('extensions', {}), 'trace': _trace_hook(timing)}
+            yield timing
+
+    def _store_in_cache(self, key: str, url: str, headers: Any, body: RawContent) -> None:
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        self._cache.put(key, CacheEntry(
+            url=url,
+            body=body.body,
+            etag=etag,
+            last_modified=last_modified,
+            content_type=headers.get('Content-Type'),
+            encoding=body.encoding,
+        ))
+
+    async def warm_up(self, connections: int) -> int:
+        """По HTTP/2 запросы к хосту идут через одно соединение - его и открываем."""
+        if connections <= 0:
+            return 0
+        httpx = _import_httpx()
+        try:
+            await self.create_client().head(self.api, timeout=self.timeout)
+        except httpx.HTTPError:
+            return 0
+        return 1
+
+    async def stream_content(
+            self,
+            url: str,
+            headers: Optional[Dict[str, Any]] = None,
+            timeout: int = 30,
+            chunk_size: int = 65536,
+            raise_for_status: bool = True
+    ) -> AsyncGenerator[bytes, None]:
+        # Поток идёт через те же автомат и лимит хоста, что и _send
+        host_breaker = self._breaker.host(url) if self._breaker is not None else None
+        host_limiter = self._limiter.host(url) if self._limiter is not None else None
+
+        if host_breaker is not None:
+            host_breaker.before_request()
+        try:
+            if host_limiter is not None:
+                await host_limiter.acquire()
+            async with aclosing(
+                self._stream(url, headers, timeout, chunk_size, raise_for_status)
+            ) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+        except GeneratorExit:
+            # Читатель бросил поток сам - хост ответил, это успех
+            pass
+        except BaseException as e:
+            if host_breaker is not None:
+                host_breaker.on_result(e)
+            if host_limiter is not None and isinstance(e, THROTTLE_ON):
+                host_limiter.on_throttle()
+            raise
+        if host_breaker is not None:
+            host_breaker.on_result()
+        if host_limiter is not None:
+            host_limiter.on_success()
+
+    async def _stream(
+            self,
+            url: str,
+            headers: Optional[Dict[str, Any]],
+            timeout: int,
+            chunk_size: int,
+            raise_for_status: bool
+    ) -> AsyncGenerator[bytes, None]:
+
+        httpx = _import_httpx()
+        try:
+            async with self.create_client().stream(
+                'GET', url, headers=headers or {}, timeout=timeout
+            ) as resp:
+                if raise_for_status and resp.status_code >= HTTPStatus.BAD_REQUEST:
+                    await resp.aread()
+                    self.check_response('GET', resp.status_code, resp.text, decode='text')
+                async for chunk in resp.aiter_bytes(chunk_size):
+                    yield chunk
+        except httpx.TimeoutException:
+            raise err.NetworkError('Request timeout error')
+        except httpx.HTTPError as e:
+            raise err.NetworkError(f'{type(e).__name__}: {e}')
+
+    async def __aenter__(self) -> HttpxSession:
+        return self
+
+
+def _trace_hook(timing: RequestTiming) -> Callable[[str, Dict[str, Any]], Awaitable[None]]:
+    async def trace(event_name: str, info: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+        if event_name == 'connection.connect_tcp.started':
+            timing._connect_at = now
+        elif event_name in ('connection.connect_tcp.complete', 'connection.start_tls.complete'):
+            # TCP и TLS вместе, как у aiohttp
+            timing.connect = now - timing._connect_at
+        elif event_name.endswith('receive_response_headers.complete'):
+            timing.headers_at = now
+    return trace
+
+
+_http2_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_http2_client(proxy: Optional[str] = None) -> httpx.AsyncClient:
+    """Общий для процесса HTTP/2 клиент (по одному на прокси)."""
+    key = proxy or ''
+    client = _http2_clients.get(key)
+    if client is None or client.is_closed:
+        from src.core.settings import get_settings
+
+        settings = get_settings().session
+        client = _http2_clients[key] = create_http2_client(
+            proxy=proxy,
+            max_connections=settings.http2_max_connections,
+            keepalive_timeout=settings.keepalive_timeout,
+        )
+    return client
+
+
+async def close_http2_clients() -> None:
+    """Закрывает общие HTTP/2 клиенты. Вызывается один раз в конце прогона."""
+    clients = list(_http2_clients.values())
+    _http2_clients.clear()
+    await asyncio.gather(*(client.aclose() for client in clients if not client.is_closed))
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Dict, Final, Optional, Tuple, Type
+
+from yarl import URL
+
+from src.session import errors as err
+
+
+DEFAULT_INITIAL_RATE: Final[float] = 5.0
+DEFAULT_MIN_RATE: Final[float] = 0.5
+DEFAULT_MAX_RATE: Final[float] = 20.0
+DEFAULT_INCREASE: Final[float] = 0.1
+DEFAULT_DECREASE: Final[float] = 0.5
+
+# Ответы "сбавьте темп": 429 и любой 5xx (check_response отдаёт их как
+# ServerError - та же классификация, что у автомата хоста)
+THROTTLE_ON: Final[Tuple[Type[BaseException], ...]] = (
+    err.TooManyRequestsError,
+    err.ServerError,
+)
+
+
+class HostRateLimiter:
+    """Token bucket для одного хоста со скоростью, подстраиваемой по AIMD.
+
+    Каждый успешный ответ прибавляет к скорости ``increase`` запросов/сек,
+    каждый 429 или 5xx умножает её на ``decrease``. Ведро вмещает запросы
+    не больше чем на одну секунду, поэтому после простоя нет лавины.
+    """
+
+    __slots__ = (
+        'rate', 'min_rate', 'max_rate', 'increase', 'decrease',
+        '_tokens', '_updated_at', '_lock',
+    )
+
+    def __init__(
+            self,
+            rate: float = DEFAULT_INITIAL_RATE,
+            min_rate: float = DEFAULT_MIN_RATE,
+            max_rate: float = DEFAULT_MAX_RATE,
+            increase: float = DEFAULT_INCREASE,
+            decrease: float = DEFAULT_DECREASE,
+    ) -> None:
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._tokens = 1.0
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        capacity = max(self.rate, 1.0)
+        self._tokens = min(capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        # Лок держится и во время ожидания - запросы выходят строго по очереди
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self) -> None:
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self._tokens = min(self._tokens, 0.0)
+
+
+class RateLimiter:
+    """Реестр ``HostRateLimiter`` по хостам."""
+
+    __slots__ = ('initial_rate', 'min_rate', 'max_rate', '_hosts',)
+
+    def __init__(
+            self,
+            initial_rate: float = DEFAULT_INITIAL_RATE,
+            min_rate: float = DEFAULT_MIN_RATE,
+            max_rate: float = DEFAULT_MAX_RATE,
+    ) -> None:
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._hosts: Dict[str, HostRateLimiter] = {}
+
+    def host(self, url: str) -> HostRateLimiter:
+        host = URL(url).host or ''
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            limiter = self._hosts[host] = HostRateLimiter(
+                rate=self.initial_rate,
+                min_rate=self.min_rate,
+                max_rate=self.max_rate,
+            )
+        return limiter
+
+    def rates(self) -> Dict[str, float]:
+        return {host: limiter.rate for host, limiter in self._hosts.items()}
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Общий для процесса ограничитель, настроенный из .env."""
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        from src.core.settings import get_settings
+
+        settings = get_settings().session
+        _rate_limiter = RateLimiter(
+            initial_rate=settings.rate_initial,
+            min_rate=settings.rate_min,
+            max_rate=settings.rate_max,
+        )
+    return _rate_limiter
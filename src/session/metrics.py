@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Dict, Final, Iterator, List, Optional, Tuple
+
+from aiohttp import (
+    ClientSession,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionCreateStartParams,
+    TraceDnsResolveHostEndParams,
+    TraceDnsResolveHostStartParams,
+    TraceRequestEndParams,
+    TraceResponseChunkReceivedParams,
+)
+from yarl import URL
+
+
+# Верхние границы корзин гистограммы, мс
+BUCKETS_MS: Final[Tuple[float, ...]] = (
+    1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, float('inf'),
+)
+PHASES: Final[Tuple[str, ...]] = ('dns', 'connect', 'ttfb', 'body', 'total',)
+
+
+class LatencyHistogram:
+
+    __slots__ = ('counts', 'count', 'total',)
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(BUCKETS_MS)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, ms: float) -> None:
+        self.counts[bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+
+    def quantile(self, q: float) -> float:
+        """Верхняя граница корзины, в которую попадает квантиль ``q``."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return BUCKETS_MS[-1]
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class RequestTiming:
+    """Отметки времени одного запроса; заполняются хуками ``TraceConfig``."""
+
+    __slots__ = (
+        'host', 'started_at', 'dns', 'connect', 'headers_at',
+        'bytes', 'status', 'error', '_dns_at', '_connect_at',
+    )
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.started_at = time.perf_counter()
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.headers_at: Optional[float] = None
+        self.bytes = 0
+        self.status: Optional[int] = None
+        self.error: Optional[str] = None
+        self._dns_at = 0.0
+        self._connect_at = 0.0
+
+
+class HostMetrics:
+
+    __slots__ = ('phases', 'cold', 'warm', 'statuses', 'errors', 'bytes', 'warmed_up', 'warm_up_ms',)
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in PHASES}
+        # Полное время запросов, которым пришлось открыть соединение, и остальных
+        self.cold = LatencyHistogram()
+        self.warm = LatencyHistogram()
+        self.statuses: Counter[int] = Counter()
+        self.errors: Counter[str] = Counter()
+        self.bytes = 0
+        self.warmed_up = 0
+        self.warm_up_ms = 0.0
+
+    def format(self, host: str) -> str:
+        total = self.phases['total']
+        lines = [
+            f'{host}: запросов {total.count}, ошибок {sum(self.errors.values())}, '
+            f'{self.bytes / 1024 / 1024:.1f} MB, статусы {dict(self.statuses)}'
+        ]
+        for phase in PHASES:
+            histogram = self.phases[phase]
+            if histogram.count:
+                lines.append(
+                    f'    {phase:<8} n={histogram.count:<6} среднее {histogram.mean:7.1f} мс  '
+                    f'p50 ≤{histogram.quantile(0.5):g}  p95 ≤{histogram.quantile(0.95):g}  '
+                    f'p99 ≤{histogram.quantile(0.99):g}'
+                )
+        if self.cold.count or self.warmed_up:
+            lines.append(
+                f'    холодный старт: новых соединений {self.cold.count}, '
+                f'среднее {self.cold.mean:.1f} мс против {self.warm.mean:.1f} мс на готовом; '
+                f'прогрето {self.warmed_up} за {self.warm_up_ms:.1f} мс'
+            )
+        buckets = '  '.join(
+            f'≤{bound:g}:{count}' for bound, count in zip(BUCKETS_MS, total.counts) if count
+        )
+        lines.append(f'    total мс {buckets}')
+        if self.errors:
+            lines.append(f'    ошибки {dict(self.errors)}')
+        return '\n'.join(lines)
+
+
+class RequestMetrics:
+    """Гистограммы задержек по хостам: DNS, соединение (TCP+TLS), время до
+    первого байта, чтение тела и полное время запроса.
+
+    Для aiohttp фазы снимаются хуками ``trace_config()``; сессия передаёт
+    ``RequestTiming`` в запрос через ``trace_request_ctx`` и закрывает замер
+    через ``measure``. Отдельного сигнала на TLS у aiohttp нет, поэтому
+    рукопожатие входит в ``connect``.
+    """
+
+    __slots__ = ('_hosts',)
+
+    def __init__(self) -> None:
+        self._hosts: Dict[str, HostMetrics] = {}
+
+    def host(self, host: str) -> HostMetrics:
+        metrics = self._hosts.get(host)
+        if metrics is None:
+            metrics = self._hosts[host] = HostMetrics()
+        return metrics
+
+    @contextmanager
+    def measure(self, url: str) -> Iterator[RequestTiming]:
+        timing = RequestTiming(URL(url).host or '')
+        try:
+            yield timing
+        except BaseException as e:
+            timing.error = type(e).__name__
+            raise
+        finally:
+            self.observe(timing)
+
+    def observe(self, timing: RequestTiming) -> None:
+        now = time.perf_counter()
+        metrics = self.host(timing.host)
+        phases = metrics.phases
+        if timing.dns is not None:
+            phases['dns'].add(timing.dns * 1000)
+        if timing.connect is not None:
+            phases['connect'].add(timing.connect * 1000)
+        if timing.headers_at is not None:
+            phases['ttfb'].add((timing.headers_at - timing.started_at) * 1000)
+            if timing.error is None:
+                phases['body'].add((now - timing.headers_at) * 1000)
+        phases['total'].add((now - timing.started_at) * 1000)
+        (metrics.cold if timing.connect is not None else metrics.warm).add((now - timing.started_at) * 1000)
+        if timing.status is not None:
+            metrics.statuses[timing.status] += 1
+        if timing.error is not None:
+            metrics.errors[timing.error] += 1
+        metrics.bytes += timing.bytes
+
+    def observe_warm_up(self, url: str, connections: int, seconds: float) -> None:
+        metrics = self.host(URL(url).host or '')
+        metrics.warmed_up += connections
+        metrics.warm_up_ms += seconds * 1000
+
+    def trace_config(self) -> TraceConfig:
+        trace_config = TraceConfig()
+        trace_config.on_dns_resolvehost_start.append(_on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(_on_dns_end)
+        trace_config.on_connection_create_start.append(_on_connect_start)
+        trace_config.on_connection_create_end.append(_on_connect_end)
+        trace_config.on_request_end.append(_on_request_end)
+        trace_config.on_response_chunk_received.append(_on_chunk)
+        return trace_config
+
+    def report(self, clear: bool = False) -> str:
+        lines: List[str] = ['Задержки запросов по хостам:']
+        for host, metrics in sorted(self._hosts.items()):
+            lines.append(metrics.format(host))
+        if clear:
+            self._hosts.clear()
+        return '\n'.join(lines)
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+
+def _timing(ctx: SimpleNamespace) -> Optional[RequestTiming]:
+    timing = ctx.trace_request_ctx
+    return timing if isinstance(timing, RequestTiming) else None
+
+
+async def _on_dns_start(session: ClientSession, ctx: SimpleNamespace, params: TraceDnsResolveHostStartParams) -> None:
+    if (timing := _timing(ctx)) is not None:
+        timing._dns_at = time.perf_counter()
+
+
+async def _on_dns_end(session: ClientSession, ctx: SimpleNamespace, params: TraceDnsResolveHostEndParams) -> None:
+    if (timing := _timing(ctx)) is not None:
+        timing.dns = time.perf_counter() - timing._dns_at
+
+
+async def _on_connect_start(session: ClientSession, ctx: SimpleNamespace, params: TraceConnectionCreateStartParams) -> None:
+    if (timing := _timing(ctx)) is not None:
+        timing._connect_at = time.perf_counter()
+
+
+async def _on_connect_end(session: ClientSession, ctx: SimpleNamespace, params: TraceConnectionCreateEndParams) -> None:
+    if (timing := _timing(ctx)) is not None:
+        timing.connect = time.perf_counter() - timing._connect_at
+
+
+async def _on_request_end(session: ClientSession, ctx: SimpleNamespace, params: TraceRequestEndParams) -> None:
+    if (timing := _timing(ctx)) is not None:
+        timing.headers_at = time.perf_counter()
+        timing.status = params.response.status
+
+
+async def _on_chunk(session: ClientSession, ctx: SimpleNamespace, params: TraceResponseChunkReceivedParams) -> None:
+    if (timing := _timing(ctx)) is not None:
+        timing.bytes += len(params.chunk)
+
+
+_request_metrics: Optional[RequestMetrics] = None
+_request_metrics_loaded = False
+
+
+def get_request_metrics() -> Optional[RequestMetrics]:
+    """Общие для процесса метрики или ``None``, если SESSION_METRICS=false."""
+    global _request_metrics, _request_metrics_loaded
+
+    if not _request_metrics_loaded:
+        from src.core.settings import get_settings
+
+        if get_settings().session.metrics:
+            _request_metrics = RequestMetrics()
+        _request_metrics_loaded = True
+    return _request_metrics
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import ssl
+import time
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Final,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeAlias,
+)
+
+import certifi
+from aiohttp import ClientSession, TCPConnector, TraceConfig
+from yarl import URL
+
+
+DEFAULT_LIMIT_PER_HOST: Final[int] = 10
+DEFAULT_KEEPALIVE_TIMEOUT: Final[float] = 30.0
+DEFAULT_IDLE_TIMEOUT: Final[float] = 120.0
+DEFAULT_DNS_TTL: Final[int] = 300
+
+_PoolKey: TypeAlias = Tuple[str, str, int, str]
+
+
+class _PoolEntry:
+
+    __slots__ = ('session', 'last_used', 'active',)
+
+    def __init__(self, session: ClientSession) -> None:
+        self.session = session
+        self.last_used = time.monotonic()
+        self.active = 0
+
+
+class SessionPool:
+    """Реестр keep-alive сессий, по одной на хост (и прокси).
+
+    Все клиенты сайтов берут сессию отсюда вместо того, чтобы открывать
+    новую на каждый запрос, поэтому TCP/TLS рукопожатие делается один раз
+    на соединение. Сессии, простаивающие дольше ``idle_timeout``, закрываются
+    при следующем обращении к пулу. Адреса хостов кэшируются на ``dns_ttl``
+    секунд, чтобы тысячи запросов к одному сайту не ходили в DNS.
+    """
+
+    __slots__ = (
+        'limit_per_host', 'keepalive_timeout', 'idle_timeout', 'dns_ttl', 'trace_configs',
+        '_entries', '_lock',
+    )
+
+    def __init__(
+            self,
+            limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+            keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+            idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+            dns_ttl: int = DEFAULT_DNS_TTL,
+            trace_configs: Optional[List[TraceConfig]] = None,
+    ) -> None:
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.idle_timeout = idle_timeout
+        self.dns_ttl = dns_ttl
+        self.trace_configs = trace_configs
+        self._entries: Dict[_PoolKey, _PoolEntry] = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _make_key(url: str, proxy: Any = None) -> _PoolKey:
+        parsed = URL(url)
+        return (
+            parsed.scheme,
+            parsed.host or '',
+            parsed.port or 0,
+            '' if proxy is None else repr(proxy),
+        )
+
+    @asynccontextmanager
+    async def session(
+            self,
+            url: str,
+            connector_type: Type[TCPConnector] = TCPConnector,
+            connector_init: Optional[Dict[str, Any]] = None,
+            proxy: Any = None,
+    ) -> AsyncIterator[ClientSession]:
+        key = self._make_key(url, proxy)
+        entry = await self._acquire(key, connector_type, connector_init or {})
+        try:
+            yield entry.session
+        finally:
+            entry.active -= 1
+            entry.last_used = time.monotonic()
+
+    async def _acquire(
+            self,
+            key: _PoolKey,
+            connector_type: Type[TCPConnector],
+            connector_init: Dict[str, Any],
+    ) -> _PoolEntry:
+        async with self._lock:
+            await self._evict_idle()
+            entry = self._entries.get(key)
+            if entry is None or entry.session.closed:
+                connector = connector_type(
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_ttl,
+                    **connector_init
+                )
+                entry = _PoolEntry(ClientSession(connector=connector, trace_configs=self.trace_configs))
+                self._entries[key] = entry
+            entry.active += 1
+            return entry
+
+    async def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for key, entry in list(self._entries.items()):
+            if entry.active or now - entry.last_used < self.idle_timeout:
+                continue
+            del self._entries[key]
+            if not entry.session.closed:
+                await entry.session.close()
+
+    async def close(self) -> None:
+        async with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            if not entry.session.closed:
+                await entry.session.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def get_ssl_context() -> ssl.SSLContext:
+    """Общий SSL-контекст с корневыми сертификатами certifi (файл читается один раз)."""
+    global _ssl_context
+
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context(cafile=certifi.where())
+    return _ssl_context
+
+
+_session_pool: Optional[SessionPool] = None
+
+
+def get_session_pool() -> SessionPool:
+    """Возвращает общий для процесса пул, создавая его по настройкам из .env."""
+    global _session_pool
+
+    if _session_pool is None:
+        from src.core.settings import get_settings
+        from src.session.metrics import get_request_metrics
+
+        settings = get_settings().session
+        metrics = get_request_metrics()
+        _session_pool = SessionPool(
+            limit_per_host=settings.limit_per_host,
+            keepalive_timeout=settings.keepalive_timeout,
+            idle_timeout=settings.idle_timeout,
+            dns_ttl=settings.dns_ttl,
+            trace_configs=[metrics.trace_config()] if metrics is not None else None,
+        )
+    return _session_pool
+
+
+async def close_session_pool() -> None:
+    """Закрывает все сессии общего пула. Вызывается один раз в конце прогона."""
+    global _session_pool
+
+    if _session_pool is not None:
+        pool, _session_pool = _session_pool, None
+        await pool.close()
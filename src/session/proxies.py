@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import (
+    AsyncIterator,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from src.session import errors as err
+
+
+DEFAULT_MAX_PER_PROXY: Final[int] = 4
+DEFAULT_MAX_ERROR_RATE: Final[float] = 0.5
+DEFAULT_MIN_REQUESTS: Final[int] = 10
+DEFAULT_LATENCY_ALPHA: Final[float] = 0.2
+
+# Ошибки, за которые отвечает прокси, а не сайт: обрыв соединения и бан по IP
+PROXY_FAILURES: Final[Tuple[Type[BaseException], ...]] = (
+    err.NetworkError,
+    err.ForbiddenError,
+    err.TooManyRequestsError,
+)
+
+
+class ProxyState:
+
+    __slots__ = ('proxy', 'active', 'requests', 'failures', 'latency', 'evicted',)
+
+    def __init__(self, proxy: str) -> None:
+        self.proxy = proxy
+        self.active = 0
+        self.requests = 0
+        self.failures = 0
+        self.latency = 0.0  # EWMA, сек.
+        self.evicted = False
+
+    @property
+    def error_rate(self) -> float:
+        return self.failures / self.requests if self.requests else 0.0
+
+    def score(self) -> float:
+        # Меньше - лучше: ожидаемое время ответа с учётом очереди и доли ошибок.
+        # Новые прокси с нулевой задержкой пробуются первыми
+        return self.latency * (1 + self.active) / max(0.05, 1.0 - self.error_rate)
+
+
+class ProxyPool:
+    """Раздаёт прокси из файла на отдельные запросы.
+
+    На каждый прокси одновременно приходится не больше ``max_per_proxy``
+    запросов, свободный выбирается по наименьшей оценке (EWMA задержки,
+    занятость, доля ошибок). Прокси, у которых после ``min_requests``
+    запросов доля ошибок достигла ``max_error_rate``, исключаются до конца
+    процесса. Если исключены все, запросы идут напрямую.
+    """
+
+    __slots__ = ('max_per_proxy', 'max_error_rate', 'min_requests', 'alpha', '_states', '_released',)
+
+    def __init__(
+            self,
+            proxies: Iterable[str],
+            max_per_proxy: int = DEFAULT_MAX_PER_PROXY,
+            max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+            min_requests: int = DEFAULT_MIN_REQUESTS,
+            alpha: float = DEFAULT_LATENCY_ALPHA,
+    ) -> None:
+        self.max_per_proxy = max_per_proxy
+        self.max_error_rate = max_error_rate
+        self.min_requests = min_requests
+        self.alpha = alpha
+        self._states: Dict[str, ProxyState] = {
+            proxy: ProxyState(proxy) for proxy in dict.fromkeys(proxies)
+        }
+        self._released = asyncio.Event()
+
+    def _pick(self) -> Optional[ProxyState]:
+        free = [
+            state for state in self._states.values()
+            if not state.evicted and state.active < self.max_per_proxy
+        ]
+        return min(free, key=ProxyState.score) if free else None
+
+    async def acquire(self) -> Optional[ProxyState]:
+        """Свободный прокси; ждёт, пока освободится. ``None`` - живых прокси нет."""
+        while True:
+            if not self.alive:
+                return None
+            state = self._pick()
+            if state is not None:
+                state.active += 1
+                return state
+            self._released.clear()
+            await self._released.wait()
+
+    def release(self, state: ProxyState, latency: float, error: Optional[BaseException] = None) -> None:
+        state.active -= 1
+        self._released.set()
+        if isinstance(error, asyncio.CancelledError):
+            return
+        state.requests += 1
+        if isinstance(error, PROXY_FAILURES):
+            state.failures += 1
+        else:
+            state.latency = (
+                latency if state.latency == 0.0
+                else self.alpha * latency + (1 - self.alpha) * state.latency
+            )
+        if state.requests >= self.min_requests and state.error_rate >= self.max_error_rate:
+            state.evicted = True
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Optional[str]]:
+        """Прокси на один запрос; время и исход запроса идут в его оценку."""
+        state = await self.acquire()
+        if state is None:
+            yield None
+            return
+        started = time.monotonic()
+        try:
+            yield state.proxy
+        except BaseException as e:
+            self.release(state, time.monotonic() - started, e)
+            raise
+        self.release(state, time.monotonic() - started)
+
+    @property
+    def alive(self) -> int:
+        return sum(not state.evicted for state in self._states.values())
+
+    def evicted(self) -> List[str]:
+        return [state.proxy for state in self._states.values() if state.evicted]
+
+    def stats(self) -> Dict[str, Tuple[int, float, float]]:
+        """proxy -> (запросов, доля ошибок, задержка EWMA)."""
+        return {
+            state.proxy: (state.requests, state.error_rate, state.latency)
+            for state in self._states.values()
+        }
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+_proxy_pool: Optional[ProxyPool] = None
+_proxy_pool_loaded = False
+
+
+def get_proxy_pool() -> Optional[ProxyPool]:
+    """Общий для процесса пул прокси или ``None``, если SESSION_PROXY_FILE не задан."""
+    global _proxy_pool, _proxy_pool_loaded
+
+    if not _proxy_pool_loaded:
+        from src.core.settings import get_settings, path
+        from src.utils.helper import get_proxies
+
+        settings = get_settings().session
+        if settings.proxy_file:
+            proxies = get_proxies(path(settings.proxy_file))
+            if proxies:
+                _proxy_pool = ProxyPool(
+                    proxies,
+                    max_per_proxy=settings.proxy_max_per_proxy,
+                    max_error_rate=settings.proxy_max_error_rate,
+                    min_requests=settings.proxy_min_requests,
+                )
+        _proxy_pool_loaded = True
+    return _proxy_pool
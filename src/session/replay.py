@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import zlib
+from typing import Any, Dict, Final, Literal, Mapping, Optional, TypeAlias, cast
+
+from multidict import CIMultiDict
+from yarl import URL
+
+from src.session.response import HttpResponse, RawContent
+from src.session import errors as err
+
+
+_Mode: TypeAlias = Literal['record', 'replay']
+
+_INDEX: Final[str] = 'index.jsonl'
+_BLOBS: Final[str] = 'blobs'
+
+
+class ArchivedResponse:
+
+    __slots__ = ('status', 'content_type', 'encoding', 'retry_after', 'blob',)
+
+    def __init__(
+            self,
+            status: int,
+            blob: str,
+            content_type: Optional[str] = None,
+            encoding: Optional[str] = None,
+            retry_after: Optional[str] = None,
+    ) -> None:
+        self.status = status
+        self.blob = blob
+        self.content_type = content_type
+        self.encoding = encoding
+        self.retry_after = retry_after
+
+
+class ReplayArchive:
+    """Архив запросов и ответов для прогонов без сети.
+
+    В режиме ``record`` каждый ответ сохраняется в ``directory``: строка
+    в ``index.jsonl`` (ключ запроса -> статус, заголовки, хэш тела) и тело
+    в ``blobs/`` под своим SHA-256, сжатое zlib. Одинаковые тела хранятся
+    один раз. В режиме ``replay`` ответы отдаются из архива через
+    ``latency`` ± ``jitter`` секунд. Задержка для каждого ключа
+    детерминирована, поэтому тайминги повторяются от прогона к прогону.
+    """
+
+    __slots__ = ('directory', 'mode', 'latency', 'jitter', '_index', '_index_file', 'hits', 'misses',)
+
+    def __init__(
+            self,
+            directory: str,
+            mode: _Mode = 'replay',
+            latency: float = 0.0,
+            jitter: float = 0.0,
+    ) -> None:
+        self.directory = directory
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self._index: Dict[str, ArchivedResponse] = {}
+        self._index_file: Any = None
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.join(directory, _BLOBS), exist_ok=True)
+        self._load_index()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    @staticmethod
+    def make_key(method: str, url: str, kwargs: Mapping[str, Any]) -> str:
+        full_url = URL(url)
+        if kwargs.get('params'):
+            full_url = full_url.update_query(kwargs['params'])
+        key = f'{method.upper()} {full_url}'
+        data = kwargs.get('data', kwargs.get('json'))
+        if data is not None:
+            # У aiohttp.FormData нет осмысленного repr - берём его поля
+            data = getattr(data, '_fields', data)
+            key += ' ' + hashlib.sha256(repr(data).encode()).hexdigest()
+        return key
+
+    def _blob_path(self, blob: str) -> str:
+        return os.path.join(self.directory, _BLOBS, blob[:2], blob)
+
+    def _load_index(self) -> None:
+        path = os.path.join(self.directory, _INDEX)
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                key = record.pop('key')
+                # При повторных запросах остаётся последний ответ
+                self._index[key] = ArchivedResponse(**record)
+
+    def record(self, key: str, response: HttpResponse) -> None:
+        body = cast(RawContent, response.body)
+        blob = hashlib.sha256(body.body).hexdigest()
+        path = self._blob_path(blob)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as file:
+                file.write(zlib.compress(body.body))
+            os.replace(tmp_path, path)
+
+        entry = ArchivedResponse(
+            status=response.status_code,
+            blob=blob,
+            content_type=response.headers.get('Content-Type'),
+            encoding=body.encoding,
+            retry_after=response.headers.get('Retry-After'),
+        )
+        self._index[key] = entry
+        if self._index_file is None:
+            self._index_file = open(os.path.join(self.directory, _INDEX), 'a', encoding='utf-8')
+        self._index_file.write(json.dumps({'key': key, **{
+            name: getattr(entry, name) for name in ArchivedResponse.__slots__
+        }}, ensure_ascii=False) + '\n')
+        self._index_file.flush()
+
+    def delay(self, key: str) -> float:
+        if not self.jitter:
+            return self.latency
+        # Псевдослучайный, но постоянный для ключа разброс
+        spread = zlib.crc32(key.encode()) / 0xFFFFFFFF * 2 - 1
+        return max(0.0, self.latency + spread * self.jitter)
+
+    async def replay(self, key: str) -> HttpResponse:
+        """Ответ на запрос ``key`` из архива."""
+        entry = self._index.get(key)
+        if entry is None:
+            self.misses += 1
+            raise err.NotFoundError(
+                status_code=404, content=key, message='Request is missing in the replay archive'
+            )
+        self.hits += 1
+        delay = self.delay(key)
+        if delay:
+            await asyncio.sleep(delay)
+        with open(self._blob_path(entry.blob), 'rb') as file:
+            body = zlib.decompress(file.read())
+        headers: CIMultiDict[str] = CIMultiDict()
+        if entry.content_type:
+            headers['Content-Type'] = entry.content_type
+        if entry.retry_after:
+            headers['Retry-After'] = entry.retry_after
+        return HttpResponse(entry.status, RawContent(body, entry.encoding), headers=headers)
+
+    def close(self) -> None:
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+_replay_archive: Optional[ReplayArchive] = None
+_replay_archive_loaded = False
+
+
+def get_replay_archive() -> Optional[ReplayArchive]:
+    """Общий для процесса архив или ``None``, если SESSION_REPLAY_MODE не задан."""
+    global _replay_archive, _replay_archive_loaded
+
+    if not _replay_archive_loaded:
+        from src.core.settings import get_settings, path
+
+        settings = get_settings().session
+        if settings.replay_mode:
+            _replay_archive = ReplayArchive(
+                directory=path(settings.replay_dir),
+                mode=settings.replay_mode,
+                latency=settings.replay_latency,
+                jitter=settings.replay_jitter,
+            )
+        _replay_archive_loaded = True
+    return _replay_archive
@@ -5,6 +5,7 @@ from typing import (
     Any, 
     TypeVar, 
     Generic,
+    Mapping,
     Optional,
     Union,
     Dict,
@@ -19,4 +20,79 @@ class Response(BaseModel, Generic[ResultType]):
     result: Optional[ResultType] = None
     headers: Optional[Dict[str, Any]] = None
     cookies: Optional[Dict[str, Any]] = None
-    
\ No newline at end of file
+    
+
+
+class RawContent:
+    """Тело ответа без декодирования плюс кодировка, объявленная сервером.
+
+    Парсеры (lxml, BeautifulSoup) принимают байты напрямую и сами учитывают
+    кодировку, поэтому строку из тела страницы строить не нужно.
+    ``unchanged`` выставляется, когда сервер ответил 304 и тело взято из кэша.
+    """
+
+    __slots__ = ('body', 'encoding', 'unchanged',)
+
+    def __init__(
+            self, 
+            body: bytes, 
+            encoding: Optional[str] = None, 
+            unchanged: bool = False
+    ) -> None:
+        self.body = body
+        self.encoding = encoding
+        self.unchanged = unchanged
+
+    def text(self) -> str:
+        return self.body.decode(self.encoding or 'utf-8', errors='replace')
+
+    def __bool__(self) -> bool:
+        return bool(self.body)
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self.body)} bytes, encoding={self.encoding!r})"
+
+
+class HttpResponse:
+    """Ответ на горячем пути: статус, заголовки, итоговый URL и тело без валидации.
+
+    ``result`` заполняет ``check_response`` (JSON, текст или ``RawContent``).
+    Pydantic-модель ``Response`` строится только по требованию через
+    ``to_model()`` - для отладки.
+    """
+
+    __slots__ = ('status_code', 'body', 'url', 'headers', 'cookies', 'result',)
+
+    def __init__(
+            self,
+            status_code: int,
+            body: Optional[RawContent] = None,
+            url: Optional[str] = None,
+            headers: Optional[Mapping[str, str]] = None,
+            cookies: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.status_code = status_code
+        self.body = body
+        self.url = url
+        self.headers: Mapping[str, str] = headers if headers is not None else {}
+        self.cookies = cookies
+        self.result: Any = None
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return self.headers.get('Content-Type')
+
+    def to_model(self) -> Response[Any]:
+        return Response(
+            status_code=self.status_code,
+            url=self.url,
+            result=self.result,
+            headers=dict(self.headers),
+            cookies=self.cookies,
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.status_code}, url={self.url!r}, body={self.body!r})"
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Final,
+    Optional,
+    Tuple,
+    Type,
+    TypeAlias,
+    TypeVar,
+)
+
+from aiohttp import ClientConnectorError
+
+from src.session import errors as err
+
+
+T = TypeVar('T')
+
+_ErrorTypes: TypeAlias = Tuple[Type[BaseException], ...]
+_OnRetry: TypeAlias = Callable[[int, BaseException, float], Any]
+
+# Ошибки, после которых имеет смысл повторить запрос
+RETRY_ON: Final[_ErrorTypes] = (
+    err.NetworkError,
+    err.TooManyRequestsError,
+    err.ServerError,
+    err.ForbiddenError,
+    err.APIError,
+    ClientConnectorError,
+    asyncio.TimeoutError,
+)
+# Ответы, которые при повторе не изменятся
+GIVE_UP_ON: Final[_ErrorTypes] = (
+    err.NotFoundError,
+    err.BadRequestError,
+    err.UnauthorizedError,
+    err.ConflictError,
+    err.EntityTooLarge,
+)
+
+# Всё, что может прилететь из запроса к сайту
+REQUEST_ERRORS: Final[_ErrorTypes] = RETRY_ON + GIVE_UP_ON
+
+DEFAULT_ATTEMPTS: Final[int] = 3
+DEFAULT_BASE_DELAY: Final[float] = 2.0
+DEFAULT_MAX_DELAY: Final[float] = 30.0
+DEFAULT_MAX_RETRY_AFTER: Final[float] = 120.0
+DEFAULT_MAX_CIRCUIT_WAIT: Final[float] = 600.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Значение заголовка Retry-After в секундах (число или HTTP-дата)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """Общий на прогон запас повторов.
+
+    Когда сайт лежит, каждая из тысяч задач иначе честно отработала бы все
+    свои попытки. После исчерпания бюджета ошибки отдаются сразу.
+    """
+
+    __slots__ = ('limit', 'spent',)
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.spent = 0
+
+    def try_spend(self) -> bool:
+        if self.spent >= self.limit:
+            return False
+        self.spent += 1
+        return True
+
+    @property
+    def exhausted(self) -> bool:
+        return self.spent >= self.limit
+
+
+class RetryPolicy:
+    """Повтор операции с экспоненциальной задержкой, джиттером и учётом Retry-After.
+
+    ``CircuitOpenError`` - не ошибка запроса, а отказ автомата хоста: задача
+    ждёт конца его паузы (не дольше ``max_delay`` за раз) и пробует снова, не
+    тратя ни попыток, ни бюджета повторов. Суммарно так ждут не больше
+    ``max_circuit_wait`` секунд, потом ошибка отдаётся вызывающему.
+    """
+
+    __slots__ = (
+        'attempts', 'base_delay', 'max_delay', 'max_retry_after', 'max_circuit_wait',
+        'retry_on', 'give_up_on', 'budget',
+    )
+
+    def __init__(
+            self,
+            attempts: int = DEFAULT_ATTEMPTS,
+            base_delay: float = DEFAULT_BASE_DELAY,
+            max_delay: float = DEFAULT_MAX_DELAY,
+            max_retry_after: float = DEFAULT_MAX_RETRY_AFTER,
+            max_circuit_wait: float = DEFAULT_MAX_CIRCUIT_WAIT,
+            retry_on: _ErrorTypes = RETRY_ON,
+            give_up_on: _ErrorTypes = GIVE_UP_ON,
+            budget: Optional[RetryBudget] = None,
+    ) -> None:
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.max_circuit_wait = max_circuit_wait
+        self.retry_on = retry_on
+        self.give_up_on = give_up_on
+        self.budget = budget
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> RetryPolicy:
+        """Политика с отдельным бюджетом на прогон из ``SessionSettings``."""
+        return cls(
+            attempts=settings.retry_attempts,
+            base_delay=settings.retry_base_delay,
+            max_delay=settings.retry_max_delay,
+            max_circuit_wait=settings.retry_max_circuit_wait,
+            budget=RetryBudget(settings.retry_budget),
+        )
+
+    def should_retry(self, error: BaseException) -> bool:
+        if isinstance(error, self.give_up_on):
+            return False
+        return isinstance(error, self.retry_on)
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        # "Equal jitter": половина задержки фиксирована, половина случайна
+        backoff = min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay = backoff / 2 + random.uniform(0, backoff / 2)
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after))
+        return delay
+
+    async def run(
+            self,
+            operation: Callable[[], Awaitable[T]],
+            on_retry: Optional[_OnRetry] = None,
+    ) -> T:
+        """Выполняет ``operation`` до ``attempts`` раз.
+
+        ``operation`` вызывается заново на каждую попытку, поэтому клиент
+        и семафор стоит брать внутри неё - на время паузы слот освобождается.
+        Последняя ошибка пробрасывается вызывающему.
+        """
+        attempt = 0
+        circuit_wait = 0.0
+        while True:
+            try:
+                return await operation()
+            except err.CircuitOpenError as error:
+                delay = min(error.retry_after, self.max_delay)
+                if circuit_wait + delay > self.max_circuit_wait:
+                    raise
+                circuit_wait += delay
+                if on_retry is not None:
+                    on_retry(attempt, error, delay)
+                await asyncio.sleep(delay)
+            except Exception as error:
+                attempt += 1
+                if (
+                    attempt >= self.attempts
+                    or not self.should_retry(error)
+                    or (self.budget is not None and not self.budget.try_spend())
+                ):
+                    raise
+                delay = self.delay(attempt - 1, error)
+                if on_retry is not None:
+                    on_retry(attempt, error, delay)
+                await asyncio.sleep(delay)
+
+
+def log_retry(logger: Any, label: str) -> _OnRetry:
+    """Колбэк ``on_retry``, пишущий каждую повторную попытку в лог."""
+    def on_retry(attempt: int, error: BaseException, delay: float) -> None:
+        logger.warning(
+            f'{label} ({attempt}) Повтор через {delay:.1f} сек. Ошибка: {type(error).__name__}'
+        )
+    return on_retry
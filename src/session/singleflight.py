@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+
+T = TypeVar('T')
+
+# Аргументы запроса, с которыми GET ещё можно склеивать
+_KEY_ARGS = frozenset(('params', 'headers', 'cookies'))
+
+# Заголовки, которые клиенты меняют перед каждым запросом (случайный
+# User-Agent): на ответ они не влияют, а в ключе не дали бы ничего склеить
+_VOLATILE_HEADERS = frozenset(('user-agent',))
+
+
+def _freeze(value: Any, skip: frozenset = frozenset()) -> Any:
+    if isinstance(value, Mapping):
+        return tuple(sorted(
+            (str(k), repr(v)) for k, v in value.items() if str(k).lower() not in skip
+        ))
+    return repr(value)
+
+
+def request_key(method: str, url: str, kwargs: Mapping[str, Any], *extra: Any) -> Optional[Tuple[Any, ...]]:
+    """Ключ для склейки запроса или ``None``, если запрос склеивать нельзя."""
+    if method.upper() != 'GET' or not kwargs.keys() <= _KEY_ARGS:
+        return None
+    return (
+        url,
+        _freeze(kwargs.get('params')),
+        _freeze(kwargs.get('headers'), _VOLATILE_HEADERS),
+        _freeze(kwargs.get('cookies')),
+        *extra,
+    )
+
+
+class SingleFlight:
+    """Склеивает одинаковые запросы, которые выполняются одновременно.
+
+    Первый вызов с ключом запускает операцию отдельной задачей, остальные
+    вызовы с тем же ключом до её завершения ждут ту же задачу и получают
+    тот же результат (или ту же ошибку). Задача обёрнута в ``shield``:
+    отмена одного из ожидающих не отменяет запрос для остальных.
+    """
+
+    __slots__ = ('_calls', 'requests', 'saved',)
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Task[Any]] = {}
+        self.requests = 0
+        self.saved = 0
+
+    async def do(self, key: Hashable, operation: Callable[[], Awaitable[T]]) -> T:
+        self.requests += 1
+        task = self._calls.get(key)
+        if task is not None:
+            self.saved += 1
+        else:
+            task = asyncio.ensure_future(operation())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
+
+    def reset_stats(self) -> None:
+        self.requests = 0
+        self.saved = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_loaded = False
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """Общий для процесса ``SingleFlight`` или ``None``, если SESSION_SINGLE_FLIGHT=false."""
+    global _single_flight, _single_flight_loaded
+
+    if not _single_flight_loaded:
+        from src.core.settings import get_settings
+
+        if get_settings().session.single_flight:
+            _single_flight = SingleFlight()
+        _single_flight_loaded = True
+    return _single_flight
@@ -5,20 +5,21 @@ import pandas as pd
 import time
 import random
 import gspread.exceptions
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 from datetime import datetime, timedelta
 
 from oauth2client.service_account import ServiceAccountCredentials
 from gspread_dataframe import set_with_dataframe, get_as_dataframe
 
-from src.utils.logger import Logger
+from src.utils.logger import Logger, get_logger
+from src.utils.price import format_minor, parse_price_column
 
 
 class GoogleSheetsWriter:
     def __init__(self, creds_file: str, sheet_name: str, worksheet_name: str, rows: int, cols: int, logger: Optional[Logger] = None):
         self.rows = rows
         self.cols = cols
-        self.logger = logger or Logger()
+        self.logger = logger or get_logger()
         self.load_credentials(creds_file)
         self.sheet = self.create_or_open_sheet(sheet_name)
         self.worksheet = self.create_or_open_worksheet(worksheet_name)
@@ -102,7 +103,12 @@ class GoogleSheetsWriter:
             self.worksheet.spreadsheet.batch_update({"requests": requests})
 
 
-    async def write_to_google_sheets(self, data: Dict[str, Any], currency: str):
+    async def write_to_google_sheets(
+            self, 
+            data: Dict[str, Any], 
+            currency: str, 
+            unchanged: Optional[Iterable[str]] = None
+    ):
         current_date = datetime.now().strftime('%Y-%m-%d')
         price_column_name = f"Цена \n {current_date}"
 
@@ -119,9 +125,9 @@ class GoogleSheetsWriter:
             if details is None:
                 continue
 
-            current_price = str(details.pop("price", "")) if "price" in details else ""
-            current_price_num = re.search(r'\d+(\.\d+)?', current_price)
-            current_price_num = float(current_price_num.group()) if current_price_num else None
+            # Экстракторы отдают цену в копейках
+            current_price = details.pop("price", None)
+            current_price = format_minor(current_price) if current_price is not None else ""
 
             if not existing_df.empty and url in existing_df["URL"].values:
                 row_index = existing_df.index[existing_df["URL"] == url].tolist()[0]
@@ -136,6 +142,18 @@ class GoogleSheetsWriter:
         price_columns = [col for col in existing_df.columns if re.search(r"\d{4}-\d{2}-\d{2}", col)]
         price_columns.sort(key=lambda x: datetime.strptime(re.search(r"\d{4}-\d{2}-\d{2}", x).group(), '%Y-%m-%d'))
 
+        # Страницы, не изменившиеся с прошлого прогона (HTTP 304), не парсились -
+        # переносим для них последнюю известную цену, сравнение её не отметит
+        unchanged = set(unchanged or ())
+        if unchanged and len(price_columns) >= 2 and "URL" in existing_df.columns:
+            last_column_name = price_columns[-2]
+            unchanged_rows = existing_df["URL"].isin(unchanged)
+            existing_df[price_column_name] = existing_df[price_column_name].astype(object)
+            existing_df.loc[unchanged_rows, price_column_name] = existing_df.loc[unchanged_rows, last_column_name]
+            missing = len(unchanged) - int(unchanged_rows.sum())
+            if missing:
+                self.logger.warning(f"{missing} неизменённых товаров нет в листе - очистите HTTP-кэш")
+
         if "Цена" in existing_df.columns:
             existing_df.drop(columns=["Цена"], inplace=True)
 
@@ -149,40 +167,26 @@ class GoogleSheetsWriter:
 
         if len(price_columns) >= 2:
             last_column_name = price_columns[-2]
-            for row_index, row in existing_df.iterrows():
-                current_price = row[price_column_name]
-                previous_price = row[last_column_name]
-
-                current_price_num = re.search(r'\d+(?:[.,]\d+)?', str(current_price))
-                previous_price_num = re.search(r'\d+(?:[.,]\d+)?', str(previous_price))
-
-                if not current_price_num or not previous_price_num:
-                    continue
-
-                current_price_num = current_price_num.group().replace(',', '.')
-                previous_price_num = previous_price_num.group().replace(',', '.')
-
-                try:
-                    current_price_num = float(current_price_num)
-                    previous_price_num = float(previous_price_num)
-                except (ValueError, TypeError):
-                    continue
-
-                price_diff = abs(current_price_num - previous_price_num)
-                decimal_places = 2 if '.' in str(current_price_num) else 0
-
-                if current_price_num > previous_price_num:
-                    updated_text = f"{current_price_num:.{decimal_places}f} (> на {price_diff:.2f})"
-                    highlight_cells.append((row_index + 2, existing_df.columns.get_loc(price_column_name) + 1, "green"))
+            # Столбцы разбираются целиком, ячейки с ценой и пометкой
+            # "(> на ...)" из прошлых прогонов тоже
+            current_minor = parse_price_column(existing_df[price_column_name])
+            previous_minor = parse_price_column(existing_df[last_column_name])
+            known = (current_minor.notna() & previous_minor.notna()).to_numpy(dtype=bool)
+            price_col = existing_df.columns.get_loc(price_column_name) + 1
+            existing_df[price_column_name] = existing_df[price_column_name].astype(object)
+
+            for row_index, current, previous in zip(
+                    existing_df.index[known], current_minor[known], previous_minor[known]
+            ):
+                updated_text = format_minor(current)
+                if current > previous:
+                    updated_text += f" (> на {format_minor(current - previous)})"
+                    highlight_cells.append((row_index + 2, price_col, "green"))
                     price_changed = True
-                elif current_price_num < previous_price_num:
-                    updated_text = f"{current_price_num:.{decimal_places}f} (< на {price_diff:.2f})"
-                    highlight_cells.append((row_index + 2, existing_df.columns.get_loc(price_column_name) + 1, "red"))
+                elif current < previous:
+                    updated_text += f" (< на {format_minor(previous - current)})"
+                    highlight_cells.append((row_index + 2, price_col, "red"))
                     price_changed = True
-                else:
-                    updated_text = f"{current_price_num:.{decimal_places}f}"
-
-                updated_text = updated_text.replace('.', ',')
                 existing_df.at[row_index, price_column_name] = updated_text
         else:
             price_changed = True
@@ -2,6 +2,7 @@ import logging
 import os
 from logging import Handler
 from logging.handlers import RotatingFileHandler
+from typing import Optional
 
 from src.core.settings import path
 
@@ -41,3 +42,15 @@ class Logger(logging.Logger):
         )
         for handler in (stream, file):
             self.handlers.append(handler)
+
+
+_logger: Optional[Logger] = None
+
+
+def get_logger() -> Logger:
+    """Общий для процесса логгер: обработчики и файл лога открываются один раз."""
+    global _logger
+
+    if _logger is None:
+        _logger = Logger()
+    return _logger
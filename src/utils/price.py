@@ -0,0 +1,134 @@
+"""Разбор цен со страниц и из таблицы в целые копейки (бани, центы).
+
+Сайты пишут цены по-разному: ``1.725,00 MDL``, ``839.00 MDL``,
+``1 278,00 MDL``, ``1,234.50 MDL``, ``Цена: 21,00 LEI / шт.``. Здесь одно
+правило для всех: пробелы внутри числа - разделители тысяч; если в числе
+есть и точка, и запятая, дробная часть - после последнего из них;
+одиночный разделитель перед ровно тремя цифрами - разделитель тысяч
+(у цен в леях не бывает трёх знаков после запятой), иначе - дробная часть.
+"""
+from __future__ import annotations
+
+import math
+import re
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, Any, Dict, Final, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+MINOR: Final[int] = 100
+
+# Сначала число с пробелами между тройками цифр ("1 278,00"), затем любое
+# число с точками и запятыми ("1.725,00", "839.00")
+_NUMBER = re.compile(
+    r'\d{1,3}(?:[ \u00a0\u202f\']\d{3})+(?:[.,]\d+)?(?!\d)'
+    r'|\d+(?:[.,]\d+)*'
+)
+_GROUPING = re.compile(r'[ \u00a0\u202f\']')
+
+_CURRENCY = re.compile(r'MDL|лей|лея|леев|lei|EUR|€|USD|\$|RUB|руб|₽', re.IGNORECASE)
+_CURRENCIES: Final[Dict[str, str]] = {
+    'mdl': 'MDL', 'лей': 'MDL', 'лея': 'MDL', 'леев': 'MDL', 'lei': 'MDL',
+    'eur': 'EUR', '€': 'EUR',
+    'usd': 'USD', '$': 'USD',
+    'rub': 'RUB', 'руб': 'RUB', '₽': 'RUB',
+}
+
+
+class Price:
+    """Цена в целых копейках и код валюты (``None``, если на странице её нет)."""
+
+    __slots__ = ('minor', 'currency',)
+
+    def __init__(self, minor: int, currency: Optional[str] = None) -> None:
+        self.minor = minor
+        self.currency = currency
+
+    def format(self) -> str:
+        return format_minor(self.minor)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Price):
+            return NotImplemented
+        return self.minor == other.minor and self.currency == other.currency
+
+    def __hash__(self) -> int:
+        return hash((self.minor, self.currency))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.format()} {self.currency or '?'})"
+
+
+def _to_minor(number: str, decimal: Optional[str]) -> int:
+    number = _GROUPING.sub('', number)
+    if decimal is not None:
+        separator = decimal if decimal in number else None
+    else:
+        last = max(number.rfind('.'), number.rfind(','))
+        separator = number[last] if last != -1 else None
+        if separator is not None and ('.' in number) != (',' in number):
+            # Разделитель одного вида: повторяется или стоит перед тремя
+            # цифрами - это разделитель тысяч
+            if number.count(separator) > 1 or len(number) - last - 1 == 3:
+                separator = None
+
+    if separator is None:
+        return int(number.replace('.', '').replace(',', '')) * MINOR
+    whole, _, fraction = number.rpartition(separator)
+    whole = whole.replace('.', '').replace(',', '') or '0'
+    value = Decimal(f'{whole}.{fraction}') * MINOR
+    return int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def parse_price(text: str, currency: Optional[str] = None, decimal: Optional[str] = None) -> Optional[Price]:
+    """Первая цена в ``text`` или ``None``, если цифр в нём нет.
+
+    ``currency`` - валюта, если в тексте её не нашлось. ``decimal`` задаёт
+    дробный разделитель явно: так разбираются числа из JSON-LD, где
+    ``"1.725"`` - это 1,725, а не тысяча семьсот двадцать пять.
+    """
+    match = _NUMBER.search(text)
+    if match is None:
+        return None
+    found = _CURRENCY.search(text)
+    if found is not None:
+        currency = _CURRENCIES[found.group(0).lower()]
+    return Price(_to_minor(match.group(0), decimal), currency)
+
+
+def format_minor(minor: int) -> str:
+    """Копейки в текст для таблицы: ``123450`` -> ``"1234,50"``."""
+    sign = '-' if minor < 0 else ''
+    whole, fraction = divmod(abs(minor), MINOR)
+    return f'{sign}{whole},{fraction:02d}'
+
+
+def _cell_minor(value: Any, decimal: Optional[str]) -> Optional[int]:
+    if isinstance(value, str):
+        price = parse_price(value, decimal=decimal)
+        return price.minor if price is not None else None
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(number):
+        return None
+    # Числовая ячейка таблицы хранит цену в леях
+    return int((Decimal(str(value)) * MINOR).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def parse_price_column(column: pd.Series, decimal: Optional[str] = None) -> pd.Series:
+    """Столбец цен в копейки (``Int64``, пустые и нечисловые ячейки - ``<NA>``).
+
+    Каждое различное значение разбирается один раз: в столбце цен одни и
+    те же строки повторяются, и регулярка не гоняется по каждой ячейке.
+    """
+    import pandas as pd
+
+    codes, uniques = pd.factorize(column, use_na_sentinel=True)
+    parsed = pd.array([_cell_minor(value, decimal) for value in uniques], dtype='Int64')
+    return pd.Series(parsed.take(codes, allow_fill=True), index=column.index)
@@ -0,0 +1,16 @@
+"""Разбор тела ответа в ``BaseSession.check_response``."""
+import pytest
+
+from src.core.settings import load_settings  # noqa: F401  (порядок импорта, см. api_client)
+from src.session import errors as err
+from src.session.aiohttp import AiohttpSession
+from src.session.response import HttpResponse, RawContent
+
+
+def test_non_json_error_body_uses_declared_charset() -> None:
+    session = AiohttpSession(api='https://example.md')
+    body = 'Сервис недоступен'.encode('cp1251')
+    response = HttpResponse(503, RawContent(body, 'windows-1251'))
+    with pytest.raises(err.ServerError) as error:
+        session.check_response('GET', 503, body, response=response)
+    assert error.value.content == 'Сервис недоступен'
@@ -0,0 +1,199 @@
+"""Экстракторы карточек товаров против прежних BeautifulSoup-экстракторов.
+
+Страницы в ``tests/pages`` собраны по разметке каждого сайта. ``BS4_EXPECTED``
+- то, что на них возвращали экстракторы на BeautifulSoup до перехода на
+XPath; текущий ``src.parser.schema.extract`` должен давать то же самое.
+Намеренные отличия перечислены отдельно и применяются поверх.
+
+У сайтов из ``JSON_LD_SITES`` в страницу подмешивается блок JSON-LD: с ним
+запись та же, а битый или неполный JSON-LD добирается из разметки.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.core.settings import load_settings  # noqa: F401  (порядок импорта, см. api_client)
+from src.parser.executor import _drive
+from src.parser.schema import extract
+from src.session.response import RawContent
+
+
+PAGES = Path(__file__).parent / 'pages'
+
+BS4_EXPECTED: Dict[str, Dict[str, Any]] = {
+    'supraten': {
+        'Название': 'LED лампа 10Wx2',
+        'Артикул': 'AB-1',
+        'Категория': 'Лампы',
+        'price': '1,234 ',
+        'Мощность': '10 Вт',
+        'Цвет': 'белый',
+    },
+    'iek': {
+        'Название': 'АвтоматВА47',
+        'Артикул': 'MVA20-1',
+        'Категория': 'Автоматы',
+        'price': '1234,50',
+        'Ток': '16A',
+        'Полюса': None,
+    },
+    'habsev': {
+        'Название': 'Кабель ВВГ 3х2.5',
+        'Артикул': '12 34',
+        'Категория': 'Кабели',
+        'price': '25,40',
+        'Описание': 'Медныйкабель',
+    },
+    'luminaled': {
+        'Название': 'LED прожектор 50W',
+        'Артикул': 'LM-50',
+        'Категория': 'Светильники',
+        'price': '450,00',
+        'IP': '65',
+        'Цвет': 'черный',
+    },
+    'electromotor': {
+        'Название': 'Электродвигатель АИР 80',
+        'Артикул': 'E-80',
+        'Категория': 'Двигатели',
+        'price': '1725,00',
+        'Мощность': '1,5 кВт',
+    },
+    'volta': {
+        'Название': 'LED лента 5м',
+        'price': '1,234',
+        'Категория': 'Ленты',
+        'Артикул': 'V-5',
+        'Длина': '5 м',
+        'Цвет': 'RGB',
+    },
+    'panlight': {
+        'Название': 'LED панель 36W',
+        'price': '1278,00',
+        'Категория': 'Панели',
+        'Артикул': 'P-36',
+        'Мощность': ['36 Вт', '40'],
+    },
+    'cablu': {
+        'Название': 'Кабель NYM 3x1,5',
+        'price': '1021,00',
+        'Категория': 'Кабели',
+        'Бренд': 'Prakab',
+        'Артикул': 'NYM-315',
+        'Сечение': '1,5',
+        'Жилы': ['3', '4'],
+    },
+    'polev': {
+        'Название': 'Лампа xE27x',
+        'price': '1278,00',
+        'Категория': 'Лампы',
+        'Артикул': 'PL-1',
+        'Производитель': 'Polev',
+        'Описание': 'Хорошая лампа',
+    },
+}
+
+# Цена - целые копейки из src.utils.price. Прежние экстракторы отдавали
+# строки и на supraten ("1.234 лей" -> "1,234 ") и volta ("1.234,50 лей" ->
+# "1,234") читали разделитель тысяч как дробный
+PRICES: Dict[str, int] = {
+    'supraten': 123400,
+    'iek': 123450,
+    'habsev': 2540,
+    'luminaled': 45000,
+    'electromotor': 172500,
+    'volta': 123450,
+    'panlight': 127800,
+    'cablu': 102100,
+    'polev': 127800,
+}
+
+# Сайты, схемы которых сначала читают schema.org Product из JSON-LD
+JSON_LD_SITES: List[str] = ['cablu', 'electromotor', 'iek', 'luminaled']
+
+EMPTY_PAGE = '<html><head><script>var x="<div>";</script></head><body><div>nothing</div></body></html>'
+
+
+def _extract(site: str, page: Any) -> Any:
+    return _drive(extract, (site, page))
+
+
+def _page(site: str) -> bytes:
+    return (PAGES / f'{site}.html').read_bytes()
+
+
+@pytest.mark.parametrize('site', sorted(BS4_EXPECTED))
+def test_matches_bs4(site: str) -> None:
+    expected = {**BS4_EXPECTED[site], 'price': PRICES[site]}
+    assert _extract(site, RawContent(_page(site), 'utf-8')) == expected
+
+
+@pytest.mark.parametrize('site', sorted(BS4_EXPECTED))
+def test_accepts_text(site: str) -> None:
+    # Приложения отдают и RawContent, и уже декодированную строку
+    page = _page(site)
+    assert _extract(site, page.decode('utf-8')) == _extract(site, RawContent(page, 'utf-8'))
+
+
+@pytest.mark.parametrize('site', sorted(BS4_EXPECTED))
+def test_not_a_product_page(site: str) -> None:
+    # BeautifulSoup-экстракторы падали здесь с IndexError/AttributeError
+    assert _extract(site, EMPTY_PAGE) is None
+
+
+def _product_ld(site: str, **offers: str) -> Dict[str, Any]:
+    # Product с теми же значениями, что в разметке страницы
+    expected = BS4_EXPECTED[site]
+    return {
+        '@context': 'https://schema.org/',
+        '@type': 'Product',
+        'name': expected['Название'],
+        'sku': expected['Артикул'],
+        'offers': {'@type': 'Offer', 'priceCurrency': 'MDL', **offers},
+    }
+
+
+def _with_json_ld(site: str, *blocks: str) -> RawContent:
+    scripts = ''.join(f'<script type="application/ld+json">{block}</script>' for block in blocks)
+    page = _page(site).decode('utf-8').replace('</head>', f'{scripts}</head>', 1)
+    return RawContent(page.encode('utf-8'), 'utf-8')
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False)
+
+
+@pytest.mark.parametrize('site', JSON_LD_SITES)
+def test_json_ld_matches_bs4(site: str) -> None:
+    price = f'{PRICES[site] // 100}.{PRICES[site] % 100:02d}'
+    page = _with_json_ld(site, _dumps(_product_ld(site, price=price)))
+    assert _extract(site, page) == {**BS4_EXPECTED[site], 'price': PRICES[site]}
+
+
+@pytest.mark.parametrize('site', JSON_LD_SITES)
+def test_json_ld_is_read_first(site: str) -> None:
+    # Цена из JSON-LD отличается от цены в разметке - видно, откуда взято поле
+    page = _with_json_ld(site, _dumps({'@graph': [_product_ld(site, lowPrice='999.00')]}))
+    assert _extract(site, page) == {**BS4_EXPECTED[site], 'price': 99900}
+
+
+@pytest.mark.parametrize('site', JSON_LD_SITES)
+@pytest.mark.parametrize('block', [
+    '{"@type": "Product", "name": "Обрезано", "offers": {"price": ',
+    '{"@type": "BreadcrumbList", "name": "Каталог"}',
+    '{"@type": "Product", "offers": {"priceCurrency": "MDL"}}',
+    '{"@type": "Product", "name": "  ", "sku": [], "offers": []}',
+], ids=['broken', 'not-product', 'no-fields', 'empty-values'])
+def test_bad_json_ld_falls_back_to_dom(site: str, block: str) -> None:
+    expected = {**BS4_EXPECTED[site], 'price': PRICES[site]}
+    assert _extract(site, _with_json_ld(site, block)) == expected
+
+
+@pytest.mark.parametrize('site', JSON_LD_SITES)
+def test_partial_json_ld_is_completed_from_dom(site: str) -> None:
+    # В JSON-LD только название - артикул, цена и таблицы берутся из разметки
+    product = {'@type': 'Product', 'name': BS4_EXPECTED[site]['Название']}
+    page = _with_json_ld(site, '{"@type": "Product", "name": "Обрезано", ', _dumps(product))
+    assert _extract(site, page) == {**BS4_EXPECTED[site], 'price': PRICES[site]}
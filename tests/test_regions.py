@@ -0,0 +1,69 @@
+"""Разбор по срезу блоков (``Schema.regions``) против разбора всей страницы."""
+from pathlib import Path
+
+import pytest
+
+from src.core.settings import load_settings  # noqa: F401  (порядок импорта, см. api_client)
+from src.parser.schema import CompiledSchema, Schema, get_schema
+from src.parser.sites import SCHEMAS
+from src.session.response import RawContent
+
+
+PAGES = Path(__file__).parent / 'pages'
+
+# Карточка Panlight, где блок товара содержит все поля, а код товара и
+# характеристики лежат в отдельных блоках за его пределами
+PANLIGHT_BLOCK = RawContent((
+    '<html><head><script>var x="<div>";</script></head><body>'
+    '<nav><ul><li><a href="/c/1">Каталог</a></li></ul></nav>'
+    '<ul class="breadcrumbs"><li><a>Главная</a></li><li><a> Панели </a></li></ul>'
+    '<div class="product-page-inner"><div class="product-page-title"> Светодиодная панель 36Вт </div>'
+    '<div class="goods-item-current-price">1278.00 MDL / шт.</div></div>'
+    '<div class="product-page-id">Код товара: P-36</div>'
+    '<div class="product-page-id">Гарантия: 2 года</div>'
+    '<div class="product-page-characteristics"><ul>'
+    '<li><p>Мощность</p><p> 36 Вт </p></li><li><p>Цвет</p><p>белый</p></li>'
+    '</ul></div>'
+    '<footer><ul><li><a href="/c/1">Каталог</a></li></ul></footer>'
+    '</body></html>'
+).encode('utf-8'), 'utf-8')
+
+
+def _whole_page(site: str) -> CompiledSchema:
+    schema = SCHEMAS[site]
+    return Schema(schema.site, schema.guard, schema.fields, schema.tables).compile()
+
+
+@pytest.mark.parametrize('site', sorted(site for site, schema in SCHEMAS.items() if schema.regions))
+def test_slice_matches_whole_page(site: str) -> None:
+    page = RawContent((PAGES / f'{site}.html').read_bytes(), 'utf-8')
+    assert get_schema(site).extract(page) == _whole_page(site).extract(page)
+
+
+@pytest.mark.parametrize('site', ['cablu', 'electromotor', 'iek', 'luminaled', 'supraten'])
+def test_product_page_is_parsed_from_slice(site: str) -> None:
+    # На этих страницах все поля и таблицы лежат в блоках из regions
+    page = RawContent((PAGES / f'{site}.html').read_bytes(), 'utf-8')
+    assert get_schema(site).extract_sourced(page)[1]
+
+
+def test_tables_in_separate_blocks_are_sliced() -> None:
+    data, sliced = get_schema('panlight').extract_sourced(PANLIGHT_BLOCK)
+    assert sliced
+    assert data == _whole_page('panlight').extract(PANLIGHT_BLOCK)
+    assert data['Артикул'] == 'P-36'
+    assert data['Гарантия'] == '2 года'
+    assert data['Мощность'] == '36 Вт'
+
+
+def test_table_outside_regions_falls_back_to_whole_page() -> None:
+    # Блоки таблиц не попадают в срез: поля там есть, а строк таблиц нет -
+    # запись должна прийти с разбора всей страницы, а не без характеристик
+    schema = SCHEMAS['panlight']
+    partial = Schema(
+        schema.site, schema.guard, schema.fields, schema.tables,
+        regions=('div.product-page-inner', 'ul.breadcrumbs'),
+    ).compile()
+    data, sliced = partial.extract_sourced(PANLIGHT_BLOCK)
+    assert not sliced
+    assert data == _whole_page('panlight').extract(PANLIGHT_BLOCK)
@@ -0,0 +1,52 @@
+"""Повторы запросов при разомкнутом автомате хоста."""
+import asyncio
+
+import pytest
+
+from src.core.settings import load_settings  # noqa: F401  (порядок импорта, см. api_client)
+from src.session import errors as err
+from src.session.breaker import CLOSED, HostCircuitBreaker
+from src.session.retry import RetryBudget, RetryPolicy
+
+
+def _tripped(cooldown: float) -> HostCircuitBreaker:
+    breaker = HostCircuitBreaker('example.md', window=2, min_requests=2, cooldown=cooldown)
+    for _ in range(2):
+        breaker.before_request()
+        breaker.on_result(err.NetworkError())
+    return breaker
+
+
+def test_task_waits_for_open_circuit_and_succeeds() -> None:
+    breaker = _tripped(cooldown=0.05)
+    budget = RetryBudget(0)
+    policy = RetryPolicy(attempts=1, max_delay=1.0, budget=budget)
+    delays = []
+
+    async def fetch() -> str:
+        breaker.before_request()
+        breaker.on_result()
+        return 'ok'
+
+    result = asyncio.run(policy.run(fetch, on_retry=lambda attempt, error, delay: delays.append(delay)))
+    assert result == 'ok'
+    assert breaker.state == CLOSED
+    # Ждал конца паузы автомата, не тратя ни попыток, ни бюджета
+    assert delays and all(0 < delay <= 0.05 for delay in delays)
+    assert budget.spent == 0
+
+
+def test_circuit_wait_is_capped() -> None:
+    breaker = _tripped(cooldown=60.0)
+    policy = RetryPolicy(max_delay=0.01, max_circuit_wait=0.025)
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        breaker.before_request()
+        return 'ok'
+
+    with pytest.raises(err.CircuitOpenError):
+        asyncio.run(policy.run(fetch))
+    assert calls == 3